@@ -0,0 +1,246 @@
+"""
+Synthetic-data benchmark for the transform, validate and load stages.
+
+Generates Alpha Vantage and Gold API payloads, registers them in
+extract.import_log, runs transform(), validate() and load() and reports rows/sec,
+latency percentiles per step and peak memory per stage.
+
+Run against a dedicated database (see the Benchmarks section of the README):
+
+    python -m benchmarks.bench_pipeline --currencies 10 --days 350 --files 2
+    python -m benchmarks.bench_pipeline --save-baseline
+    python -m benchmarks.bench_pipeline --compare benchmarks/baselines/<commit>.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+from benchmarks.synthetic_data import generate_raw_files
+from etl.commons.metrics import metrics
+from etl.extract.database_extract import DBConnectorExtract
+from etl.extract.logger_extract import logger
+from etl.load.main_load import load
+from etl.transform.main_transform import transform
+from etl.validate.main_validate import validate
+
+
+BASELINE_DIR = os.path.join("benchmarks", "baselines")
+PERCENTILES = (50, 90, 95, 99)
+
+
+def git_commit():
+    """
+    Return the short hash of the current git commit.
+
+    Returns:
+        str -- Commit hash, or 'unknown' outside a git checkout
+    """
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"],
+                stderr=subprocess.DEVNULL,
+            )
+            .decode()
+            .strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_stage(name, func, trace_memory):
+    """
+    Run one stage with fresh metrics and collect its measurements.
+
+    Parameters:
+        name         -- Stage name ('transform', 'validate' or 'load')
+        func         -- Stage function
+        trace_memory -- Measure peak memory with tracemalloc
+
+    Returns:
+        dict -- Stage results
+    """
+    metrics.reset()
+    if trace_memory:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+
+    peak = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    stage_stats = metrics.steps.get(name)
+    rows = stage_stats.rows if stage_stats else 0
+
+    steps = {}
+    for step_name, stats in sorted(metrics.steps.items()):
+        step = stats.to_dict()
+        for pct in PERCENTILES:
+            step[f"p{pct}_ms"] = round(
+                stats.durations.percentile(pct) * 1000, 3
+            )
+        steps[step_name] = step
+
+    return {
+        "seconds": round(elapsed, 4),
+        "rows": rows,
+        "rows_per_second": round(rows / elapsed, 2) if elapsed else 0.0,
+        "peak_memory_bytes": peak,
+        "steps": steps,
+        "statements": metrics.statement_summary(limit=10),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Print stage-level differences against a baseline.
+
+    Parameters:
+        results   -- Current benchmark results
+        baseline  -- Baseline results loaded from JSON
+        threshold -- Relative slowdown (e.g. 0.1) reported as a regression
+
+    Returns:
+        bool -- True if any stage regressed beyond the threshold
+    """
+    regressed = False
+    print(f"Comparing with baseline {baseline.get('commit')}:")
+    for stage, current in results["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if not previous:
+            print(f"  {stage}: no baseline")
+            continue
+
+        for field, higher_is_better in (
+            ("rows_per_second", True),
+            ("seconds", False),
+            ("peak_memory_bytes", False),
+        ):
+            old, new = previous.get(field), current.get(field)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            flag = ""
+            if worse > threshold:
+                flag = "  <-- REGRESSION"
+                regressed = True
+            print(
+                f"  {stage}.{field}: {old} -> {new} ({change:+.1%}){flag}"
+            )
+    return regressed
+
+
+def main(argv=None):
+    """
+    Parse arguments, generate data, run the benchmark and report results.
+
+    Parameters:
+        argv -- Command-line arguments (default: sys.argv[1:])
+
+    Returns:
+        int -- Process exit code (1 if a regression was detected)
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--currencies", type=int, default=10)
+    parser.add_argument("--days", type=int, default=350)
+    parser.add_argument(
+        "--files",
+        type=int,
+        default=1,
+        help="Bitcoin files per currency and Gold snapshots per day",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Skip tracemalloc (faster, no peak memory figures)",
+    )
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help=f"Store results as {BASELINE_DIR}/<commit>.json",
+    )
+    parser.add_argument("--compare", help="Baseline JSON to compare with")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+
+    conn = DBConnectorExtract(logger=logger)
+    conn.connect()
+    currencies = conn.get_currencies()[: args.currencies]
+    generation_start = time.perf_counter()
+    summary = generate_raw_files(
+        conn, currencies, args.days, args.files, args.seed
+    )
+    generation_seconds = time.perf_counter() - generation_start
+    conn.disconnect()
+
+    results = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "engine": os.getenv("DB_ENGINE", "mysql"),
+        "scale": {
+            "currencies": len(currencies),
+            "days": args.days,
+            "files": args.files,
+            "seed": args.seed,
+        },
+        "generated": dict(
+            summary, seconds=round(generation_seconds, 4)
+        ),
+        "stages": {},
+    }
+
+    for name, func in (
+        ("transform", transform),
+        ("validate", validate),
+        ("load", load),
+    ):
+        results["stages"][name] = run_stage(
+            name, func, not args.no_memory
+        )
+
+    for name, stage in results["stages"].items():
+        peak = stage["peak_memory_bytes"]
+        peak_text = f"{peak / 1024 / 1024:.1f} MiB" if peak else "n/a"
+        print(
+            f"{name}: {stage['rows']} rows in {stage['seconds']}s "
+            f"({stage['rows_per_second']} rows/s, peak memory {peak_text})"
+        )
+
+    output = args.output
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        output = os.path.join(BASELINE_DIR, f"{results['commit']}.json")
+    if output:
+        with open(output, "w") as output_file:
+            json.dump(results, output_file, indent=4)
+        print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        if compare(results, baseline, args.threshold):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+CLI startup benchmark.
+
+Starts a fresh interpreter per sample, resolves one stage through the stage
+registry (without running it) and reports import time, loaded module count
+and open file handles, plus total process wall time:
+
+    python -m benchmarks.bench_startup --repeat 10
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+
+PROBE = """
+import json, os, sys, time
+start = time.perf_counter()
+from etl.commons.stages import get_stage
+stage = sys.argv[1]
+if stage != "none":
+    get_stage(stage)
+elapsed = time.perf_counter() - start
+fd_dir = "/proc/self/fd"
+print(json.dumps({
+    "import_seconds": elapsed,
+    "modules": len(sys.modules),
+    "open_files": len(os.listdir(fd_dir)) if os.path.isdir(fd_dir) else None,
+}))
+"""
+
+
+def sample(stage):
+    """
+    Measure one cold start of the given stage.
+
+    Parameters:
+        stage -- Stage name, or 'none' for the registry alone
+
+    Returns:
+        dict -- import_seconds, modules, open_files and wall_seconds
+    """
+    start = time.perf_counter()
+    output = subprocess.check_output([sys.executable, "-c", PROBE, stage])
+    wall = time.perf_counter() - start
+    result = json.loads(output.decode().strip().splitlines()[-1])
+    result["wall_seconds"] = wall
+    return result
+
+
+def main(argv=None):
+    """
+    Run the startup benchmark and print a summary per stage.
+
+    Parameters:
+        argv -- Command-line arguments (default: sys.argv[1:])
+
+    Returns:
+        int -- Process exit code
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--stages", nargs="+", default=["none", "extract", "transform", "load"]
+    )
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for stage in args.stages:
+        samples = [sample(stage) for _ in range(args.repeat)]
+        results[stage] = {
+            "import_ms": round(
+                statistics.median(s["import_seconds"] for s in samples) * 1000,
+                2,
+            ),
+            "wall_ms": round(
+                statistics.median(s["wall_seconds"] for s in samples) * 1000, 2
+            ),
+            "modules": samples[-1]["modules"],
+            "open_files": samples[-1]["open_files"],
+        }
+        print(
+            f"{stage}: import {results[stage]['import_ms']} ms, "
+            f"process {results[stage]['wall_ms']} ms, "
+            f"{results[stage]['modules']} modules, "
+            f"{results[stage]['open_files']} open files"
+        )
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=4)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
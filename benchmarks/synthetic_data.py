@@ -0,0 +1,222 @@
+import os
+import random
+from datetime import datetime, timedelta
+
+from etl.extract.utils_extract import save_to_file
+
+
+# Approximate units of each currency per 1 USD, used to scale prices.
+USD_RATES = {
+    "USD": 1.0,
+    "EUR": 0.88037,
+    "GBP": 0.7559,
+    "AED": 3.67299,
+    "BGN": 1.71965,
+    "CAD": 1.39033,
+    "CHF": 0.81715,
+    "RON": 4.3815,
+    "TRY": 38.08463,
+    "UAH": 41.41769,
+}
+
+BTC_USD_PRICE = 84000.0
+GOLD_USD_PRICE_PER_GRAM = 107.0
+KARAT_RATIOS = {
+    "price_24k": 1.0,
+    "price_22k": 22 / 24,
+    "price_21k": 21 / 24,
+    "price_20k": 20 / 24,
+    "price_18k": 18 / 24,
+    "price_16k": 16 / 24,
+    "price_14k": 14 / 24,
+    "price_10k": 10 / 24,
+}
+
+
+def _random_walk(rng, start, steps, volatility):
+    """
+    Generate a geometric random walk.
+
+    Parameters:
+        rng        -- random.Random instance
+        start      -- Starting value
+        steps      -- Number of values to generate
+        volatility -- Standard deviation of the relative step
+
+    Returns:
+        list -- Generated values
+    """
+    values = []
+    value = start
+    for _ in range(steps):
+        value *= 1 + rng.gauss(0, volatility)
+        values.append(value)
+    return values
+
+
+def generate_btc_payload(currency_code, days, end_date, rng):
+    """
+    Build an Alpha Vantage DIGITAL_CURRENCY_DAILY response.
+
+    Parameters:
+        currency_code -- Market currency code (e.g., 'USD')
+        days          -- Number of daily entries in the time series
+        end_date      -- Date of the most recent entry
+        rng           -- random.Random instance
+
+    Returns:
+        dict -- Payload in the format BitcoinTransform expects
+    """
+    rate = USD_RATES.get(currency_code, 1.0)
+    closes = _random_walk(rng, BTC_USD_PRICE * rate, days, 0.02)
+
+    time_series = {}
+    for offset, close in enumerate(reversed(closes)):
+        date = end_date - timedelta(days=offset)
+        open_price = close * (1 + rng.gauss(0, 0.01))
+        high = max(open_price, close) * (1 + abs(rng.gauss(0, 0.01)))
+        low = min(open_price, close) * (1 - abs(rng.gauss(0, 0.01)))
+        time_series[date.strftime("%Y-%m-%d")] = {
+            "1. open": f"{open_price:.8f}",
+            "2. high": f"{high:.8f}",
+            "3. low": f"{low:.8f}",
+            "4. close": f"{close:.8f}",
+            "5. volume": f"{rng.uniform(50, 10000):.8f}",
+        }
+
+    return {
+        "Meta Data": {
+            "1. Information": "Daily Prices and Volumes for Digital Currency",
+            "2. Digital Currency Code": "BTC",
+            "3. Digital Currency Name": "Bitcoin",
+            "4. Market Code": currency_code,
+            "5. Market Name": currency_code,
+            "6. Last Refreshed": f"{end_date.strftime('%Y-%m-%d')} 00:00:00",
+            "7. Time Zone": "UTC",
+        },
+        "Time Series (Digital Currency Daily)": time_series,
+    }
+
+
+def generate_gold_payload(base_currency, currency_codes, timestamp, rng):
+    """
+    Build an APISED /v1/latest response.
+
+    Parameters:
+        base_currency  -- Base currency code (e.g., 'USD')
+        currency_codes -- Currency codes to include in currency_rates
+        timestamp      -- datetime of the snapshot
+        rng            -- random.Random instance
+
+    Returns:
+        dict -- Payload in the format GoldTransform expects
+    """
+    base_rate = USD_RATES.get(base_currency, 1.0)
+    price = GOLD_USD_PRICE_PER_GRAM * base_rate * (1 + rng.gauss(0, 0.01))
+    open_price = price * (1 + rng.gauss(0, 0.005))
+    high = max(open_price, price) * (1 + abs(rng.gauss(0, 0.005)))
+    low = min(open_price, price) * (1 - abs(rng.gauss(0, 0.005)))
+    prev = price * (1 + rng.gauss(0, 0.005))
+
+    metal_prices = {
+        "open": round(open_price, 5),
+        "high": round(high, 5),
+        "low": round(low, 5),
+        "prev": round(prev, 5),
+        "change": round(price - prev, 5),
+        "change_percentage": round((price - prev) / prev * 100, 5),
+        "price": round(price, 5),
+        "ask": round(price * 1.0001, 5),
+        "bid": round(price * 0.9999, 5),
+    }
+    for karat, ratio in KARAT_RATIOS.items():
+        metal_prices[karat] = round(price * ratio, 5)
+
+    return {
+        "status": "success",
+        "data": {
+            "timestamp": int(timestamp.timestamp() * 1000),
+            "base_currency": base_currency,
+            "metals": "XAU",
+            "weight_unit": "gram",
+            "weight_name": "Gram (g)",
+            "metal_prices": {"XAU": metal_prices},
+            "currency_rates": {
+                code: round(USD_RATES.get(code, 1.0) / base_rate, 5)
+                for code in currency_codes
+            },
+        },
+    }
+
+
+def generate_raw_files(conn, currencies, days, files, seed=42):
+    """
+    Write synthetic raw API files and register them in extract.import_log.
+
+    For Bitcoin, each currency gets 'files' responses holding 'days' of history.
+    For Gold, each currency gets 'files' snapshots per day over 'days' days.
+
+    Parameters:
+        conn       -- Connected DBConnectorExtract instance
+        currencies -- List of (id, code) tuples to generate data for
+        days       -- Days of history
+        files      -- Bitcoin files per currency / Gold snapshots per day
+        seed       -- Random seed, so runs are comparable
+
+    Returns:
+        dict -- Number of files and expected rows per data type
+    """
+    rng = random.Random(seed)
+    end_date = datetime.today().date()
+    currency_codes = [code for _, code in currencies]
+    summary = {"bitcoin_files": 0, "gold_files": 0, "bitcoin_rows": 0}
+
+    for currency_id, code in currencies:
+        for _ in range(files):
+            data = generate_btc_payload(code, days, end_date, rng)
+            _register(conn, currency_id, data, "btc", days)
+            summary["bitcoin_files"] += 1
+        summary["bitcoin_rows"] += days
+
+    start = datetime.combine(end_date, datetime.min.time()) - timedelta(
+        days=days - 1
+    )
+    for day in range(days):
+        for snapshot in range(files):
+            timestamp = start + timedelta(
+                days=day, seconds=int(86400 * (snapshot + 0.5) / files)
+            )
+            for currency_id, code in currencies:
+                data = generate_gold_payload(
+                    code, currency_codes, timestamp, rng
+                )
+                _register(conn, currency_id, data, "gold", 1)
+                summary["gold_files"] += 1
+    summary["gold_rows"] = days * len(currencies)
+
+    return summary
+
+
+def _register(conn, currency_id, data, api_type, row_count):
+    """
+    Save a payload the same way the extract stage does and log the import.
+
+    Parameters:
+        conn        -- Connected DBConnectorExtract instance
+        currency_id -- Currency ID of the payload
+        data        -- Payload dict
+        api_type    -- 'btc' or 'gold'
+        row_count   -- Rows contained in the payload
+
+    Returns:
+        None
+    """
+    file_path, created, modified = save_to_file(data, api_type)
+    conn.log_import(
+        currency_id,
+        os.path.dirname(file_path),
+        os.path.basename(file_path),
+        created,
+        modified,
+        row_count,
+    )
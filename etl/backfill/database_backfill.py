@@ -0,0 +1,75 @@
+from etl.commons.database import DBConnector
+from etl.commons.metrics import metrics
+from etl.backfill.logger_backfill import logger
+
+
+class DBConnectorBackfill(DBConnector):
+    """
+    Checkpoints backfill work units in the extract.backfill_state table.
+
+    Methods:
+        get_finished_units() -- Units already loaded by a previous run
+        mark_unit()          -- Record the outcome of a work unit
+    """
+
+    @metrics.timed("backfill.get_finished_units")
+    def get_finished_units(self):
+        """
+        Return the work units that have been loaded into the warehouse.
+
+        Returns:
+            set -- (api_id, currency_id, chunk_start, chunk_end) tuples
+        """
+        query = """
+            SELECT api_id, currency_id, chunk_start, chunk_end
+            FROM extract.backfill_state
+            WHERE status = 'done'
+        """
+        self.cursor.execute(query)
+        return {tuple(row) for row in self.cursor.fetchall()}
+
+    @metrics.timed("backfill.mark_unit")
+    def mark_unit(self, unit, status, row_count=None, error_message=None):
+        """
+        Insert or update the state of a work unit.
+
+        Parameters:
+            unit          -- WorkUnit being checkpointed
+            status        -- 'done' or 'error'
+            row_count     -- Rows written to staging by the unit
+            error_message -- Error description for failed units
+
+        Returns:
+            None
+        """
+        try:
+            query = """
+                INSERT INTO extract.backfill_state (
+                    api_id, currency_id, chunk_start, chunk_end,
+                    status, row_count, error_messages, updated_at
+                )
+                VALUES (%s, %s, %s, %s, %s, %s, %s, NOW(4))
+                ON DUPLICATE KEY UPDATE
+                    status = VALUES(status),
+                    row_count = VALUES(row_count),
+                    error_messages = VALUES(error_messages),
+                    updated_at = NOW(4)
+            """
+            values = (
+                unit.api_id,
+                unit.currency_id,
+                unit.chunk_start,
+                unit.chunk_end,
+                status,
+                row_count,
+                error_message[:255] if error_message else None,
+            )
+            self.cursor.execute(query, values)
+            self.conn.commit()
+
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(
+                f"Failed to checkpoint backfill unit {unit}: {str(e)}",
+                exc_info=True,
+            )
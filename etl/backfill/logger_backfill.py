@@ -0,0 +1,3 @@
+from etl.commons.logger import lazy_logger
+
+logger = lazy_logger('backfill')
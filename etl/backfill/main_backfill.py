@@ -0,0 +1,311 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from etl.backfill.database_backfill import DBConnectorBackfill
+from etl.backfill.logger_backfill import logger
+from etl.backfill.utils_backfill import (
+    RateLimiter,
+    filter_btc_payload,
+    plan_units,
+)
+from etl.commons.metrics import metrics
+from etl.commons.stages import ASSETS
+from etl.extract.btc_extract import BitcoinExtract
+from etl.extract.database_extract import DBConnectorExtract
+from etl.extract.gold_extract import GoldExtract
+from etl.load.main_load import load
+from etl.pipeline.lineage_pipeline import LineageWriter
+from etl.transform.btc_transform import BitcoinTransform
+from etl.transform.database_transform import DBConnectorTransform
+from etl.transform.gold_transform import GoldTransform
+from etl.transform.main_transform import resume_or_start_runs
+from etl.validate.main_validate import validate
+
+
+class UnitFetcher:
+    """
+    Fetches the API payloads of backfill work units on worker threads.
+
+    Each worker thread gets its own extract connection, and every request
+    waits for its API's rate limiter, so the workers together stay within
+    the per-minute quotas (BACKFILL_BTC_PER_MINUTE, BACKFILL_GOLD_PER_MINUTE).
+
+    Methods:
+        __init__()  -- Configures one rate limiter per API
+        fetch()     -- Request every payload of a work unit
+        close()     -- Close the connections opened by worker threads
+
+    Instance Variables:
+        limiters -- API type -> RateLimiter
+    """
+
+    def __init__(self):
+        """
+        Initialize the fetcher and its rate limiters.
+        """
+        self.limiters = {
+            "btc": RateLimiter(int(os.getenv("BACKFILL_BTC_PER_MINUTE", "5"))),
+            "gold": RateLimiter(
+                int(os.getenv("BACKFILL_GOLD_PER_MINUTE", "30"))
+            ),
+        }
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = DBConnectorExtract(logger=logger)
+            conn.connect()
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def fetch(self, unit):
+        """
+        Request the payloads of a work unit and log every API call.
+
+        Parameters:
+            unit -- WorkUnit to fetch
+
+        Returns:
+            list -- (data, row_count) tuples
+
+        Raises:
+            RuntimeError -- If any request of the unit fails
+        """
+        conn = self._connection()
+        payloads = []
+
+        def sink(api_type, currency_code, currency_id, data, row_count):
+            payloads.append((data, row_count))
+
+        if unit.api_type == "btc":
+            days = [None]
+        else:
+            days = [
+                unit.chunk_start + timedelta(days=offset)
+                for offset in range((unit.chunk_end - unit.chunk_start).days + 1)
+            ]
+
+        for day in days:
+            self.limiters[unit.api_type].acquire()
+            if unit.api_type == "btc":
+                result = BitcoinExtract(conn).get_bitcoin_data(
+                    unit.currency_code, sink=sink
+                )
+            else:
+                result = GoldExtract(conn).get_gold_data(
+                    unit.currency_code, sink=sink, date=day
+                )
+
+            start_time, end_time, response_code, error_message = result
+            conn.log_api_import(
+                unit.currency_id,
+                unit.api_id,
+                start_time,
+                end_time,
+                response_code,
+                error_message,
+            )
+            if end_time is None or error_message:
+                raise RuntimeError(error_message or "API request failed")
+
+        return payloads
+
+    def close(self):
+        """
+        Close every connection opened by the worker threads.
+
+        Returns:
+            None
+        """
+        for conn in self._connections:
+            conn.disconnect()
+        self._connections.clear()
+
+
+def run_batch(pool, fetcher, transformers, lineage, state, units, run_ids):
+    """
+    Fetch a batch of work units in parallel and transform them into staging.
+
+    Payloads are transformed on the calling thread as soon as their unit is
+    fetched, so staging is written by a single connection.
+
+    Parameters:
+        pool         -- ThreadPoolExecutor running the fetches
+        fetcher      -- UnitFetcher
+        transformers -- API type -> BitcoinTransform / GoldTransform
+        lineage      -- Started LineageWriter archiving the raw payloads
+        state        -- Connected DBConnectorBackfill
+        units        -- WorkUnit instances of the batch
+        run_ids      -- Asset -> transform_run the batch is staged under
+
+    Returns:
+        list -- (unit, processed row count) of the units now in staging
+    """
+    futures = {pool.submit(fetcher.fetch, unit): unit for unit in units}
+    transformed = []
+
+    for future in as_completed(futures):
+        unit = futures[future]
+        try:
+            payloads = future.result()
+        except Exception as e:
+            logger.error(f"Backfill unit {unit} failed: {str(e)}")
+            state.mark_unit(unit, "error", error_message=str(e))
+            continue
+
+        processed_count = 0
+        transformer = transformers[unit.api_type]
+        with metrics.step("backfill.transform"):
+            for data, row_count in payloads:
+                staged = data
+                if unit.api_type == "btc":
+                    staged = filter_btc_payload(
+                        data, unit.chunk_start, unit.chunk_end
+                    )
+                source = (
+                    f"backfill {unit.api_type} payload for {unit.currency_code} "
+                    f"({unit.chunk_start} to {unit.chunk_end})"
+                )
+                _, processed = transformer.transform_data(
+                    [staged], unit.currency_id, source
+                )
+                transformer.conn.conn.commit()
+                lineage.submit(
+                    unit.api_type,
+                    unit.currency_id,
+                    data,
+                    row_count,
+                    processed,
+                    run_ids[unit.api_type],
+                )
+                processed_count += processed
+
+        metrics.add_rows(processed_count)
+        transformed.append((unit, processed_count))
+
+    return transformed
+
+
+@metrics.timed("backfill")
+def backfill(date_from, date_to, assets=None):
+    """
+    Build history for a date range, resuming from the last checkpoint.
+
+    The range is split into work units per asset, currency and date chunk
+    (BACKFILL_CHUNK_DAYS). Units are fetched by BACKFILL_WORKERS threads
+    within the API quotas, transformed into staging, and loaded into the
+    warehouse every BACKFILL_LOAD_BATCH units. A unit is checkpointed as
+    done in extract.backfill_state only after its batch is loaded, so an
+    interrupted backfill resumes with the units that were not loaded.
+
+    Every batch is staged under a new transform run per asset, opened like
+    in the transform stage: staging rows of a run that was not loaded yet
+    are kept and loaded with the batch. An interrupted transform run must
+    be resumed first.
+
+    Parameters:
+        date_from -- First date to backfill
+        date_to   -- Last date to backfill
+        assets    -- Assets to backfill, 'btc' and/or 'gold' (default: both)
+
+    Returns:
+        None
+    """
+    assets = list(assets or ASSETS)
+    logger.info(
+        f"Starting backfill of {', '.join(assets)} from {date_from} to {date_to}"
+    )
+
+    state = DBConnectorBackfill(logger=logger)
+    state.connect()
+
+    units = plan_units(
+        state.get_currencies(),
+        assets,
+        date_from,
+        date_to,
+        int(os.getenv("BACKFILL_CHUNK_DAYS", "7")),
+    )
+    finished = state.get_finished_units()
+    pending = [
+        unit
+        for unit in units
+        if (unit.api_id, unit.currency_id, unit.chunk_start, unit.chunk_end)
+        not in finished
+    ]
+    logger.info(f"{len(pending)} of {len(units)} work units left to run")
+
+    if not pending:
+        state.disconnect()
+        logger.info("Backfill already complete")
+        return
+
+    staging = DBConnectorTransform(logger=logger)
+    staging.connect()
+    running = [
+        asset
+        for asset in assets
+        if (staging.get_last_run(asset) or (None, None))[1] == "running"
+    ]
+    if running:
+        logger.error(
+            f"{', '.join(running)} transform runs are still running or were "
+            f"interrupted; run the transform before backfilling"
+        )
+        staging.disconnect()
+        state.disconnect()
+        return
+
+    fetcher = UnitFetcher()
+    lineage = LineageWriter()
+    lineage.start()
+    pool = ThreadPoolExecutor(
+        max_workers=int(os.getenv("BACKFILL_WORKERS", "4")),
+        thread_name_prefix="backfill",
+    )
+    batch_size = int(os.getenv("BACKFILL_LOAD_BATCH", "50"))
+
+    try:
+        for offset in range(0, len(pending), batch_size):
+            batch = pending[offset:offset + batch_size]
+            run_ids = resume_or_start_runs(staging, assets)
+            transformers = {
+                "btc": BitcoinTransform(staging, run_ids.get("btc")),
+                "gold": GoldTransform(staging, run_ids.get("gold")),
+            }
+            transformed = run_batch(
+                pool, fetcher, transformers, lineage, state, batch, run_ids
+            )
+            for asset in assets:
+                staging.finish_run(run_ids[asset])
+
+            if transformed:
+                validate(assets)
+                load(assets)
+                loaded = {
+                    asset
+                    for asset in assets
+                    if staging.get_last_run(asset) == (run_ids[asset], "loaded")
+                }
+                for unit, processed_count in transformed:
+                    if unit.api_type in loaded:
+                        state.mark_unit(unit, "done", processed_count)
+
+            logger.info(
+                f"Backfill progress: {offset + len(batch)} of {len(pending)} units"
+            )
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        fetcher.close()
+        lineage.close()
+        staging.disconnect()
+        state.disconnect()
+
+    logger.info("Backfill completed")
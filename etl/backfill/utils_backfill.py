@@ -0,0 +1,144 @@
+import threading
+import time
+from collections import namedtuple
+from datetime import timedelta
+
+
+# One independently retryable piece of a backfill: an asset, a currency and
+# an inclusive date range.
+WorkUnit = namedtuple(
+    "WorkUnit",
+    [
+        "api_type",
+        "api_id",
+        "currency_id",
+        "currency_code",
+        "chunk_start",
+        "chunk_end",
+    ],
+)
+
+API_IDS = {"btc": "BTC", "gold": "XAU"}
+
+
+def date_chunks(date_from, date_to, chunk_days):
+    """
+    Split an inclusive date range into consecutive chunks.
+
+    Parameters:
+        date_from  -- First date of the range
+        date_to    -- Last date of the range
+        chunk_days -- Maximum number of days per chunk
+
+    Returns:
+        list -- (chunk_start, chunk_end) tuples
+    """
+    chunks = []
+    start = date_from
+    while start <= date_to:
+        end = min(start + timedelta(days=chunk_days - 1), date_to)
+        chunks.append((start, end))
+        start = end + timedelta(days=1)
+    return chunks
+
+
+def plan_units(currencies, assets, date_from, date_to, chunk_days):
+    """
+    Build the work units of a backfill.
+
+    Alpha Vantage returns the whole daily history in one response, so a
+    Bitcoin unit covers the full range for one market. The Gold API serves
+    one day per request, so Gold units are split into date chunks.
+
+    Parameters:
+        currencies -- (currency_id, code) tuples from dim_currency
+        assets     -- Asset names to backfill ('btc', 'gold')
+        date_from  -- First date of the range
+        date_to    -- Last date of the range
+        chunk_days -- Days per Gold work unit
+
+    Returns:
+        list -- WorkUnit instances
+    """
+    units = []
+    for api_type in assets:
+        if api_type == "btc":
+            chunks = [(date_from, date_to)]
+        else:
+            chunks = date_chunks(date_from, date_to, chunk_days)
+
+        for currency_id, currency_code in currencies:
+            for chunk_start, chunk_end in chunks:
+                units.append(
+                    WorkUnit(
+                        api_type,
+                        API_IDS[api_type],
+                        currency_id,
+                        currency_code,
+                        chunk_start,
+                        chunk_end,
+                    )
+                )
+    return units
+
+
+def filter_btc_payload(data, chunk_start, chunk_end):
+    """
+    Keep only the time series entries of a Bitcoin payload inside a range.
+
+    Parameters:
+        data        -- Parsed Alpha Vantage response
+        chunk_start -- First date to keep
+        chunk_end   -- Last date to keep
+
+    Returns:
+        dict -- Payload with the same structure and a filtered time series
+    """
+    key = "Time Series (Digital Currency Daily)"
+    start, end = chunk_start.isoformat(), chunk_end.isoformat()
+    filtered = dict(data)
+    filtered[key] = {
+        date_str: values
+        for date_str, values in data.get(key, {}).items()
+        if start <= date_str <= end
+    }
+    return filtered
+
+
+class RateLimiter:
+    """
+    Spaces out calls to an API so that a per-minute quota is never exceeded.
+
+    Methods:
+        __init__()  -- Configures the quota
+        acquire()   -- Block until the next call is allowed
+
+    Instance Variables:
+        interval -- Minimum number of seconds between two calls
+    """
+
+    def __init__(self, calls_per_minute):
+        """
+        Initialize the limiter.
+
+        Parameters:
+            calls_per_minute -- Maximum calls per minute (0 = unlimited)
+        """
+        self.interval = 60.0 / calls_per_minute if calls_per_minute else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Reserve the next call slot and sleep until it starts.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        if slot > now:
+            time.sleep(slot - now)
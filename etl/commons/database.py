@@ -1,91 +1,393 @@
+import functools
 import os
+import re
+import threading
+import time
 
-import mysql.connector
+from etl.commons.engine import env_bool, get_engine
+from etl.commons.metrics import metrics
+from etl.commons.state import get_state_cache
+
+
+# dim_currency rows and gold_data_import columns shared by every connector
+# of the process, refreshed after DIM_CACHE_TTL seconds.
+_currency_cache = {"rows": None, "by_code": {}, "loaded_at": 0.0}
+_column_cache = {"columns": None, "loaded_at": 0.0}
+_currency_lock = threading.Lock()
+
+# Last database version read by get_state_version()
+_version_cache = {"version": None, "checked_at": 0.0}
+
+
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_RE = re.compile(r"%s|\?")
+_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ROWS_RE = re.compile(r"(\(\?(?:, \?)*\))(?:\s*,\s*\(\?(?:, \?)*\))+")
+_SPACE_RE = re.compile(r"\s+")
+
+# Statements EXPLAIN accepts on both engines
+_EXPLAINABLE_RE = re.compile(
+    r"^\s*(SELECT|INSERT|UPDATE|DELETE|REPLACE|WITH)\b", re.I
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def fingerprint(sql):
+    """
+    Normalize a statement so that executions differing only in literal
+    values, placeholder counts or whitespace share one fingerprint.
+
+    Parameters:
+        sql -- Statement in the MySQL dialect
+
+    Returns:
+        str -- Normalized statement, e.g. 'SELECT Id FROM t WHERE code IN (?+)'
+    """
+    sql = _COMMENT_RE.sub(" ", sql)
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _PLACEHOLDER_RE.sub("?", sql)
+    sql = _SPACE_RE.sub(" ", sql).strip().rstrip(";").strip()
+    sql = _LIST_RE.sub("(?+)", sql)
+    return _ROWS_RE.sub(r"\1, ...", sql)
+
+
+def clear_dimension_cache():
+    """
+    Drop the cached dim_currency rows, gold_data_import columns and
+    database version, so the next lookup reads the database.
+
+    Returns:
+        None
+    """
+    with _currency_lock:
+        _currency_cache["rows"] = None
+        _currency_cache["by_code"] = {}
+        _column_cache["columns"] = None
+        _version_cache["version"] = None
+
+
+class InstrumentedCursor:
+    """
+    Cursor proxy that reports every executed statement to the run metrics
+    and translates it to the dialect of the storage engine.
+
+    Each execution is timed and aggregated per statement fingerprint. An
+    execution slower than DB_SLOW_QUERY_MS milliseconds (default 1000, 0
+    disables it) is logged; the first slow execution of a fingerprint in a
+    run is logged together with its query plan.
+
+    Methods:
+        __init__()     -- Wraps a DB-API cursor
+        execute()      -- Execute a statement and record a round-trip
+        executemany()  -- Execute a batched statement and record a round-trip
+
+    All other attributes (fetchone, rowcount, lastrowid, ...) are delegated
+    to the wrapped cursor.
+    """
+
+    def __init__(self, cursor, translate=None, explain=None, logger=None):
+        """
+        Initialize the proxy.
+
+        Parameters:
+            cursor    -- Cursor to wrap
+            translate -- Optional function rewriting SQL for the engine
+            explain   -- Optional function (sql, params) returning the plan
+                         of a translated statement
+            logger    -- Logger for slow statements
+        """
+        self._cursor = cursor
+        self._translate = translate
+        self._explain = explain
+        self._logger = logger
+        self._slow_seconds = float(os.getenv("DB_SLOW_QUERY_MS", "1000")) / 1000
+
+    def _run(self, method, operation, params, plan_params):
+        """
+        Translate, execute and time one statement.
+
+        Parameters:
+            method      -- Wrapped cursor method, execute or executemany
+            operation   -- SQL statement in the MySQL dialect
+            params      -- Statement parameters (a sequence for executemany)
+            plan_params -- Parameters used to explain a slow statement
+
+        Returns:
+            Result of the wrapped cursor method
+        """
+        metrics.add_round_trip()
+        sql = self._translate(operation) if self._translate else operation
+
+        start = time.perf_counter()
+        if params is None:
+            result = method(sql)
+        else:
+            result = method(sql, params)
+        elapsed = time.perf_counter() - start
+
+        slow = 0 < self._slow_seconds <= elapsed
+        slow_count = metrics.add_statement(
+            fingerprint(operation), elapsed, self._cursor.rowcount, slow
+        )
+        if slow and self._logger:
+            self._log_slow(operation, sql, plan_params, elapsed, slow_count == 1)
+        return result
+
+    def _log_slow(self, operation, sql, params, elapsed, with_plan):
+        """
+        Log a slow statement, with its query plan if requested.
+
+        Parameters:
+            operation -- SQL statement in the MySQL dialect
+            sql       -- Translated statement that was executed
+            params    -- Parameters of the statement (or first parameter set)
+            elapsed   -- Execution time in seconds
+            with_plan -- Append the output of the engine's explain()
+
+        Returns:
+            None
+        """
+        message = (
+            f"Slow statement ({elapsed * 1000:.0f} ms): {fingerprint(operation)}"
+        )
+        if with_plan and self._explain and _EXPLAINABLE_RE.match(sql):
+            try:
+                plan = self._explain(sql, params) or [("no plan rows",)]
+                message += "\nPlan:\n" + "\n".join(
+                    "  " + " | ".join(str(value) for value in row)
+                    for row in plan
+                )
+            except Exception as e:
+                message += f"\nPlan unavailable: {str(e)}"
+        self._logger.warning(message)
+
+    def execute(self, operation, params=None):
+        """
+        Execute a single statement.
+
+        Parameters:
+            operation -- SQL statement
+            params    -- Statement parameters
+
+        Returns:
+            Result of the wrapped cursor's execute()
+        """
+        return self._run(self._cursor.execute, operation, params, params)
+
+    def executemany(self, operation, seq_params):
+        """
+        Execute a statement for a sequence of parameter sets.
+
+        The batch is timed as one execution; a slow batch is explained with
+        its first parameter set.
+
+        Parameters:
+            operation  -- SQL statement
+            seq_params -- Sequence of parameter tuples
+
+        Returns:
+            Result of the wrapped cursor's executemany()
+        """
+        first = (
+            seq_params[0]
+            if isinstance(seq_params, (list, tuple)) and seq_params
+            else None
+        )
+        return self._run(self._cursor.executemany, operation, seq_params, first)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
 
 
 class DBConnector:
     """
-    Handles MySQL database connection and currency-related operations.
+    Handles the database connection and currency-related operations.
+
+    The backend is chosen by DB_ENGINE (see etl.commons.engine): statements
+    are written in the MySQL dialect and translated by the engine.
 
     Methods:
         __init__()             -- Initializes with a logger instance
-        connect()              -- Establish connection to the database
-        disconnect()           -- Close the database connection
+        connect()              -- Open or borrow a connection from the storage engine
+        disconnect()           -- Give the connection back to the storage engine
+        get_state_version()    -- Cheap version of the cached metadata and logs
         get_currencies()       -- Fetch all currencies from the dim_currency table
         get_currency_by_code() -- Get currency ID by its code
+        get_import_columns()   -- Columns of gold_data_import
         get_rate_cols()        -- Retrieve currency rate columns from gold_data_import
 
     Instance Variables:
-        conn    -- Active MySQL connection
-        cursor  -- Database cursor
-        logger  -- Logger instance
+        engine          -- StorageEngine the connector runs on
+        conn            -- Connection obtained from the engine
+        cursor          -- Database cursor
+        prepared_cursor -- Prepared-statement cursor for repeated statements
+                           (same as cursor unless DB_PREPARED_CURSORS is set)
+        logger          -- Logger instance
     """
 
     def __init__(self, logger):
         """
-        Initialize DBConnector with environment-based DB credentials and logger.
+        Initialize DBConnector with the environment-selected storage engine and logger.
 
         Parameters:
            logger -- Logger instance of the current app
         """
-        self.host = os.getenv("DB_HOST")
-        self.port = os.getenv("DB_PORT")
-        self.database = os.getenv("DB_DATABASE")
-        self.user = os.getenv("DB_USER")
-        self.password = os.getenv("DB_PASSWORD")
+        self.engine = get_engine(logger)
+        self.use_prepared = env_bool("DB_PREPARED_CURSORS", False)
         self.conn = None
         self.cursor = None
+        self.prepared_cursor = None
         self.logger = logger
-        logger.debug(
-            f"MySQL connector initialized for database: {self.database}"
-        )
-
-        if not all(
-            [self.host, self.port, self.database, self.user, self.password]
-        ):
-            self.logger.error(
-                "Missing required environment variables. Database connection cannot be established."
-            )
-            raise ValueError("Missing required environment variables")
+        logger.debug(f"{self.engine.name} connector initialized")
 
     def connect(self):
         """
-        Establish connection to MySQL database.
+        Open or borrow a connection from the storage engine.
 
         Returns:
             None
         """
         try:
-            if self.database:
-                self.conn = mysql.connector.connect(
-                    host=self.host,
-                    port=self.port,
-                    user=self.user,
-                    password=self.password,
-                    database=self.database,
-                )
-            else:
-                self.conn = mysql.connector.connect(
-                    host=self.host, user=self.user, password=self.password
+            self.conn = self.engine.connect()
+            explain = functools.partial(self.engine.explain, self.conn)
+            self.cursor = InstrumentedCursor(
+                self.engine.cursor(self.conn),
+                self.engine.translate,
+                explain,
+                self.logger,
+            )
+            self.prepared_cursor = (
+                InstrumentedCursor(
+                    self.engine.cursor(self.conn, prepared=True),
+                    self.engine.translate,
+                    explain,
+                    self.logger,
                 )
-            self.cursor = self.conn.cursor()
-            self.logger.info(f"Connected to MySQL database: {self.database}")
-        except mysql.connector.Error as error:
-            self.logger.info(f"Error connecting to MySQL: {error}")
+                if self.use_prepared
+                else self.cursor
+            )
+            self.logger.info(f"Connected to {self.engine.name} database")
+        except self.engine.Error as error:
+            self.logger.info(
+                f"Error connecting to {self.engine.name} database: {error}"
+            )
             self.conn = None
 
     def disconnect(self):
         """
-        Close the database connection and cursor.
+        Close the cursors and give the connection back to the storage engine.
 
         Returns:
             None
         """
         if self.conn:
+            if self.prepared_cursor is not self.cursor:
+                self.prepared_cursor.close()
             self.cursor.close()
-            self.conn.close()
-            self.logger.info("Disconnected from MySQL database")
+            self.engine.release(self.conn)
+            self.conn = None
+            self.cursor = None
+            self.prepared_cursor = None
+            self.logger.info(f"Disconnected from {self.engine.name} database")
+
+    @metrics.timed("db.get_state_version")
+    def get_state_version(self, max_age=0):
+        """
+        Return a cheap version of everything the state cache holds, read in
+        one round-trip: the size and newest row of dim_currency, the column
+        count of gold_data_import, and the newest row and row count of the
+        import and transform logs.
+
+        Parameters:
+            max_age -- Reuse the version read by this process if it is not
+                       older than this many seconds (default 0: always read)
 
+        Returns:
+            dict -- Entry name -> version
+        """
+        with _currency_lock:
+            if (
+                _version_cache["version"] is not None
+                and time.monotonic() - _version_cache["checked_at"] < max_age
+            ):
+                return _version_cache["version"]
+
+        query = f"""
+            SELECT
+                (SELECT COUNT(*) FROM warehouse.dim_currency),
+                (SELECT MAX(Id) FROM warehouse.dim_currency),
+                {self.engine.column_count("transform", "gold_data_import")},
+                (SELECT MAX(Id) FROM extract.import_log),
+                (SELECT COUNT(*) FROM extract.import_log),
+                (
+                    SELECT import_file_name FROM extract.import_log
+                    ORDER BY Id DESC LIMIT 1
+                ),
+                (SELECT MAX(Id) FROM transform.transform_log),
+                (SELECT COUNT(*) FROM transform.transform_log),
+                (
+                    SELECT processed_file_name FROM transform.transform_log
+                    ORDER BY Id DESC LIMIT 1
+                )
+        """
+        self.cursor.execute(query)
+        row = self.cursor.fetchone()
+        version = {
+            "currencies": [int(row[0]), int(row[1] or 0)],
+            "columns": int(row[2]),
+            "import_log": [int(row[3] or 0), int(row[4]), row[5]],
+            "transform_log": [int(row[6] or 0), int(row[7]), row[8]],
+        }
+
+        with _currency_lock:
+            _version_cache["version"] = version
+            _version_cache["checked_at"] = time.monotonic()
+        return version
+
+    def _cached_currencies(self):
+        """
+        Return the dim_currency rows, reading the table only when the
+        process-wide cache is empty or older than DIM_CACHE_TTL seconds and
+        the state cache holds no rows for the current table version.
+
+        Returns:
+            list -- (id, code) tuples
+        """
+        ttl = float(os.getenv("DIM_CACHE_TTL", "300"))
+        with _currency_lock:
+            if (
+                _currency_cache["rows"] is not None
+                and time.monotonic() - _currency_cache["loaded_at"] < ttl
+            ):
+                return _currency_cache["rows"]
+
+        state = get_state_cache(self.engine, self.logger)
+        version = self.get_state_version(ttl)["currencies"] if state else None
+        entry = state.get("currencies") if state else None
+
+        if entry and entry[0] == version:
+            self.logger.debug("Using currencies from the state cache")
+            rows = [(id_, code) for id_, code in entry[1]]
+        else:
+            self.logger.debug("Fetching currencies from database")
+            self.cursor.execute("SELECT Id, code FROM warehouse.dim_currency")
+            rows = [(int(row[0]), row[1]) for row in self.cursor.fetchall()]
+            if state:
+                state.put("currencies", version, rows)
+
+        with _currency_lock:
+            _currency_cache["rows"] = rows
+            _currency_cache["by_code"] = {code: id_ for id_, code in rows}
+            _currency_cache["loaded_at"] = time.monotonic()
+        return rows
+
+    @metrics.timed("db.get_currencies")
     def get_currencies(self):
         """
         Return a list of (id, code) for all currencies in dim_currency.
@@ -93,17 +395,15 @@ class DBConnector:
         Returns:
             list -- A list of tuples containing currency IDs and codes
         """
-        self.logger.debug("Fetching currencies from database")
-        query = "SELECT Id, code FROM warehouse.dim_currency"
         try:
-            self.cursor.execute(query)
-            currencies = self.cursor.fetchall()
+            currencies = self._cached_currencies()
             self.logger.debug(f"Found {len(currencies)} currencies")
             return currencies
-        except mysql.connector.Error as e:
+        except self.engine.Error as e:
             self.logger.error(f"Error fetching currencies: {e}")
             return []
 
+    @metrics.timed("db.get_currency_by_code")
     def get_currency_by_code(self, code):
         """
         Return the ID of a currency given its code.
@@ -115,22 +415,65 @@ class DBConnector:
             int or None -- Currency ID if found, otherwise None
         """
         self.logger.debug(f"Looking up currency ID for code: {code}")
-        query = "SELECT Id FROM warehouse.dim_currency WHERE code = %s"
         try:
-            self.cursor.execute(query, (code,))
-            result = self.cursor.fetchone()
+            self._cached_currencies()
+            currency_id = _currency_cache["by_code"].get(code)
 
-            if result:
+            if currency_id is not None:
                 self.logger.debug(
-                    f"Found currency ID {result[0]} for code {code}"
+                    f"Found currency ID {currency_id} for code {code}"
                 )
-                return int(result[0])
+                return currency_id
             self.logger.warning(f"No currency found for code: {code}")
             return None
-        except mysql.connector.Error as e:
+        except self.engine.Error as e:
             self.logger.error(f"Error retrieving currency by code: {e}")
             return None
 
+    def get_import_columns(self, refresh=False):
+        """
+        Return the columns of transform.gold_data_import.
+
+        The list is kept for DIM_CACHE_TTL seconds in the process and in the
+        state cache for as long as the table's column count is unchanged.
+
+        Parameters:
+            refresh -- Read the columns from the database
+
+        Returns:
+            list -- Column names
+        """
+        ttl = float(os.getenv("DIM_CACHE_TTL", "300"))
+        with _currency_lock:
+            if (
+                not refresh
+                and _column_cache["columns"] is not None
+                and time.monotonic() - _column_cache["loaded_at"] < ttl
+            ):
+                return _column_cache["columns"]
+
+        state = get_state_cache(self.engine, self.logger)
+        version = None
+        entry = None
+        if state:
+            version = self.get_state_version(0 if refresh else ttl)["columns"]
+            entry = state.get("gold_import_columns")
+
+        if entry and entry[0] == version:
+            columns = entry[1]
+        else:
+            columns = self.engine.column_names(
+                self.cursor, "transform", "gold_data_import"
+            )
+            if state:
+                state.put("gold_import_columns", version, columns)
+
+        with _currency_lock:
+            _column_cache["columns"] = columns
+            _column_cache["loaded_at"] = time.monotonic()
+        return columns
+
+    @metrics.timed("db.get_rate_cols")
     def get_rate_cols(self):
         """
         Return a list of currency codes from rate columns in gold_data_import.
@@ -140,15 +483,11 @@ class DBConnector:
         """
         self.logger.debug("Retrieving rate columns from gold_data_import")
         try:
-            column_query = """
-                        SELECT column_name 
-                        FROM information_schema.columns 
-                        WHERE table_schema = 'transform' 
-                        AND table_name = 'gold_data_import' 
-                        AND column_name LIKE 'rate_%'
-                        """
-            self.cursor.execute(column_query)
-            rate_columns = [row[0] for row in self.cursor.fetchall()]
+            rate_columns = [
+                column
+                for column in self.get_import_columns()
+                if column.startswith("rate_")
+            ]
 
             currency_codes = [column[5:].upper() for column in rate_columns]
             self.logger.debug(
@@ -0,0 +1,956 @@
+import atexit
+import datetime
+import decimal
+import functools
+import hashlib
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+
+
+SCHEMA_FILES = [
+    os.path.join("extract", "schema_extract.sql"),
+    os.path.join("transform", "schema_transform.sql"),
+    os.path.join("load", "schema_load.sql"),
+    os.path.join("export", "schema_export.sql"),
+    os.path.join("validate", "schema_validate.sql"),
+]
+SCHEMAS = ("extract", "transform", "warehouse")
+
+
+def _mysql():
+    """
+    Import mysql.connector on first use, so SQLite runs do not need it.
+
+    Returns:
+        module -- The mysql.connector module
+    """
+    import mysql.connector
+
+    return mysql.connector
+
+
+def env_bool(name, default):
+    """
+    Read a boolean flag from the environment.
+
+    Parameters:
+        name    -- Environment variable name
+        default -- Value used when the variable is not set
+
+    Returns:
+        bool -- Parsed flag value
+    """
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of reusable MySQL connections shared by all ETL stages.
+
+    Methods:
+        __init__()         -- Configures the pool with connection arguments
+        get_connection()   -- Borrow a healthy connection from the pool
+        release()          -- Return a borrowed connection to the pool
+        close()            -- Close every idle connection held by the pool
+
+    Instance Variables:
+        size         -- Maximum number of connections open at the same time
+        recycle      -- Seconds after which a connection is reopened (0 = never)
+        ping         -- Whether idle connections are pinged before reuse
+        timeout      -- Seconds to wait for a free connection
+        connect_args -- Keyword arguments passed to mysql.connector.connect()
+        logger       -- Logger instance
+    """
+
+    def __init__(self, logger, size, recycle, ping, timeout, **connect_args):
+        """
+        Initialize an empty pool; connections are opened lazily on demand.
+
+        Parameters:
+            logger       -- Logger instance of the current app
+            size         -- Maximum number of connections
+            recycle      -- Connection lifetime in seconds (0 disables recycling)
+            ping         -- Ping idle connections before handing them out
+            timeout      -- Seconds to wait for a free connection
+            connect_args -- Arguments for mysql.connector.connect()
+        """
+        self.size = size
+        self.recycle = recycle
+        self.ping = ping
+        self.timeout = timeout
+        self.connect_args = connect_args
+        self.logger = logger
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._created = {}
+        self._lock = threading.Lock()
+
+    def _open(self):
+        """
+        Open a new physical connection and remember its creation time.
+
+        Returns:
+            MySQLConnection -- Newly opened connection
+        """
+        conn = _mysql().connect(**self.connect_args)
+        with self._lock:
+            self._created[id(conn)] = time.monotonic()
+        self.logger.debug(
+            f"Opened new pooled MySQL connection (pool size: {self.size})"
+        )
+        return conn
+
+    def _discard(self, conn):
+        """
+        Close a connection and forget its bookkeeping entry.
+
+        Parameters:
+            conn -- Connection to close
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._created.pop(id(conn), None)
+        try:
+            conn.close()
+        except _mysql().Error:
+            pass
+
+    def _is_expired(self, conn):
+        """
+        Check whether a connection has outlived the recycle interval.
+
+        Parameters:
+            conn -- Connection to check
+
+        Returns:
+            bool -- True if the connection should be reopened
+        """
+        if not self.recycle:
+            return False
+        with self._lock:
+            created = self._created.get(id(conn), 0)
+        return time.monotonic() - created > self.recycle
+
+    def get_connection(self):
+        """
+        Borrow a connection, reusing an idle one when it is still healthy.
+
+        Returns:
+            MySQLConnection -- Connection that must be given back with release()
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise _mysql().errors.PoolError(
+                f"No free connection in pool after {self.timeout} seconds"
+            )
+
+        try:
+            while True:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._open()
+
+                if self._is_expired(conn):
+                    self.logger.debug("Recycling expired pooled connection")
+                    self._discard(conn)
+                    continue
+
+                if self.ping:
+                    try:
+                        conn.ping(reconnect=False)
+                    except _mysql().Error:
+                        self.logger.debug(
+                            "Pooled connection failed health check, reopening"
+                        )
+                        self._discard(conn)
+                        continue
+
+                return conn
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn):
+        """
+        Return a borrowed connection to the pool.
+
+        Pending work is rolled back so the next borrower starts clean.
+
+        Parameters:
+            conn -- Connection previously obtained from get_connection()
+
+        Returns:
+            None
+        """
+        try:
+            if conn.is_connected():
+                conn.rollback()
+                self._idle.put(conn)
+            else:
+                self._discard(conn)
+        except _mysql().Error:
+            self._discard(conn)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """
+        Close all idle connections held by the pool.
+
+        Returns:
+            None
+        """
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(logger, **connect_args):
+    """
+    Return the shared pool for the given connection settings, creating it once.
+
+    Pool behaviour is configured through the environment:
+    DB_POOL_SIZE, DB_POOL_RECYCLE, DB_POOL_PING, DB_POOL_TIMEOUT and DB_USE_PURE.
+
+    Parameters:
+        logger       -- Logger instance of the current app
+        connect_args -- Arguments for mysql.connector.connect()
+
+    Returns:
+        ConnectionPool -- Pool shared by every connector with these settings
+    """
+    connect_args["use_pure"] = env_bool("DB_USE_PURE", False)
+    key = tuple(sorted(connect_args.items()))
+
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(
+                logger,
+                size=int(os.getenv("DB_POOL_SIZE", "5")),
+                recycle=int(os.getenv("DB_POOL_RECYCLE", "3600")),
+                ping=env_bool("DB_POOL_PING", True),
+                timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+                **connect_args,
+            )
+            _pools[key] = pool
+            logger.debug(
+                f"Created MySQL connection pool (size: {pool.size}, "
+                f"recycle: {pool.recycle}s, use_pure: {connect_args['use_pure']})"
+            )
+        return pool
+
+
+@atexit.register
+def close_pools():
+    """
+    Close every connection pool created by this process.
+
+    Returns:
+        None
+    """
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+class StorageEngine:
+    """
+    Base class for the database backends the DBConnector classes run on.
+
+    SQL in the connectors is written in the MySQL dialect; an engine
+    connects to its backend, translates statements to its own dialect and
+    implements the few operations that cannot be expressed portably.
+
+    Methods:
+        connect()      -- Open or borrow a DB-API connection
+        release()      -- Give a connection back
+        cursor()       -- Create a cursor on a connection
+        translate()    -- Rewrite a MySQL statement for this backend
+        explain()      -- Return the query plan of a statement
+        column_names() -- List the columns of a table
+        column_count() -- Scalar subquery counting the columns of a table
+        truncate()     -- Remove all rows from a set of tables
+
+    Instance Variables:
+        name     -- Engine name used in DB_ENGINE
+        identity -- String identifying the database the engine points at
+        logger   -- Logger instance
+    """
+
+    name = None
+
+    def __init__(self, logger):
+        """
+        Initialize the engine.
+
+        Parameters:
+            logger -- Logger instance of the current app
+        """
+        self.logger = logger
+
+    @property
+    def Error(self):
+        """
+        Base exception class raised by the backend driver.
+        """
+        raise NotImplementedError
+
+    def connect(self):
+        raise NotImplementedError
+
+    def release(self, conn):
+        raise NotImplementedError
+
+    def cursor(self, conn, prepared=False):
+        """
+        Create a cursor; engines without prepared statements ignore the flag.
+
+        Parameters:
+            conn     -- Connection returned by connect()
+            prepared -- Request a prepared-statement cursor
+
+        Returns:
+            cursor -- DB-API cursor
+        """
+        return conn.cursor()
+
+    def translate(self, sql):
+        """
+        Rewrite a MySQL statement for this backend.
+
+        Parameters:
+            sql -- Statement in the MySQL dialect
+
+        Returns:
+            str -- Statement for this backend
+        """
+        return sql
+
+    def explain(self, conn, sql, params=None):
+        """
+        Return the query plan of a translated statement without running it.
+
+        Parameters:
+            conn   -- Connection the statement ran on
+            sql    -- Statement in this backend's dialect
+            params -- Statement parameters
+
+        Returns:
+            list -- Plan rows as tuples
+        """
+        raise NotImplementedError
+
+    @property
+    def identity(self):
+        raise NotImplementedError
+
+    def column_names(self, cursor, schema, table):
+        raise NotImplementedError
+
+    def column_count(self, schema, table):
+        raise NotImplementedError
+
+    def truncate(self, cursor, tables):
+        raise NotImplementedError
+
+
+class MySQLEngine(StorageEngine):
+    """
+    MySQL backend using the shared ConnectionPool.
+
+    Instance Variables:
+        connect_args -- Arguments for mysql.connector.connect()
+    """
+
+    name = "mysql"
+
+    def __init__(self, logger, host, port, user, password, database):
+        """
+        Initialize the engine with connection settings.
+
+        Parameters:
+            logger   -- Logger instance of the current app
+            host     -- MySQL host
+            port     -- MySQL port
+            user     -- MySQL user
+            password -- MySQL password
+            database -- Default database
+        """
+        super().__init__(logger)
+        self.connect_args = dict(
+            host=host,
+            port=port,
+            user=user,
+            password=password,
+            database=database,
+        )
+
+    @property
+    def Error(self):
+        return _mysql().Error
+
+    @property
+    def identity(self):
+        args = self.connect_args
+        return (
+            f"mysql://{args['user']}@{args['host']}:{args['port']}"
+            f"/{args['database']}"
+        )
+
+    def connect(self):
+        """
+        Borrow a connection from the shared pool.
+
+        Returns:
+            MySQLConnection -- Pooled connection
+        """
+        return get_pool(self.logger, **self.connect_args).get_connection()
+
+    def release(self, conn):
+        """
+        Return a connection to the shared pool.
+
+        Parameters:
+            conn -- Connection returned by connect()
+
+        Returns:
+            None
+        """
+        get_pool(self.logger, **self.connect_args).release(conn)
+
+    def cursor(self, conn, prepared=False):
+        return conn.cursor(prepared=True) if prepared else conn.cursor()
+
+    def explain(self, conn, sql, params=None):
+        """
+        Return the EXPLAIN output of a statement.
+
+        The plan is read on a separate pooled connection: the statement's own
+        cursor may still hold an unread result set, which MySQL does not
+        allow another statement to interleave with.
+
+        Parameters:
+            conn   -- Connection the statement ran on (not used)
+            sql    -- Statement in the MySQL dialect
+            params -- Statement parameters
+
+        Returns:
+            list -- EXPLAIN rows as tuples
+        """
+        pool = get_pool(self.logger, **self.connect_args)
+        explain_conn = pool.get_connection()
+        try:
+            cursor = explain_conn.cursor()
+            try:
+                cursor.execute(f"EXPLAIN {sql}", params)
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+        finally:
+            pool.release(explain_conn)
+
+    def column_names(self, cursor, schema, table):
+        """
+        List the columns of a table from information_schema.
+
+        Parameters:
+            cursor -- Cursor to run the query on
+            schema -- Schema name
+            table  -- Table name
+
+        Returns:
+            list -- Column names
+        """
+        cursor.execute(
+            """
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_schema = %s
+            AND table_name = %s
+            """,
+            (schema, table),
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    def column_count(self, schema, table):
+        """
+        Return a scalar subquery counting the columns of a table, for use in
+        a larger SELECT. The lookup is limited to one table of the data
+        dictionary.
+
+        Parameters:
+            schema -- Schema name
+            table  -- Table name
+
+        Returns:
+            str -- SQL expression
+        """
+        return (
+            "(SELECT COUNT(*) FROM information_schema.columns "
+            f"WHERE table_schema = '{schema}' AND table_name = '{table}')"
+        )
+
+    def truncate(self, cursor, tables):
+        """
+        Truncate tables with foreign key checks disabled.
+
+        Parameters:
+            cursor -- Cursor to run the statements on
+            tables -- Schema-qualified table names
+
+        Returns:
+            None
+        """
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        try:
+            for table in tables:
+                self.logger.debug(f"Truncating table: {table}")
+                cursor.execute(f"TRUNCATE TABLE {table}")
+        finally:
+            cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+
+
+def _sqlite_date(value):
+    """
+    Parse the date part of a SQLite date/timestamp value.
+
+    Parameters:
+        value -- date, datetime or ISO string
+
+    Returns:
+        datetime.date or None
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime.date):
+        return value if not isinstance(value, datetime.datetime) else value.date()
+    return datetime.date.fromisoformat(str(value)[:10])
+
+
+class StatementClock:
+    """
+    NOW() for one SQLite connection, fixed for the duration of a statement.
+
+    MySQL evaluates NOW() once per statement, so every row of an
+    INSERT ... SELECT gets the same timestamp and SELECT DISTINCT still
+    collapses duplicate rows. SQLite calls the user function once per row;
+    the clock caches the first value and is reset from the connection's
+    trace callback whenever the next statement starts.
+
+    Methods:
+        reset() -- Forget the timestamp of the previous statement
+        now()   -- Timestamp of the current statement
+
+    Instance Variables:
+        current -- datetime of the running statement, None between statements
+    """
+
+    def __init__(self):
+        self.current = None
+
+    def reset(self, statement=None):
+        """
+        Forget the timestamp of the previous statement.
+
+        Parameters:
+            statement -- SQL passed by the trace callback (unused)
+
+        Returns:
+            None
+        """
+        self.current = None
+
+    def now(self, precision=0):
+        """
+        Return the timestamp of the running statement as MySQL NOW(precision).
+
+        Parameters:
+            precision -- Number of fractional second digits
+
+        Returns:
+            str -- Timestamp string
+        """
+        if self.current is None:
+            self.current = datetime.datetime.now()
+        if precision:
+            return self.current.strftime("%Y-%m-%d %H:%M:%S.%f")[
+                : 20 + int(precision)
+            ]
+        return self.current.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _sqlite_add_seconds(value, seconds):
+    if value is None:
+        return None
+    added = datetime.datetime.fromisoformat(str(value)) + datetime.timedelta(
+        seconds=float(seconds)
+    )
+    return added.strftime("%Y-%m-%d %H:%M:%S.%f")[: len(str(value))]
+
+
+def _sqlite_md5(value):
+    if value is None:
+        return None
+    return hashlib.md5(str(value).encode()).hexdigest()
+
+
+def _sqlite_concat_ws(separator, *values):
+    return str(separator).join(str(v) for v in values if v is not None)
+
+
+# MySQL functions used by the connectors, registered on every SQLite connection.
+# NOW() is registered per connection from a StatementClock.
+SQLITE_FUNCTIONS = {
+    "ADD_SECONDS": (2, _sqlite_add_seconds),
+    "MD5": (1, _sqlite_md5),
+    "CONCAT_WS": (-1, _sqlite_concat_ws),
+    "DAYOFMONTH": (1, lambda v: _sqlite_date(v).day),
+    "MONTH": (1, lambda v: _sqlite_date(v).month),
+    "MONTHNAME": (1, lambda v: _sqlite_date(v).strftime("%B")),
+    "QUARTER": (1, lambda v: (_sqlite_date(v).month - 1) // 3 + 1),
+    "YEAR": (1, lambda v: _sqlite_date(v).year),
+    "DAYOFWEEK": (1, lambda v: _sqlite_date(v).isoweekday() % 7 + 1),
+    "WEEKOFYEAR": (1, lambda v: _sqlite_date(v).isocalendar()[1]),
+}
+
+_UPSERT_RE = re.compile(r"ON\s+DUPLICATE\s+KEY\s+UPDATE", re.IGNORECASE)
+_VALUES_FUNC_RE = re.compile(r"\bVALUES\s*\(\s*(\w+)\s*\)", re.IGNORECASE)
+_INSERT_IGNORE_RE = re.compile(r"\bINSERT\s+IGNORE\b", re.IGNORECASE)
+_DATE_ADD_RE = re.compile(
+    r"\bDATE_ADD\(\s*(.+?)\s*,\s*INTERVAL\s+(\S+)\s+SECOND\s*\)", re.IGNORECASE
+)
+_LOCKING_RE = re.compile(
+    r"\bFOR\s+UPDATE(\s+SKIP\s+LOCKED)?\b", re.IGNORECASE
+)
+
+
+@functools.lru_cache(maxsize=512)
+def translate_to_sqlite(sql):
+    """
+    Rewrite a MySQL statement used by the connectors into SQLite syntax.
+
+    Handles %s placeholders, ON DUPLICATE KEY UPDATE with VALUES(col),
+    INSERT IGNORE, DATE_ADD(..., INTERVAL n SECOND) and row-locking clauses
+    (SQLite locks the whole database).
+    MySQL functions are provided by SQLITE_FUNCTIONS. Results are cached,
+    since the same statements are executed many times per run.
+
+    Parameters:
+        sql -- Statement in the MySQL dialect
+
+    Returns:
+        str -- Equivalent SQLite statement
+    """
+    sql = sql.replace("%s", "?")
+    sql = _INSERT_IGNORE_RE.sub("INSERT OR IGNORE", sql)
+    sql = _DATE_ADD_RE.sub(r"ADD_SECONDS(\1, \2)", sql)
+    sql = _LOCKING_RE.sub("", sql)
+
+    match = _UPSERT_RE.search(sql)
+    if match:
+        updates = _VALUES_FUNC_RE.sub(r"excluded.\1", sql[match.end():])
+        sql = f"{sql[:match.start()]}ON CONFLICT DO UPDATE SET{updates}"
+
+    return sql
+
+
+_AUTO_INCREMENT_RE = re.compile(
+    r"\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b", re.IGNORECASE
+)
+_UNIQUE_INDEX_RE = re.compile(r"\bUNIQUE\s+INDEX\s+\w+\s*\(", re.IGNORECASE)
+_TRAILING_COMMA_RE = re.compile(r",(\s*)\)\s*;")
+_QUALIFY_RE = re.compile(
+    r"\b(DROP TABLE IF EXISTS|CREATE TABLE|INSERT INTO|CREATE INDEX \w+ ON)\s+(\w+)\s*(?=[\s(;]|$)",
+    re.IGNORECASE,
+)
+
+
+def translate_schema_to_sqlite(script):
+    """
+    Rewrite one of the MySQL schema_*.sql files for attached SQLite databases.
+
+    CREATE SCHEMA / USE become schema-qualified table names, AUTO_INCREMENT
+    keys become INTEGER PRIMARY KEY AUTOINCREMENT and inline unique indexes
+    become UNIQUE constraints. Foreign keys are dropped, since SQLite cannot
+    reference tables in another attached database.
+
+    Parameters:
+        script -- Contents of a schema_*.sql file
+
+    Returns:
+        str -- Script that can be run with executescript()
+    """
+    schema = "main"
+    output = []
+
+    for line in script.splitlines():
+        stripped = line.strip()
+        upper = stripped.upper()
+
+        if stripped.startswith("#"):
+            output.append(f"--{stripped[1:]}")
+            continue
+        if upper.startswith("CREATE SCHEMA"):
+            continue
+        if upper.startswith("USE "):
+            schema = stripped[4:].strip().rstrip(";").strip()
+            continue
+        if upper.startswith("FOREIGN KEY"):
+            continue
+
+        line = _AUTO_INCREMENT_RE.sub(
+            "INTEGER PRIMARY KEY AUTOINCREMENT", line
+        )
+        line = _UNIQUE_INDEX_RE.sub("UNIQUE (", line)
+        line = _QUALIFY_RE.sub(
+            lambda m, s=schema: f"{m.group(1)} {s}.{m.group(2)} ", line
+        )
+        output.append(line)
+
+    return _TRAILING_COMMA_RE.sub(r"\1);", "\n".join(output))
+
+
+class SQLiteEngine(StorageEngine):
+    """
+    Embedded backend storing each schema in its own SQLite file.
+
+    The extract, transform and warehouse databases are attached under their
+    schema names, so the connectors' schema-qualified SQL runs unchanged
+    after translate_to_sqlite(). The schemas are created from the
+    schema_*.sql files the first time a directory is used.
+
+    Instance Variables:
+        directory -- Directory holding <schema>.sqlite files
+    """
+
+    name = "sqlite"
+
+    _initialized = set()
+    _init_lock = threading.Lock()
+
+    def __init__(self, logger, directory):
+        """
+        Initialize the engine.
+
+        Parameters:
+            logger    -- Logger instance of the current app
+            directory -- Directory holding the database files
+        """
+        super().__init__(logger)
+        self.directory = directory
+
+    @property
+    def Error(self):
+        return sqlite3.Error
+
+    @property
+    def identity(self):
+        return f"sqlite://{os.path.abspath(self.directory)}"
+
+    def connect(self):
+        """
+        Open a connection with all schemas attached and MySQL functions registered.
+
+        Returns:
+            sqlite3.Connection -- New connection
+        """
+        if sqlite3.sqlite_version_info < (3, 35, 0):
+            raise RuntimeError(
+                f"SQLite 3.35+ is required, found {sqlite3.sqlite_version}"
+            )
+
+        os.makedirs(self.directory, exist_ok=True)
+        conn = sqlite3.connect(
+            ":memory:",
+            timeout=float(os.getenv("SQLITE_BUSY_TIMEOUT", "30")),
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+        )
+        for schema in SCHEMAS:
+            path = os.path.join(self.directory, f"{schema}.sqlite")
+            conn.execute(f"ATTACH DATABASE ? AS {schema}", (path,))
+            conn.execute(f"PRAGMA {schema}.journal_mode = WAL")
+            conn.execute(f"PRAGMA {schema}.synchronous = NORMAL")
+
+        for name, (num_args, func) in SQLITE_FUNCTIONS.items():
+            conn.create_function(name, num_args, func, deterministic=True)
+
+        clock = StatementClock()
+        conn.create_function("NOW", -1, clock.now)
+        conn.set_trace_callback(clock.reset)
+
+        self._ensure_schema(conn)
+        return conn
+
+    def _ensure_schema(self, conn):
+        """
+        Create the schemas from the schema_*.sql files if they do not exist yet.
+
+        Parameters:
+            conn -- Open connection
+
+        Returns:
+            None
+        """
+        with self._init_lock:
+            if self.directory in self._initialized:
+                return
+
+            exists = conn.execute(
+                "SELECT COUNT(*) FROM warehouse.sqlite_master "
+                "WHERE type = 'table' AND name = 'dim_currency'"
+            ).fetchone()[0]
+
+            if not exists:
+                etl_dir = os.path.dirname(os.path.dirname(__file__))
+                for schema_file in SCHEMA_FILES:
+                    self.logger.info(
+                        f"Creating SQLite schema from {schema_file}"
+                    )
+                    with open(os.path.join(etl_dir, schema_file)) as f:
+                        conn.executescript(translate_schema_to_sqlite(f.read()))
+                conn.commit()
+
+            self._initialized.add(self.directory)
+
+    def release(self, conn):
+        """
+        Close a connection; SQLite connections are cheap to open.
+
+        Parameters:
+            conn -- Connection returned by connect()
+
+        Returns:
+            None
+        """
+        conn.rollback()
+        conn.close()
+
+    def translate(self, sql):
+        return translate_to_sqlite(sql)
+
+    def explain(self, conn, sql, params=None):
+        """
+        Return the EXPLAIN QUERY PLAN output of a statement.
+
+        Parameters:
+            conn   -- Connection the statement ran on
+            sql    -- Statement in the SQLite dialect
+            params -- Statement parameters
+
+        Returns:
+            list -- (id, parent, notused, detail) tuples
+        """
+        return conn.execute(f"EXPLAIN QUERY PLAN {sql}", params or ()).fetchall()
+
+    def column_names(self, cursor, schema, table):
+        """
+        List the columns of a table with PRAGMA table_info.
+
+        Parameters:
+            cursor -- Cursor to run the query on
+            schema -- Attached schema name
+            table  -- Table name
+
+        Returns:
+            list -- Column names
+        """
+        cursor.execute(f"PRAGMA {schema}.table_info({table})")
+        return [row[1] for row in cursor.fetchall()]
+
+    def column_count(self, schema, table):
+        """
+        Return a scalar subquery counting the columns of a table, for use in
+        a larger SELECT.
+
+        Parameters:
+            schema -- Attached schema name
+            table  -- Table name
+
+        Returns:
+            str -- SQL expression
+        """
+        return f"(SELECT COUNT(*) FROM pragma_table_info('{table}', '{schema}'))"
+
+    def truncate(self, cursor, tables):
+        """
+        Delete all rows from tables (SQLite has no TRUNCATE).
+
+        Parameters:
+            cursor -- Cursor to run the statements on
+            tables -- Schema-qualified table names
+
+        Returns:
+            None
+        """
+        for table in tables:
+            self.logger.debug(f"Truncating table: {table}")
+            cursor.execute(f"DELETE FROM {table}")
+
+
+# SQLite stores DECIMAL columns as REAL. Its own text-to-REAL parsing is not
+# always correctly rounded, so Decimals are bound as the nearest float.
+sqlite3.register_adapter(decimal.Decimal, float)
+sqlite3.register_adapter(datetime.date, lambda v: v.isoformat())
+sqlite3.register_adapter(datetime.datetime, lambda v: v.isoformat(" "))
+sqlite3.register_converter("DATE", lambda v: _sqlite_date(v.decode()))
+sqlite3.register_converter(
+    "TIMESTAMP", lambda v: datetime.datetime.fromisoformat(v.decode())
+)
+
+
+def get_engine(logger):
+    """
+    Build the storage engine selected by DB_ENGINE ('mysql' or 'sqlite').
+
+    MySQL uses the DB_HOST, DB_PORT, DB_DATABASE, DB_USER and DB_PASSWORD
+    variables; SQLite stores its files in SQLITE_DIR (default 'data/sqlite').
+
+    Parameters:
+        logger -- Logger instance of the current app
+
+    Returns:
+        StorageEngine -- Engine instance
+    """
+    name = os.getenv("DB_ENGINE", "mysql").strip().lower()
+
+    if name == "sqlite":
+        return SQLiteEngine(
+            logger, os.getenv("SQLITE_DIR", os.path.join("data", "sqlite"))
+        )
+
+    if name != "mysql":
+        raise ValueError(f"Unknown DB_ENGINE: {name}")
+
+    settings = dict(
+        host=os.getenv("DB_HOST"),
+        port=os.getenv("DB_PORT"),
+        database=os.getenv("DB_DATABASE"),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+    )
+    if not all(settings.values()):
+        logger.error(
+            "Missing required environment variables. Database connection cannot be established."
+        )
+        raise ValueError("Missing required environment variables")
+
+    return MySQLEngine(logger, **settings)
@@ -1,12 +1,83 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+import time
 from datetime import datetime
 
 
+_listeners = {}
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Lets through every n-th record, capped at a maximum number per second.
+
+    Used on per-row loggers so hot loops keep a representative trace
+    without paying for formatting and writing every message.
+
+    Methods:
+        __init__()  -- Configures the sampling rate and the per-second cap
+        filter()    -- Decide whether a record is emitted
+
+    Instance Variables:
+        every_n        -- Emit one record out of every n
+        max_per_second -- Maximum records emitted per second (0 = unlimited)
+    """
+
+    def __init__(self, every_n=100, max_per_second=50):
+        """
+        Initialize the filter.
+
+        Parameters:
+            every_n        -- Emit one record out of every n (default 100)
+            max_per_second -- Per-second cap on emitted records (default 50)
+        """
+        super().__init__()
+        self.every_n = max(1, every_n)
+        self.max_per_second = max_per_second
+        self._seen = 0
+        self._window = 0
+        self._emitted = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        """
+        Return True if the record should be emitted.
+
+        Parameters:
+            record -- LogRecord being handled
+
+        Returns:
+            bool -- True to emit the record, False to drop it
+        """
+        with self._lock:
+            self._seen += 1
+            if self._seen % self.every_n:
+                return False
+
+            if self.max_per_second:
+                window = int(time.monotonic())
+                if window != self._window:
+                    self._window = window
+                    self._emitted = 0
+                if self._emitted >= self.max_per_second:
+                    return False
+                self._emitted += 1
+
+            return True
+
+
 def setup_logger(app_name, base_dir="etl"):
     """
     Configure and return a logger for the app based on its name.
 
+    Records are handed to a background QueueListener that writes them to the
+    console and to a size-rotated log file, so callers never block on log I/O.
+    File rotation is controlled by LOG_MAX_BYTES and LOG_BACKUP_COUNT.
+
     Parameters:
         app_name -- Name of the app for which the logger is to be configured
         base_dir -- Base directory where logs will be stored (default is "etl")
@@ -35,11 +106,151 @@ def setup_logger(app_name, base_dir="etl"):
         log_file = os.path.join(
             log_dir, f'{app_name}_{datetime.now().strftime("%Y%m%d")}.log'
         )
-        file_handler = logging.FileHandler(log_file)
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file,
+            maxBytes=int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+            backupCount=int(os.getenv("LOG_BACKUP_COUNT", "5")),
+        )
         file_handler.setFormatter(file_formatter)
         file_handler.setLevel(logging.DEBUG)
 
-        logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(
+            log_queue,
+            console_handler,
+            file_handler,
+            respect_handler_level=True,
+        )
+        listener.start()
+        _listeners[app_name] = listener
+
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
 
     return logger
+
+
+def get_row_logger(app_name):
+    """
+    Return the per-row child logger of an app, configured from LOG_ROWS.
+
+    LOG_ROWS accepts:
+        off    -- per-row messages are dropped by a level check, before any
+                  record is created or formatted
+        sample -- one in LOG_ROW_SAMPLE_EVERY messages is kept, at most
+                  LOG_ROW_MAX_PER_SECOND per second (default)
+        all    -- every per-row message is kept
+
+    Per-row call sites should pass arguments lazily, e.g.
+    row_logger.debug("Processing date %s", date), so nothing is formatted
+    for dropped messages.
+
+    Parameters:
+        app_name -- Name of the app whose logger receives the records
+
+    Returns:
+        logger -- Child logger propagating to the app logger
+    """
+    row_logger = logging.getLogger(f"{app_name}.rows")
+    mode = os.getenv("LOG_ROWS", "sample").strip().lower()
+
+    for existing in list(row_logger.filters):
+        row_logger.removeFilter(existing)
+
+    if mode == "off":
+        row_logger.setLevel(logging.CRITICAL + 1)
+    else:
+        row_logger.setLevel(logging.DEBUG)
+        if mode != "all":
+            row_logger.addFilter(
+                SamplingFilter(
+                    every_n=int(os.getenv("LOG_ROW_SAMPLE_EVERY", "100")),
+                    max_per_second=int(
+                        os.getenv("LOG_ROW_MAX_PER_SECOND", "50")
+                    ),
+                )
+            )
+
+    return row_logger
+
+
+class LazyLogger:
+    """
+    Proxy that configures a logger the first time it is used.
+
+    Creating the proxy is free: no log directory, file handle or listener
+    thread exists until a logging method is first called, so importing a
+    stage module that is not going to run costs nothing.
+
+    Methods:
+        __init__()  -- Stores the app name and the kind of logger to build
+        resolve()   -- Configure (once) and return the underlying logger
+
+    Instance Variables:
+        app_name -- Name of the app the logger belongs to
+        rows     -- True for the per-row child logger of the app
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, app_name, rows=False):
+        """
+        Initialize the proxy without touching the logging system.
+
+        Parameters:
+            app_name -- Name of the app the logger belongs to
+            rows     -- Build the per-row child logger (default False)
+        """
+        self.app_name = app_name
+        self.rows = rows
+        self._logger = None
+
+    def resolve(self):
+        """
+        Configure the logger on first use and return it.
+
+        Returns:
+            logger -- Configured logger instance
+        """
+        if self._logger is None:
+            with self._lock:
+                if self._logger is None:
+                    logger = setup_logger(self.app_name)
+                    if self.rows:
+                        logger = get_row_logger(self.app_name)
+                    self._logger = logger
+        return self._logger
+
+    def __getattr__(self, name):
+        value = getattr(self.resolve(), name)
+        if callable(value):
+            # Logger objects live for the whole process; cache bound methods
+            # so later calls skip this lookup.
+            setattr(self, name, value)
+        return value
+
+
+def lazy_logger(app_name, rows=False):
+    """
+    Return a logger proxy that is configured by setup_logger() on first use.
+
+    Parameters:
+        app_name -- Name of the app for which the logger is to be configured
+        rows     -- Return the per-row child logger instead (default False)
+
+    Returns:
+        LazyLogger -- Proxy with the logging.Logger interface
+    """
+    return LazyLogger(app_name, rows=rows)
+
+
+@atexit.register
+def stop_loggers():
+    """
+    Flush pending records and stop every background log listener.
+
+    Returns:
+        None
+    """
+    for listener in _listeners.values():
+        listener.stop()
+    _listeners.clear()
@@ -0,0 +1,528 @@
+import functools
+import json
+import math
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+# Durations kept per step and statement for percentiles; bounds the memory
+# of long-running processes such as the daemon
+RESERVOIR_SIZE = int(os.getenv("METRICS_RESERVOIR_SIZE", "1024"))
+
+
+class DurationReservoir:
+    """
+    Fixed-size uniform sample of durations, for percentiles over any number
+    of executions (reservoir sampling). Percentiles are exact until the
+    sample is full.
+
+    Methods:
+        __init__()    -- Initializes an empty sample
+        add()         -- Record one duration
+        percentile()  -- Nearest-rank percentile of the sample
+
+    Instance Variables:
+        size   -- Maximum number of durations kept
+        seen   -- Number of durations recorded
+        values -- Sampled durations, in seconds
+    """
+
+    def __init__(self, size=RESERVOIR_SIZE):
+        """
+        Initialize an empty sample.
+
+        Parameters:
+            size -- Maximum number of durations kept
+        """
+        self.size = size
+        self.seen = 0
+        self.values = []
+
+    def add(self, seconds):
+        """
+        Record one duration, replacing a random sampled one once full.
+
+        Parameters:
+            seconds -- Duration
+
+        Returns:
+            None
+        """
+        self.seen += 1
+        if len(self.values) < self.size:
+            self.values.append(seconds)
+            return
+        slot = random.randrange(self.seen)
+        if slot < self.size:
+            self.values[slot] = seconds
+
+    def percentile(self, pct):
+        """
+        Return the nearest-rank percentile of the sampled durations.
+
+        Parameters:
+            pct -- Percentile between 0 and 100
+
+        Returns:
+            float -- Percentile value (0.0 for an empty sample)
+        """
+        if not self.values:
+            return 0.0
+        ordered = sorted(self.values)
+        return ordered[max(1, math.ceil(pct / 100 * len(ordered))) - 1]
+
+
+class StepStats:
+    """
+    Accumulated measurements for one named step of a run.
+
+    Methods:
+        __init__()  -- Initializes all counters to zero
+        to_dict()   -- Return the measurements as a JSON-serializable dict
+
+    Instance Variables:
+        calls          -- Number of times the step ran
+        total_seconds  -- Total wall-clock time spent in the step
+        max_seconds    -- Longest single execution of the step
+        rows           -- Rows produced or written by the step
+        bytes_read     -- Bytes read from files or APIs
+        bytes_written  -- Bytes written to files
+        db_round_trips -- Statements sent to the database
+        durations      -- DurationReservoir of the executions
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty set of measurements.
+        """
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.db_round_trips = 0
+        self.durations = DurationReservoir()
+
+    def to_dict(self):
+        """
+        Return the measurements as a dict, including derived throughput.
+
+        Returns:
+            dict -- Step measurements
+        """
+        return {
+            "calls": self.calls,
+            "total_seconds": round(self.total_seconds, 6),
+            "avg_seconds": round(self.total_seconds / self.calls, 6)
+            if self.calls
+            else 0.0,
+            "max_seconds": round(self.max_seconds, 6),
+            "rows": self.rows,
+            "rows_per_second": round(self.rows / self.total_seconds, 2)
+            if self.total_seconds
+            else 0.0,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "db_round_trips": self.db_round_trips,
+        }
+
+
+class StatementStats:
+    """
+    Accumulated measurements for one statement fingerprint of a run.
+
+    Methods:
+        __init__()  -- Initializes all counters to zero
+        to_dict()   -- Return the measurements as a JSON-serializable dict
+
+    Instance Variables:
+        calls         -- Number of executions
+        total_seconds -- Total time spent executing the statement
+        max_seconds   -- Longest single execution
+        rows          -- Rows affected, as reported by the cursor
+        slow          -- Executions over the slow-statement threshold
+        durations     -- DurationReservoir of the executions
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty set of measurements.
+        """
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+        self.slow = 0
+        self.durations = DurationReservoir()
+
+    def to_dict(self):
+        """
+        Return the measurements as a dict, including the p95 duration.
+
+        Returns:
+            dict -- Statement measurements
+        """
+        p95 = self.durations.percentile(95)
+        return {
+            "calls": self.calls,
+            "total_seconds": round(self.total_seconds, 6),
+            "avg_seconds": round(self.total_seconds / self.calls, 6)
+            if self.calls
+            else 0.0,
+            "p95_seconds": round(p95, 6),
+            "max_seconds": round(self.max_seconds, 6),
+            "rows": self.rows,
+            "slow": self.slow,
+        }
+
+
+class RunMetrics:
+    """
+    Collects step-level performance measurements for a single ETL run.
+
+    Steps nest: counters recorded while several steps are active are added
+    to each of them, so a stage total includes all of its sub-steps.
+
+    Methods:
+        __init__()           -- Initializes an empty run
+        step()               -- Context manager timing a named step
+        timed()              -- Decorator timing every call of a function
+        add_rows()           -- Record rows for the active steps
+        add_bytes_read()     -- Record bytes read for the active steps
+        add_bytes_written()  -- Record bytes written for the active steps
+        add_round_trip()     -- Record a database round-trip for the active steps
+        add_statement()      -- Record one execution of a statement fingerprint
+        statement_summary()  -- Statements ordered by total execution time
+        add_section()        -- Attach an extra section to the run report
+        report()             -- Build the run report as a dict
+        write_report()       -- Write the JSON report and optional Prometheus file
+        reset()              -- Discard all measurements and start a new run
+
+    Instance Variables:
+        started_at -- Timestamp when the run started
+        steps      -- Dict of step name to StepStats
+        statements -- Dict of statement fingerprint to StatementStats
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty run.
+        """
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        """
+        Discard all measurements and start a new run.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.started_at = datetime.now()
+            self.steps = {}
+            self.statements = {}
+            self._sections = {}
+
+    def _active(self):
+        """
+        Return the stack of steps active in the current thread.
+
+        Returns:
+            list -- StepStats objects, outermost first
+        """
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def step(self, name):
+        """
+        Time a named step; counters recorded inside are attributed to it.
+
+        Parameters:
+            name -- Step name, e.g. 'transform.move_file'
+        """
+        with self._lock:
+            stats = self.steps.get(name)
+            if stats is None:
+                stats = self.steps[name] = StepStats()
+
+        stack = self._active()
+        stack.append(stats)
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            with self._lock:
+                stats.calls += 1
+                stats.total_seconds += elapsed
+                stats.durations.add(elapsed)
+                if elapsed > stats.max_seconds:
+                    stats.max_seconds = elapsed
+
+    def timed(self, name):
+        """
+        Decorate a function so that each call is recorded as a step.
+
+        Parameters:
+            name -- Step name
+
+        Returns:
+            function -- Decorator
+        """
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.step(name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def _add(self, field, amount):
+        """
+        Add an amount to a counter of every active step in this thread.
+
+        Parameters:
+            field  -- StepStats attribute name
+            amount -- Value to add
+
+        Returns:
+            None
+        """
+        stack = self._active()
+        if not stack or not amount:
+            return
+        with self._lock:
+            for stats in stack:
+                setattr(stats, field, getattr(stats, field) + amount)
+
+    def add_rows(self, count):
+        """
+        Record rows processed by the active steps.
+
+        Parameters:
+            count -- Number of rows
+
+        Returns:
+            None
+        """
+        self._add("rows", count)
+
+    def add_bytes_read(self, count):
+        """
+        Record bytes read by the active steps.
+
+        Parameters:
+            count -- Number of bytes
+
+        Returns:
+            None
+        """
+        self._add("bytes_read", count)
+
+    def add_bytes_written(self, count):
+        """
+        Record bytes written by the active steps.
+
+        Parameters:
+            count -- Number of bytes
+
+        Returns:
+            None
+        """
+        self._add("bytes_written", count)
+
+    def add_round_trip(self, count=1):
+        """
+        Record database round-trips made by the active steps.
+
+        Parameters:
+            count -- Number of round-trips (default 1)
+
+        Returns:
+            None
+        """
+        self._add("db_round_trips", count)
+
+    def add_statement(self, fingerprint, seconds, rows, slow=False):
+        """
+        Record one execution of a statement.
+
+        Statements are aggregated per fingerprint for the whole run,
+        independently of the active steps.
+
+        Parameters:
+            fingerprint -- Normalized statement text
+            seconds     -- Execution time
+            rows        -- Rows affected (ignored when negative)
+            slow        -- The execution exceeded the slow-statement threshold
+
+        Returns:
+            int -- Slow executions of the fingerprint so far in this run
+        """
+        with self._lock:
+            stats = self.statements.get(fingerprint)
+            if stats is None:
+                stats = self.statements[fingerprint] = StatementStats()
+            stats.calls += 1
+            stats.total_seconds += seconds
+            stats.durations.add(seconds)
+            if seconds > stats.max_seconds:
+                stats.max_seconds = seconds
+            if rows > 0:
+                stats.rows += rows
+            if slow:
+                stats.slow += 1
+            return stats.slow
+
+    def statement_summary(self, limit=None):
+        """
+        Return the statements of the run ordered by total execution time.
+
+        Parameters:
+            limit -- Maximum number of statements (default: all)
+
+        Returns:
+            list -- Dicts with the fingerprint and its measurements
+        """
+        with self._lock:
+            ordered = sorted(
+                self.statements.items(),
+                key=lambda item: item[1].total_seconds,
+                reverse=True,
+            )
+            return [
+                dict(statement=fingerprint, **stats.to_dict())
+                for fingerprint, stats in ordered[:limit]
+            ]
+
+    def add_section(self, name, data):
+        """
+        Attach an extra JSON-serializable section to the run report.
+
+        Parameters:
+            name -- Section name
+            data -- Section content
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._sections[name] = data
+
+    def report(self):
+        """
+        Build the run report.
+
+        Returns:
+            dict -- Run metadata, per-step and per-statement measurements
+        """
+        finished_at = datetime.now()
+        with self._lock:
+            report = {
+                "started_at": self.started_at.isoformat(),
+                "finished_at": finished_at.isoformat(),
+                "duration_seconds": round(
+                    (finished_at - self.started_at).total_seconds(), 6
+                ),
+                "steps": {
+                    name: stats.to_dict()
+                    for name, stats in sorted(self.steps.items())
+                },
+            }
+            report.update(self._sections)
+        report["statements"] = self.statement_summary()
+        return report
+
+    def write_report(self, report_dir=None, prometheus_file=None):
+        """
+        Write the run report as JSON and, optionally, as a Prometheus textfile.
+
+        Parameters:
+            report_dir      -- Directory for JSON reports
+                               (default: METRICS_REPORT_DIR or 'data/reports')
+            prometheus_file -- Path of the Prometheus textfile
+                               (default: METRICS_PROMETHEUS_FILE, disabled if unset)
+
+        Returns:
+            str -- Path of the JSON report
+        """
+        report = self.report()
+
+        report_dir = report_dir or os.getenv(
+            "METRICS_REPORT_DIR", os.path.join("data", "reports")
+        )
+        os.makedirs(report_dir, exist_ok=True)
+        report_path = os.path.join(
+            report_dir,
+            f'run_{self.started_at.strftime("%Y%m%d_%H%M%S_%f")[:-3]}.json',
+        )
+        with open(report_path, "w") as report_file:
+            json.dump(report, report_file, indent=4)
+
+        prometheus_file = prometheus_file or os.getenv(
+            "METRICS_PROMETHEUS_FILE"
+        )
+        if prometheus_file:
+            write_prometheus_textfile(report, prometheus_file)
+
+        return report_path
+
+
+def write_prometheus_textfile(report, file_path):
+    """
+    Write a run report in the Prometheus textfile-collector format.
+
+    The file is written to a temporary path and renamed, so the collector
+    never reads a partial file.
+
+    Parameters:
+        report    -- Report dict produced by RunMetrics.report()
+        file_path -- Target .prom file
+
+    Returns:
+        None
+    """
+    series = [
+        ("etl_step_calls_total", "counter", "calls"),
+        ("etl_step_duration_seconds", "gauge", "total_seconds"),
+        ("etl_step_max_duration_seconds", "gauge", "max_seconds"),
+        ("etl_step_rows_total", "counter", "rows"),
+        ("etl_step_rows_per_second", "gauge", "rows_per_second"),
+        ("etl_step_bytes_read_total", "counter", "bytes_read"),
+        ("etl_step_bytes_written_total", "counter", "bytes_written"),
+        ("etl_step_db_round_trips_total", "counter", "db_round_trips"),
+    ]
+
+    lines = [
+        "# TYPE etl_run_duration_seconds gauge",
+        f'etl_run_duration_seconds {report["duration_seconds"]}',
+    ]
+    for metric, metric_type, field in series:
+        lines.append(f"# TYPE {metric} {metric_type}")
+        for step_name, stats in report["steps"].items():
+            lines.append(f'{metric}{{step="{step_name}"}} {stats[field]}')
+
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, "w") as prom_file:
+        prom_file.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, file_path)
+
+
+metrics = RunMetrics()
@@ -0,0 +1,81 @@
+import cProfile
+import io
+import os
+import pstats
+import tracemalloc
+from datetime import datetime
+
+
+def profile_stage(stage_name, func, output_dir=None, top=20):
+    """
+    Run a stage under cProfile and tracemalloc and write the results to disk.
+
+    Writes '<stage>_<timestamp>.pstats' (load it with pstats or snakeviz) and
+    '<stage>_<timestamp>_alloc.txt' (allocation diff between the start and the
+    end of the stage), then prints the top functions by cumulative time and
+    the top allocating lines.
+
+    Parameters:
+        stage_name -- Name of the profiled stage, used in the output file names
+        func       -- Callable running the stage
+        output_dir -- Directory for output files
+                      (default: PROFILE_DIR or 'data/profiles')
+        top        -- Number of functions and allocation lines to print
+
+    Returns:
+        tuple -- (pstats file path, allocation diff file path)
+    """
+    output_dir = output_dir or os.getenv(
+        "PROFILE_DIR", os.path.join("data", "profiles")
+    )
+    os.makedirs(output_dir, exist_ok=True)
+    prefix = os.path.join(
+        output_dir,
+        f'{stage_name}_{datetime.now().strftime("%Y%m%d_%H%M%S")}',
+    )
+    stats_path = f"{prefix}.pstats"
+    alloc_path = f"{prefix}_alloc.txt"
+
+    tracemalloc.start(25)
+    start_snapshot = tracemalloc.take_snapshot()
+    profiler = cProfile.Profile()
+
+    try:
+        profiler.enable()
+        func()
+    finally:
+        profiler.disable()
+        end_snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        profiler.dump_stats(stats_path)
+
+        snapshot_filters = (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        )
+        alloc_diff = end_snapshot.filter_traces(snapshot_filters).compare_to(
+            start_snapshot.filter_traces(snapshot_filters), "lineno"
+        )
+        with open(alloc_path, "w") as alloc_file:
+            alloc_file.write(f"Peak traced memory: {peak / 1024:.1f} KiB\n")
+            for stat in alloc_diff:
+                alloc_file.write(f"{stat}\n")
+
+        cumulative = io.StringIO()
+        pstats.Stats(profiler, stream=cumulative).sort_stats(
+            pstats.SortKey.CUMULATIVE
+        ).print_stats(top)
+
+        print(f"Top {top} functions by cumulative time ({stage_name}):")
+        print(cumulative.getvalue())
+        print(f"Top {top} allocating lines ({stage_name}):")
+        for stat in alloc_diff[:top]:
+            print(f"  {stat}")
+        print(f"Peak traced memory: {peak / 1024:.1f} KiB")
+        print(f"Profile written to {stats_path}")
+        print(f"Allocation diff written to {alloc_path}")
+
+    return stats_path, alloc_path
@@ -0,0 +1,394 @@
+import math
+import os
+from decimal import Decimal, InvalidOperation
+
+
+# Prices, volumes and rates are held as integers in units of 10^-8, the
+# finest precision of the DECIMAL columns and the unit of fact_gold_tick.
+DECIMALS = 8
+SCALE = 10 ** DECIMALS
+
+# Canonical instance of every tuple of rate codes, shared by the GoldRow
+# records quoting the same currencies
+_rate_codes = {}
+
+
+def to_fixed(value):
+    """
+    Convert a number to its fixed-point integer representation.
+
+    Strings and Decimals are converted exactly, so a price read from an API
+    payload reaches its DECIMAL column without a float rounding step. Floats
+    are scaled and rounded.
+
+    Parameters:
+        value -- Number as a str, Decimal, float or int, or None
+
+    Returns:
+        int or None -- value * SCALE rounded to an integer
+
+    Raises:
+        ValueError -- If the value is not a finite number
+    """
+    if value is None:
+        return None
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValueError(f"Not a finite number: {value}")
+        return round(value * SCALE)
+    if isinstance(value, int):
+        return value * SCALE
+    try:
+        value = Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"Not a number: {value!r}") from None
+    if not value.is_finite():
+        raise ValueError(f"Not a finite number: {value}")
+    return int(value.scaleb(DECIMALS).to_integral_value())
+
+
+def from_fixed(value, decimals=None):
+    """
+    Convert a fixed-point integer back to an exact Decimal.
+
+    Parameters:
+        value    -- Fixed-point integer, or None
+        decimals -- Decimals to round to (default: keep all DECIMALS)
+
+    Returns:
+        Decimal or None -- value / SCALE
+    """
+    if value is None:
+        return None
+    number = Decimal(value).scaleb(-DECIMALS)
+    return number if decimals is None else round(number, decimals)
+
+
+def intern_rate_codes(codes):
+    """
+    Return the shared instance of a tuple of rate codes.
+
+    Parameters:
+        codes -- Tuple of currency codes
+
+    Returns:
+        tuple -- Equal tuple, the same object for every equal input
+    """
+    return _rate_codes.setdefault(codes, codes)
+
+
+class FileWorkItem:
+    """
+    One imported file to transform, as read from extract.import_log.
+
+    Files leased from transform.transform_queue also carry their queue
+    entry, the worker holding the lease, their run and their data type.
+
+    Methods:
+        __init__()  -- Initializes the item from its import_log fields
+        from_row()  -- Build an item from an import_log row
+        full_path   -- Path of the file (property)
+
+    Instance Variables:
+        id            -- import_log ID
+        batch_date    -- Date of the extraction batch
+        currency_id   -- Currency of the file, None when not known upfront
+        directory     -- Directory the file was imported to
+        filename      -- Name of the file
+        created_date  -- Creation time of the file
+        modified_date -- Last modification time of the file
+        row_count     -- Number of payloads in the file
+        queue_id      -- transform_queue ID (leased files only)
+        worker        -- Worker holding the lease (leased files only)
+        run_id        -- transform_run the file is logged under (leased files only)
+        data_type     -- 'bitcoin' or 'gold' (leased files only)
+        attempts      -- Number of times the file was leased (leased files only)
+    """
+
+    __slots__ = (
+        "id",
+        "batch_date",
+        "currency_id",
+        "directory",
+        "filename",
+        "created_date",
+        "modified_date",
+        "row_count",
+        "queue_id",
+        "worker",
+        "run_id",
+        "data_type",
+        "attempts",
+    )
+
+    def __init__(
+        self,
+        id,
+        batch_date,
+        currency_id,
+        directory,
+        filename,
+        created_date,
+        modified_date,
+        row_count,
+    ):
+        """
+        Initialize the item; the queue fields start as None.
+        """
+        self.id = id
+        self.batch_date = batch_date
+        self.currency_id = currency_id
+        self.directory = directory
+        self.filename = filename
+        self.created_date = created_date
+        self.modified_date = modified_date
+        self.row_count = row_count
+        self.queue_id = None
+        self.worker = None
+        self.run_id = None
+        self.data_type = None
+        self.attempts = None
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Build an item from an import_log row.
+
+        Parameters:
+            row -- (Id, batch_date, currency_id, import_directory_name,
+                    import_file_name, file_created_date,
+                    file_last_modified_date, row_count, ...) tuple; extra
+                    columns are ignored
+
+        Returns:
+            FileWorkItem -- New item
+        """
+        return cls(*row[:8])
+
+    @property
+    def full_path(self):
+        """
+        Path of the file, directory and name joined.
+        """
+        return os.path.join(self.directory, self.filename)
+
+
+class BtcRow:
+    """
+    One day of Bitcoin prices in a market, with fixed-point values.
+
+    Methods:
+        __init__() -- Initializes the row
+        params()   -- Parameters of the btc_data_import upsert
+
+    Instance Variables:
+        currency_id -- Market currency, None until resolved from its code
+        date        -- Trading day
+        open        -- Opening price (fixed-point)
+        high        -- Highest price (fixed-point)
+        low         -- Lowest price (fixed-point)
+        close       -- Closing price (fixed-point)
+        volume      -- Traded volume (fixed-point)
+    """
+
+    __slots__ = ("currency_id", "date", "open", "high", "low", "close", "volume")
+
+    def __init__(self, currency_id, date, open, high, low, close, volume):
+        """
+        Initialize the row.
+        """
+        self.currency_id = currency_id
+        self.date = date
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    def params(self):
+        """
+        Return the row as upsert parameters, prices as exact Decimals.
+
+        Returns:
+            tuple -- (currency_id, date, open, high, low, close, volume)
+        """
+        return (
+            self.currency_id,
+            self.date,
+            from_fixed(self.open),
+            from_fixed(self.high),
+            from_fixed(self.low),
+            from_fixed(self.close),
+            from_fixed(self.volume),
+        )
+
+
+class GoldRow:
+    """
+    One gold price snapshot of a base currency, with fixed-point values.
+
+    The snapshot is staged both as the daily row of its date and as a tick.
+    Rates are kept as a tuple aligned with a tuple of currency codes shared
+    by all the snapshots quoting the same currencies (see
+    intern_rate_codes()), rather than as a dict per snapshot.
+
+    Methods:
+        __init__()     -- Initializes the row
+        prices()       -- Fixed-point prices in column order
+        params()       -- Parameters of the gold_data_import upsert
+        tick_params()  -- Parameters of the gold_tick_import insert
+
+    Instance Variables:
+        currency_id -- Base currency, None until resolved from its code
+        date        -- Day of the snapshot
+        ts          -- Time of the snapshot, in milliseconds
+        open        -- Opening price (fixed-point)
+        high        -- Highest price (fixed-point)
+        low         -- Lowest price (fixed-point)
+        price       -- Spot price (fixed-point)
+        price_24k   -- 24k price (fixed-point)
+        price_18k   -- 18k price (fixed-point)
+        price_14k   -- 14k price (fixed-point)
+        rate_codes  -- Currency codes of the rates (shared tuple)
+        rates       -- Units of each currency per unit of the base (fixed-point)
+    """
+
+    __slots__ = (
+        "currency_id",
+        "date",
+        "ts",
+        "open",
+        "high",
+        "low",
+        "price",
+        "price_24k",
+        "price_18k",
+        "price_14k",
+        "rate_codes",
+        "rates",
+    )
+
+    def __init__(
+        self,
+        currency_id,
+        date,
+        ts,
+        open,
+        high,
+        low,
+        price,
+        price_24k,
+        price_18k,
+        price_14k,
+        rate_codes,
+        rates,
+    ):
+        """
+        Initialize the row.
+        """
+        self.currency_id = currency_id
+        self.date = date
+        self.ts = ts
+        self.open = open
+        self.high = high
+        self.low = low
+        self.price = price
+        self.price_24k = price_24k
+        self.price_18k = price_18k
+        self.price_14k = price_14k
+        self.rate_codes = rate_codes
+        self.rates = rates
+
+    def prices(self):
+        """
+        Return the fixed-point prices in column order.
+
+        Returns:
+            tuple -- (open, high, low, price, price_24k, price_18k, price_14k)
+        """
+        return (
+            self.open,
+            self.high,
+            self.low,
+            self.price,
+            self.price_24k,
+            self.price_18k,
+            self.price_14k,
+        )
+
+    def params(self, rate_codes):
+        """
+        Return the row as upsert parameters, values as exact Decimals.
+
+        Parameters:
+            rate_codes -- Currency codes of the rate columns, in order
+
+        Returns:
+            tuple -- (currency_id, date, open, high, low, price, price_24k,
+                     price_18k, price_14k, *rates), None for unquoted rates
+        """
+        rates = self.rates
+        if rate_codes != self.rate_codes:
+            quoted = dict(zip(self.rate_codes, rates))
+            rates = [quoted.get(code) for code in rate_codes]
+        return (
+            (self.currency_id, self.date)
+            + tuple(from_fixed(value) for value in self.prices())
+            + tuple(from_fixed(value) for value in rates)
+        )
+
+    def tick_params(self):
+        """
+        Return the row as tick parameters, prices as fixed-point integers.
+
+        Returns:
+            tuple -- (currency_id, date, ts, open, high, low, price,
+                     price_24k, price_18k, price_14k)
+        """
+        return (self.currency_id, self.date, self.ts) + self.prices()
+
+
+class RateRow:
+    """
+    One exchange rate of fact_exchange_rates, with a fixed-point rate.
+
+    Methods:
+        __init__() -- Initializes the row
+        key()      -- (date, base_currency_id, target_currency_id)
+        params()   -- Parameters of the fact_exchange_rates upsert
+
+    Instance Variables:
+        date               -- Day of the rate
+        base_currency_id   -- Currency the rate is quoted per unit of
+        target_currency_id -- Currency the rate is expressed in
+        rate               -- Units of target per unit of base (fixed-point)
+    """
+
+    __slots__ = ("date", "base_currency_id", "target_currency_id", "rate")
+
+    def __init__(self, date, base_currency_id, target_currency_id, rate):
+        """
+        Initialize the row.
+        """
+        self.date = date
+        self.base_currency_id = base_currency_id
+        self.target_currency_id = target_currency_id
+        self.rate = rate
+
+    def key(self):
+        """
+        Return the key of the row in fact_exchange_rates.
+
+        Returns:
+            tuple -- (date, base_currency_id, target_currency_id)
+        """
+        return (self.date, self.base_currency_id, self.target_currency_id)
+
+    def params(self):
+        """
+        Return the row as upsert parameters, the rate as an exact Decimal.
+
+        Returns:
+            tuple -- (date, base_currency_id, target_currency_id, rate)
+        """
+        return self.key() + (from_fixed(self.rate),)
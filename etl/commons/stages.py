@@ -0,0 +1,51 @@
+import importlib
+
+
+# Assets the stages can be restricted to, e.g. extract(assets=["gold"]).
+ASSETS = ("btc", "gold")
+
+# Stage name -> "module:function". Modules are imported only when the stage
+# is selected, so e.g. 'load' never imports requests or the extract loggers.
+STAGES = {
+    "extract": "etl.extract.main_extract:extract",
+    "transform": "etl.transform.main_transform:transform",
+    "worker": "etl.transform.main_transform:work",
+    "validate": "etl.validate.main_validate:validate",
+    "load": "etl.load.main_load:load",
+    "export": "etl.export.main_export:export",
+    "backfill": "etl.backfill.main_backfill:backfill",
+    "reprocess": "etl.reprocess.main_reprocess:reprocess",
+    "daemon": "etl.daemon.main_daemon:run_daemon",
+    "all-in-memory": "etl.pipeline.main_pipeline:run_in_memory",
+    "all-pipelined": "etl.pipeline.main_pipeline:run_pipelined",
+}
+
+
+def get_stage(name):
+    """
+    Import and return the entry point of a stage.
+
+    Parameters:
+        name -- Stage name (key of STAGES)
+
+    Returns:
+        function -- Stage entry point, or None if the stage is unknown
+    """
+    target = STAGES.get(name)
+    if target is None:
+        return None
+
+    module_name, function_name = target.split(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, function_name)
+
+
+def run_all():
+    """
+    Run extract, transform, validate and load in sequence.
+
+    Returns:
+        None
+    """
+    for name in ("extract", "transform", "validate", "load"):
+        get_stage(name)()
@@ -0,0 +1,195 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from etl.commons.engine import env_bool
+
+
+# StateCache per database identity, shared by every connector of the process
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+class StateCache:
+    """
+    Small on-disk store of metadata the stages would otherwise re-query at
+    every start: dimension mappings, schema metadata and log watermarks.
+
+    Entries live in a local SQLite file shared by every process on the host.
+    Each entry is stored with the database version it was read at; callers
+    compare it with the current version (see DBConnector.get_state_version())
+    before trusting the value. The cache is best-effort: a read or write
+    error is logged and treated as a miss.
+
+    Methods:
+        __init__() -- Opens the store for one database
+        get()      -- Return the version and value of an entry
+        put()      -- Store an entry with its version
+        forget()   -- Remove an entry
+
+    Instance Variables:
+        path      -- SQLite file of the store
+        namespace -- Identity of the database the entries describe
+        max_age   -- Seconds after which an entry is ignored
+                     (STATE_CACHE_MAX_AGE, default 86400)
+        logger    -- Logger instance
+    """
+
+    def __init__(self, path, namespace, logger):
+        """
+        Initialize the store, creating its file and table if needed.
+
+        Parameters:
+            path      -- SQLite file of the store
+            namespace -- Identity of the database the entries describe
+            logger    -- Logger instance of the current app
+        """
+        self.path = path
+        self.namespace = namespace
+        self.max_age = float(os.getenv("STATE_CACHE_MAX_AGE", "86400"))
+        self.logger = logger
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS state (
+                        namespace TEXT NOT NULL,
+                        name TEXT NOT NULL,
+                        version TEXT NOT NULL,
+                        value TEXT NOT NULL,
+                        updated_at REAL NOT NULL,
+                        PRIMARY KEY (namespace, name)
+                    )
+                    """
+                )
+        finally:
+            conn.close()
+
+    def _connect(self):
+        """
+        Open a connection to the store.
+
+        Returns:
+            sqlite3.Connection -- New connection
+        """
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, name):
+        """
+        Return an entry if it exists and is not older than max_age.
+
+        Parameters:
+            name -- Entry name
+
+        Returns:
+            tuple or None -- (version, value) as stored, None on a miss
+        """
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT version, value, updated_at FROM state "
+                    "WHERE namespace = ? AND name = ?",
+                    (self.namespace, name),
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error reading state cache {name}: {str(e)}")
+            return None
+
+        if row is None or time.time() - row[2] > self.max_age:
+            return None
+        return json.loads(row[0]), json.loads(row[1])
+
+    def put(self, name, version, value):
+        """
+        Store an entry, replacing the previous one.
+
+        Parameters:
+            name    -- Entry name
+            version -- JSON-serializable database version the value was read at
+            value   -- JSON-serializable value
+
+        Returns:
+            None
+        """
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO state "
+                        "(namespace, name, version, value, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (
+                            self.namespace,
+                            name,
+                            json.dumps(version),
+                            json.dumps(value),
+                            time.time(),
+                        ),
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error writing state cache {name}: {str(e)}")
+
+    def forget(self, name):
+        """
+        Remove an entry, so the next lookup reads the database.
+
+        Parameters:
+            name -- Entry name
+
+        Returns:
+            None
+        """
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "DELETE FROM state WHERE namespace = ? AND name = ?",
+                        (self.namespace, name),
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error clearing state cache {name}: {str(e)}")
+
+
+def get_state_cache(engine, logger):
+    """
+    Return the process-wide state cache of the engine's database.
+
+    Parameters:
+        engine -- StorageEngine the connector runs on
+        logger -- Logger instance of the current app
+
+    Returns:
+        StateCache or None -- None when STATE_CACHE is disabled
+    """
+    if not env_bool("STATE_CACHE", True):
+        return None
+
+    path = os.path.join(
+        os.getenv("STATE_DIR", os.path.join("data", "state")), "state.sqlite"
+    )
+    key = (path, engine.identity)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            try:
+                cache = _caches[key] = StateCache(path, engine.identity, logger)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"State cache disabled: {str(e)}")
+                return None
+        return cache
@@ -0,0 +1,215 @@
+import os
+import signal
+import threading
+import time
+
+from etl.commons.metrics import metrics
+from etl.commons.stages import ASSETS, get_stage
+from etl.daemon.logger_daemon import logger
+
+
+# Default seconds between two runs of each asset. Alpha Vantage's free tier
+# allows 25 requests a day, so Bitcoin runs daily by default.
+DEFAULT_INTERVALS = {"btc": 86400, "gold": 3600}
+
+
+class Job:
+    """
+    Periodic extract/transform/load cycle of one asset.
+
+    Methods:
+        __init__()      -- Configures the asset and its interval
+        due()           -- Whether the job should run now
+        schedule_next() -- Move to the next tick, skipping missed ones
+
+    Instance Variables:
+        asset    -- 'btc' or 'gold'
+        interval -- Seconds between two ticks
+        next_due -- time.monotonic() value of the next tick
+    """
+
+    def __init__(self, asset, interval):
+        """
+        Initialize a job that is due immediately.
+
+        Parameters:
+            asset    -- 'btc' or 'gold'
+            interval -- Seconds between two ticks
+        """
+        self.asset = asset
+        self.interval = interval
+        self.next_due = time.monotonic()
+
+    def due(self, now):
+        """
+        Return True if the job's tick has been reached.
+
+        Parameters:
+            now -- Current time.monotonic() value
+
+        Returns:
+            bool -- True if the job should run
+        """
+        return now >= self.next_due
+
+    def schedule_next(self, now):
+        """
+        Advance to the first tick after now.
+
+        Ticks missed while a cycle ran long (or the host was suspended) are
+        coalesced into the run that is about to start, instead of being
+        replayed one after another.
+
+        Parameters:
+            now -- Current time.monotonic() value
+
+        Returns:
+            int -- Number of missed ticks folded into this run
+        """
+        missed = int((now - self.next_due) // self.interval)
+        self.next_due += (missed + 1) * self.interval
+        return missed
+
+
+class Daemon:
+    """
+    Long-running scheduler keeping pools, sessions and caches warm between
+    ETL cycles.
+
+    Database connection pools, the HTTP session and the currency cache live
+    for the whole process, so a cycle only pays for the work it does.
+    SIGTERM and SIGINT finish the running cycle and then stop the loop; a
+    second signal aborts immediately.
+
+    Methods:
+        __init__()     -- Configures the jobs
+        request_stop() -- Signal handler asking the loop to stop
+        run_cycle()    -- Run extract, transform, validate and load for some assets
+        run()          -- Scheduling loop
+
+    Instance Variables:
+        jobs       -- Job instances, one per asset
+        stop_event -- Set when shutdown has been requested
+    """
+
+    def __init__(self, jobs):
+        """
+        Initialize the daemon.
+
+        Parameters:
+            jobs -- Job instances to schedule
+        """
+        self.jobs = jobs
+        self.stop_event = threading.Event()
+
+    def request_stop(self, signum, frame):
+        """
+        Ask the loop to stop after the running cycle.
+
+        Parameters:
+            signum -- Received signal number
+            frame  -- Current stack frame (unused)
+
+        Returns:
+            None
+        """
+        if self.stop_event.is_set():
+            logger.warning("Second stop signal received, aborting")
+            raise KeyboardInterrupt
+
+        logger.info(
+            f"Received {signal.Signals(signum).name}, stopping after the current cycle"
+        )
+        self.stop_event.set()
+
+    def run_cycle(self, assets):
+        """
+        Run extract, transform, validate and load for the given assets and write the
+        cycle's run report.
+
+        Parameters:
+            assets -- Assets whose jobs are due
+
+        Returns:
+            None
+        """
+        logger.info(f"Starting ETL cycle for {', '.join(assets)}")
+        try:
+            with metrics.step("daemon.cycle"):
+                for stage in ("extract", "transform", "validate", "load"):
+                    get_stage(stage)(assets=assets)
+            logger.info(f"ETL cycle for {', '.join(assets)} completed")
+        except Exception as e:
+            logger.error(f"ETL cycle failed: {str(e)}", exc_info=True)
+        finally:
+            report_path = metrics.write_report()
+            logger.info(f"Cycle report written to {report_path}")
+            metrics.reset()
+
+    def run(self):
+        """
+        Run due jobs until a stop signal is received.
+
+        Returns:
+            None
+        """
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+
+        while not self.stop_event.is_set():
+            now = time.monotonic()
+            due = [job for job in self.jobs if job.due(now)]
+
+            if due:
+                for job in due:
+                    missed = job.schedule_next(now)
+                    if missed:
+                        logger.warning(
+                            f"Coalescing {missed} missed {job.asset} ticks into one run"
+                        )
+                self.run_cycle([job.asset for job in due])
+                continue
+
+            wait = min(job.next_due for job in self.jobs) - now
+            logger.debug(f"Sleeping {wait:.1f}s until the next tick")
+            self.stop_event.wait(wait)
+
+        logger.info("Daemon stopped")
+
+
+def run_daemon():
+    """
+    Run the ETL as a daemon with per-API intervals.
+
+    DAEMON_BTC_INTERVAL and DAEMON_GOLD_INTERVAL set the seconds between two
+    cycles of each asset; DAEMON_ASSETS restricts the assets scheduled.
+
+    Returns:
+        None
+    """
+    assets = [
+        asset.strip()
+        for asset in os.getenv("DAEMON_ASSETS", ",".join(ASSETS)).split(",")
+        if asset.strip() in ASSETS
+    ]
+    jobs = [
+        Job(
+            asset,
+            float(
+                os.getenv(
+                    f"DAEMON_{asset.upper()}_INTERVAL",
+                    str(DEFAULT_INTERVALS[asset]),
+                )
+            ),
+        )
+        for asset in assets
+    ]
+    if not jobs:
+        logger.error(f"No valid assets in DAEMON_ASSETS, expected {ASSETS}")
+        return
+
+    logger.info(
+        "Starting ETL daemon: "
+        + ", ".join(f"{job.asset} every {job.interval:g}s" for job in jobs)
+    )
+    Daemon(jobs).run()
@@ -0,0 +1,238 @@
+from datetime import date
+
+from etl.commons.database import DBConnector
+from etl.commons.metrics import metrics
+from etl.export.logger_export import logger
+
+
+# Fact table -> query returning one month of facts joined with their
+# dimensions. Year and month are not selected: they are encoded in the
+# partition path (year=YYYY/month=MM).
+EXPORT_QUERIES = {
+    "fact_btc": """
+        SELECT
+            f.date,
+            c.code AS currency_code,
+            c.name AS currency_name,
+            d.day,
+            d.month_name,
+            d.quarter,
+            d.day_of_week,
+            d.week_of_year,
+            d.is_weekend,
+            f.open,
+            f.high,
+            f.low,
+            f.close,
+            f.volume,
+            f.updated_at
+        FROM warehouse.fact_btc f
+        JOIN warehouse.dim_currency c ON c.Id = f.currency_id
+        JOIN warehouse.dim_date d ON d.date = f.date
+        WHERE f.date >= %s AND f.date < %s
+        ORDER BY f.date, c.code
+    """,
+    "fact_gold": """
+        SELECT
+            f.date,
+            c.code AS currency_code,
+            c.name AS currency_name,
+            d.day,
+            d.month_name,
+            d.quarter,
+            d.day_of_week,
+            d.week_of_year,
+            d.is_weekend,
+            f.open,
+            f.high,
+            f.low,
+            f.price,
+            f.price_24k,
+            f.price_18k,
+            f.price_14k,
+            f.updated_at
+        FROM warehouse.fact_gold f
+        JOIN warehouse.dim_currency c ON c.Id = f.currency_id
+        JOIN warehouse.dim_date d ON d.date = f.date
+        WHERE f.date >= %s AND f.date < %s
+        ORDER BY f.date, c.code
+    """,
+    "fact_exchange_rates": """
+        SELECT
+            f.date,
+            b.code AS base_currency_code,
+            t.code AS target_currency_code,
+            t.name AS target_currency_name,
+            d.day,
+            d.month_name,
+            d.quarter,
+            d.day_of_week,
+            d.week_of_year,
+            d.is_weekend,
+            f.rate,
+            f.updated_at
+        FROM warehouse.fact_exchange_rates f
+        JOIN warehouse.dim_currency b ON b.Id = f.base_currency_id
+        JOIN warehouse.dim_currency t ON t.Id = f.target_currency_id
+        JOIN warehouse.dim_date d ON d.date = f.date
+        WHERE f.date >= %s AND f.date < %s
+        ORDER BY f.date, b.code, t.code
+    """,
+}
+
+
+class DBConnectorExport(DBConnector):
+    """
+    Reads warehouse facts for the Parquet export and tracks export watermarks.
+
+    Methods:
+        get_watermark()          -- Last exported updated_at of a fact table
+        get_next_watermark()     -- MAX(updated_at) capped at the database time minus a margin
+        get_changed_partitions() -- (year, month) partitions changed since a watermark
+        get_partition_rows()     -- Joined fact rows of one monthly partition
+        set_watermark()          -- Store the new watermark of a fact table
+    """
+
+    @metrics.timed("export.get_watermark")
+    def get_watermark(self, table):
+        """
+        Return the updated_at up to which a fact table has been exported.
+
+        Parameters:
+            table -- Fact table name (key of EXPORT_QUERIES)
+
+        Returns:
+            datetime or None -- Watermark, or None if never exported
+        """
+        try:
+            query = """
+                SELECT last_updated_at
+                FROM warehouse.export_watermark
+                WHERE table_name = %s
+            """
+            self.cursor.execute(query, (table,))
+            result = self.cursor.fetchone()
+            return result[0] if result else None
+
+        except Exception as e:
+            logger.error(
+                f"Error reading export watermark for {table}: {str(e)}",
+                exc_info=True,
+            )
+            raise
+
+    @metrics.timed("export.get_next_watermark")
+    def get_next_watermark(self, table, margin_seconds):
+        """
+        Return the watermark to store once the current export is written.
+
+        updated_at is set when a row is written, not when it is committed,
+        so a row can become visible with an updated_at older than rows
+        already exported. The watermark is therefore the most recent
+        updated_at capped at the database time minus a margin, read before
+        the export reads any row: rows updated within the margin are
+        checked again by the next export.
+
+        Parameters:
+            table          -- Fact table name (key of EXPORT_QUERIES)
+            margin_seconds -- Longest expected write transaction, in seconds
+
+        Returns:
+            datetime or None -- Watermark, or None if the table is empty
+        """
+        query = f"""
+            SELECT MAX(updated_at), DATE_ADD(NOW(4), INTERVAL %s SECOND)
+            FROM warehouse.{table}
+        """
+        self.cursor.execute(query, (-margin_seconds,))
+        latest, horizon = self.cursor.fetchone()
+        if latest is None:
+            return None
+        return min(latest, horizon)
+
+    @metrics.timed("export.get_changed_partitions")
+    def get_changed_partitions(self, table, since):
+        """
+        Return the monthly partitions holding rows updated after a watermark.
+
+        Parameters:
+            table -- Fact table name (key of EXPORT_QUERIES)
+            since -- Previous watermark, or None to export every partition
+
+        Returns:
+            list -- Sorted (year, month) tuples
+        """
+        query = f"""
+            SELECT DISTINCT YEAR(date), MONTH(date)
+            FROM warehouse.{table}
+        """
+        params = ()
+        if since is not None:
+            query += " WHERE updated_at > %s"
+            params = (since,)
+
+        self.cursor.execute(query, params)
+        partitions = sorted(
+            (int(year), int(month)) for year, month in self.cursor.fetchall()
+        )
+        logger.info(f"Found {len(partitions)} changed partitions in {table}")
+        return partitions
+
+    @metrics.timed("export.get_partition_rows")
+    def get_partition_rows(self, table, year, month):
+        """
+        Return the fact rows of one month, joined with dim_currency and dim_date.
+
+        Parameters:
+            table -- Fact table name (key of EXPORT_QUERIES)
+            year  -- Partition year
+            month -- Partition month
+
+        Returns:
+            tuple -- (column names, list of row tuples)
+        """
+        start = date(year, month, 1)
+        end = date(year + month // 12, month % 12 + 1, 1)
+
+        self.cursor.execute(EXPORT_QUERIES[table], (start, end))
+        rows = self.cursor.fetchall()
+        columns = [column[0] for column in self.cursor.description]
+        return columns, rows
+
+    @metrics.timed("export.set_watermark")
+    def set_watermark(self, table, last_updated_at, row_count):
+        """
+        Store the updated_at up to which a fact table has been exported.
+
+        Parameters:
+            table           -- Fact table name (key of EXPORT_QUERIES)
+            last_updated_at -- New watermark
+            row_count       -- Number of rows written by this export
+
+        Returns:
+            None
+        """
+        try:
+            query = """
+                INSERT INTO warehouse.export_watermark (
+                    table_name, last_updated_at, exported_at, row_count
+                )
+                VALUES (%s, %s, NOW(4), %s)
+                ON DUPLICATE KEY UPDATE
+                    last_updated_at = VALUES(last_updated_at),
+                    exported_at = NOW(4),
+                    row_count = VALUES(row_count)
+            """
+            self.cursor.execute(query, (table, last_updated_at, row_count))
+            self.conn.commit()
+            logger.info(
+                f"Export watermark for {table} set to {last_updated_at}"
+            )
+
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(
+                f"Error storing export watermark for {table}: {str(e)}",
+                exc_info=True,
+            )
+            raise
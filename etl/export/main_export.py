@@ -0,0 +1,79 @@
+import os
+
+from etl.commons.metrics import metrics
+from etl.export.database_export import DBConnectorExport, EXPORT_QUERIES
+from etl.export.logger_export import logger
+from etl.export.utils_export import write_partition
+
+
+def export_table(conn, table, export_dir):
+    """
+    Export the partitions of a fact table changed since its last export.
+
+    The new watermark is read before any partition is read and trails the
+    database time by EXPORT_WATERMARK_MARGIN seconds, so rows updated while
+    the export runs, or committed late, are picked up by the next export.
+    Partitions are rewritten whole, so exporting a row twice is harmless.
+
+    Parameters:
+        conn       -- Connected DBConnectorExport
+        table      -- Fact table name (key of EXPORT_QUERIES)
+        export_dir -- Root directory of the export
+
+    Returns:
+        int -- Number of rows written
+    """
+    since = conn.get_watermark(table)
+    until = conn.get_next_watermark(
+        table, int(os.getenv("EXPORT_WATERMARK_MARGIN", "300"))
+    )
+    if until is None:
+        logger.info(f"{table} is empty, nothing to export")
+        return 0
+
+    partitions = conn.get_changed_partitions(table, since)
+    if not partitions:
+        logger.info(f"{table} has not changed since {since}")
+        return 0
+
+    row_count = 0
+    for year, month in partitions:
+        columns, rows = conn.get_partition_rows(table, year, month)
+        write_partition(export_dir, table, year, month, columns, rows)
+        metrics.add_rows(len(rows))
+        row_count += len(rows)
+
+    conn.set_watermark(table, until, row_count)
+    logger.info(
+        f"Exported {row_count} rows in {len(partitions)} partitions of {table}"
+    )
+    return row_count
+
+
+@metrics.timed("export")
+def export():
+    """
+    Run the Parquet export of the warehouse facts.
+
+    Each fact table is joined with dim_currency and dim_date and written to
+    EXPORT_DIR/<table>/year=YYYY/month=MM/part-0.parquet. Only the monthly
+    partitions containing rows updated since the previous export are
+    rewritten.
+    """
+    logger.info("Starting Export process")
+
+    export_dir = os.getenv("EXPORT_DIR", os.path.join("data", "export"))
+
+    conn = DBConnectorExport(logger=logger)
+    conn.connect()
+
+    try:
+        for table in EXPORT_QUERIES:
+            with metrics.step(f"export.{table}"):
+                export_table(conn, table, export_dir)
+    except Exception as e:
+        logger.error(f"Export process failed: {str(e)}", exc_info=True)
+    finally:
+        conn.disconnect()
+
+    logger.info("Export process completed")
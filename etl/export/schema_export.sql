@@ -0,0 +1,13 @@
+# Export schema
+USE warehouse;
+
+
+DROP TABLE IF EXISTS export_watermark;
+
+
+CREATE TABLE export_watermark(
+    table_name VARCHAR(30) PRIMARY KEY,
+    last_updated_at TIMESTAMP(4) NOT NULL,
+    exported_at TIMESTAMP(4) NOT NULL,
+    row_count INT
+);
@@ -0,0 +1,157 @@
+import datetime
+import os
+
+from etl.commons.metrics import metrics
+from etl.export.logger_export import logger
+
+
+# Column name -> Arrow type name. Prices and rates are exported as float64,
+# which every Parquet reader handles; the warehouse stays the exact source.
+COLUMN_TYPES = {
+    "date": "date32",
+    "currency_code": "string",
+    "currency_name": "string",
+    "base_currency_code": "string",
+    "target_currency_code": "string",
+    "target_currency_name": "string",
+    "day": "int8",
+    "month_name": "string",
+    "quarter": "int8",
+    "day_of_week": "int8",
+    "week_of_year": "int8",
+    "is_weekend": "bool",
+    "open": "float64",
+    "high": "float64",
+    "low": "float64",
+    "close": "float64",
+    "volume": "float64",
+    "price": "float64",
+    "price_24k": "float64",
+    "price_18k": "float64",
+    "price_14k": "float64",
+    "rate": "float64",
+    "updated_at": "timestamp[ms]",
+}
+
+
+def _pyarrow():
+    """
+    Import pyarrow on first use, so the other stages do not need it.
+
+    Returns:
+        tuple -- (pyarrow, pyarrow.parquet) modules
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "The export stage requires pyarrow: pip install -r requirements.txt"
+        ) from e
+
+    return pyarrow, pyarrow.parquet
+
+
+def _convert(value, type_name):
+    """
+    Normalise a database value for an Arrow column.
+
+    MySQL returns Decimal and datetime objects, SQLite returns floats, ints
+    and ISO strings; both are mapped to the same Python types.
+
+    Parameters:
+        value     -- Value read from the database
+        type_name -- Arrow type name from COLUMN_TYPES
+
+    Returns:
+        object -- Value accepted by pyarrow for that type
+    """
+    if value is None:
+        return None
+    if type_name == "float64":
+        return float(value)
+    if type_name == "bool":
+        return bool(value)
+    if type_name.startswith("int"):
+        return int(value)
+    if type_name == "date32" and not isinstance(value, datetime.date):
+        return datetime.date.fromisoformat(str(value)[:10])
+    if type_name.startswith("timestamp") and not isinstance(
+        value, datetime.datetime
+    ):
+        return datetime.datetime.fromisoformat(str(value))
+    return value
+
+
+def to_arrow_table(columns, rows):
+    """
+    Build an Arrow table from database rows.
+
+    Parameters:
+        columns -- Column names, in row order
+        rows    -- List of row tuples
+
+    Returns:
+        pyarrow.Table -- Table with the types from COLUMN_TYPES
+    """
+    pa, _ = _pyarrow()
+
+    arrays = []
+    fields = []
+    for index, name in enumerate(columns):
+        type_name = COLUMN_TYPES.get(name, "string")
+        arrow_type = pa.type_for_alias(type_name)
+        values = [_convert(row[index], type_name) for row in rows]
+        arrays.append(pa.array(values, type=arrow_type))
+        fields.append(pa.field(name, arrow_type))
+
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+@metrics.timed("export.write_partition")
+def write_partition(export_dir, table, year, month, columns, rows):
+    """
+    Write one monthly partition of a fact table, replacing any previous file.
+
+    The file is written to a temporary name and renamed, so readers never
+    see a partially written partition.
+
+    Parameters:
+        export_dir -- Root directory of the export
+        table      -- Fact table name
+        year       -- Partition year
+        month      -- Partition month
+        columns    -- Column names
+        rows       -- List of row tuples
+
+    Returns:
+        str -- Path of the written Parquet file
+    """
+    _, pq = _pyarrow()
+
+    partition_dir = os.path.join(
+        export_dir, table, f"year={year}", f"month={month:02d}"
+    )
+    os.makedirs(partition_dir, exist_ok=True)
+    file_path = os.path.join(partition_dir, "part-0.parquet")
+    tmp_path = f"{file_path}.tmp"
+
+    try:
+        pq.write_table(
+            to_arrow_table(columns, rows),
+            tmp_path,
+            compression=os.getenv("EXPORT_COMPRESSION", "snappy"),
+        )
+        os.replace(tmp_path, file_path)
+
+    except Exception as e:
+        logger.error(
+            f"Error writing partition {partition_dir}: {str(e)}", exc_info=True
+        )
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    metrics.add_bytes_written(os.path.getsize(file_path))
+    logger.info(f"Wrote {len(rows)} rows to {file_path}")
+    return file_path
@@ -1,8 +1,15 @@
 from datetime import datetime
-import requests
 import os
 
-from etl.extract.utils_extract import save_to_file, process_api_response
+from etl.commons.metrics import metrics
+from etl.extract.utils_extract import (
+    get_breaker,
+    get_session,
+    http_timeout,
+    process_api_response,
+    save_to_file,
+    validate_payload,
+)
 from etl.extract.database_extract import DBConnectorExtract
 from etl.extract.logger_extract import logger
 
@@ -14,7 +21,7 @@ class BitcoinExtract:
     Methods:
         __init__(conn)         -- Initializes with a DB connection
         call()                 -- Run extraction process for all currencies
-        get_bitcoin_data()     -- Fetch and store Bitcoin data for a specific market
+        get_bitcoin_data()     -- Fetch and store (or hand off) Bitcoin data for a market
 
     Instance Variables:
         api_key  -- API key for Alpha Vantage
@@ -34,13 +41,21 @@ class BitcoinExtract:
         self.conn = conn
         logger.debug("BitcoinAPI client initialized")
 
-    def get_bitcoin_data(self, market, function="DIGITAL_CURRENCY_DAILY"):
+    def get_bitcoin_data(
+        self, market, function="DIGITAL_CURRENCY_DAILY", sink=None, publish=None
+    ):
         """
         Fetch Bitcoin daily data for a given market and save it to a file.
 
+        When a sink is given, the parsed payload is handed to it instead of
+        being written to data/raw and logged in import_log. A publish callable
+        receives the import_log ID of each file once it is saved and logged.
+
         Parameters:
             market   -- Target currency code (e.g., 'USD')
             function -- Alpha Vantage function to call (default: 'DIGITAL_CURRENCY_DAILY')
+            sink     -- Optional callable(api_type, currency_code, currency_id, data, row_count)
+            publish  -- Optional callable(import_log_id)
 
         Returns:
             tuple -- (start_time, end_time, response_code, error_message)
@@ -59,16 +74,41 @@ class BitcoinExtract:
 
         start = datetime.now()
         start_time = start.strftime("%Y-%m-%d %H:%M:%S.%f")[:-2]
+
+        breaker = get_breaker("BTC")
+        if not breaker.allow():
+            logger.warning(f"Bitcoin API circuit is open, skipping {market}")
+            return start_time, None, None, "BTC circuit open"
         logger.debug(f"API request started at: {start_time}")
 
         try:
-            response = requests.get(self.base_url, params=params)
+            with metrics.step("extract.btc_api_request"):
+                response = get_session().get(
+                    self.base_url, params=params, timeout=http_timeout()
+                )
             end = datetime.now()
             end_time = end.strftime("%Y-%m-%d %H:%M:%S.%f")[:-2]
             logger.debug(f"API response received at: {end_time}")
 
             response_code, error_message, data = process_api_response(response)
 
+            error_message, quota_exhausted = validate_payload("btc", data)
+            if error_message:
+                breaker.record_failure(quota_exhausted)
+                logger.error(
+                    f"Bitcoin API returned no data for {market}: {error_message}"
+                )
+                return start_time, end_time, response_code, error_message
+            breaker.record_success()
+
+            if sink is not None:
+                row_count = len(
+                    data.get("Time Series (Digital Currency Daily)", {})
+                )
+                currency_id = self.conn.get_currency_by_code(market)
+                sink("btc", market, currency_id, data, row_count)
+                return start_time, end_time, response_code, error_message
+
             logger.debug("Saving data to file")
             file_path, file_created_date, file_last_modified_date = (
                 save_to_file(data, "btc")
@@ -83,7 +123,7 @@ class BitcoinExtract:
             currency_id = self.conn.get_currency_by_code(market)
             if currency_id:
                 logger.debug(f"Logging import for currency_id: {currency_id}")
-                self.conn.log_import(
+                import_log_id = self.conn.log_import(
                     currency_id,
                     os.path.dirname(file_path),
                     os.path.basename(file_path),
@@ -91,6 +131,8 @@ class BitcoinExtract:
                     file_last_modified_date,
                     row_count,
                 )
+                if publish is not None and import_log_id:
+                    publish(import_log_id)
             else:
                 logger.error(
                     f"Could not find currency_id for market: {market}"
@@ -99,17 +141,25 @@ class BitcoinExtract:
             return start_time, end_time, response_code, error_message
 
         except Exception as e:
+            breaker.record_failure(
+                getattr(getattr(e, "response", None), "status_code", None)
+                == 429
+            )
             logger.error(
                 f"Failed to fetch or process Bitcoin data: {str(e)}",
                 exc_info=True,
             )
             return start_time, None, None, str(e)
 
-    def call(self):
+    def call(self, sink=None, publish=None):
         """
         Fetch and log Bitcoin data for all currencies in the system.
         Loops through available currencies and logs API import details.
 
+        Parameters:
+            sink    -- Optional payload consumer passed to get_bitcoin_data()
+            publish -- Optional saved-file consumer passed to get_bitcoin_data()
+
         Returns:
             None
         """
@@ -120,16 +170,25 @@ class BitcoinExtract:
             f"Processing {len(currencies)} currencies for Bitcoin data"
         )
 
-        for currency in currencies:
+        breaker = get_breaker("BTC")
+        for index, currency in enumerate(currencies):
             currency_id = currency[0]
             currency_code = currency[1]
+            if breaker.is_open():
+                logger.warning(
+                    f"Bitcoin API circuit is open, skipping the remaining "
+                    f"{len(currencies) - index} currencies"
+                )
+                break
             logger.info(
                 f"Processing currency: {currency_code} (ID: {currency_id})"
             )
 
             try:
                 start_time, end_time, response_code, error_message = (
-                    self.get_bitcoin_data(currency_code)
+                    self.get_bitcoin_data(
+                        currency_code, sink=sink, publish=publish
+                    )
                 )
                 logger.debug(f"API response code: {response_code}")
                 self.conn.log_api_import(
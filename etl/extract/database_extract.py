@@ -1,9 +1,14 @@
 from datetime import datetime
 
 from etl.commons.database import DBConnector
+from etl.commons.metrics import metrics
 from etl.extract.logger_extract import logger
 
 
+# Width of api_import_log.error_messages (VARCHAR(255))
+ERROR_MESSAGES_WIDTH = 255
+
+
 class DBConnectorExtract(DBConnector):
     """
     Extends DBConnector with methods specific to logging extract operations.
@@ -13,6 +18,7 @@ class DBConnectorExtract(DBConnector):
         log_api_import()  -- Insert metadata about API-based data imports
     """
 
+    @metrics.timed("extract.log_import")
     def log_import(
         self,
         currency_id,
@@ -34,7 +40,7 @@ class DBConnectorExtract(DBConnector):
             row_count               -- Number of data rows imported
 
         Returns:
-            None
+            int or None -- ID of the new import_log row, None if logging failed
         """
         try:
             logger.debug(
@@ -54,12 +60,16 @@ class DBConnectorExtract(DBConnector):
                 file_last_modified_date,
                 row_count,
             )
-            self.cursor.execute(query, values)
+            self.prepared_cursor.execute(query, values)
             self.conn.commit()
             logger.debug("Import logged successfully")
+            return self.prepared_cursor.lastrowid
         except Exception as e:
+            self.conn.rollback()
             logger.error(f"Failed to log import: {str(e)}", exc_info=True)
+            return None
 
+    @metrics.timed("extract.log_api_import")
     def log_api_import(
         self,
         currency_id,
@@ -78,7 +88,8 @@ class DBConnectorExtract(DBConnector):
             start_time     -- Start timestamp of the API request
             end_time       -- End timestamp of the API request
             code_response  -- HTTP response code from the API
-            error_messages -- Optional error message from the API
+            error_messages -- Optional error message from the API, truncated
+                              to ERROR_MESSAGES_WIDTH characters
 
         Returns:
             None
@@ -87,6 +98,8 @@ class DBConnectorExtract(DBConnector):
             logger.debug(
                 f"Logging API import for currency_id: {currency_id}, api_id: {api_id}"
             )
+            if error_messages and len(error_messages) > ERROR_MESSAGES_WIDTH:
+                error_messages = error_messages[: ERROR_MESSAGES_WIDTH - 3] + "..."
             query = """
                     INSERT INTO extract.api_import_log (currency_id, api_id, start_time, end_time, code_response, 
                     error_messages)
@@ -100,8 +113,9 @@ class DBConnectorExtract(DBConnector):
                 code_response,
                 error_messages,
             )
-            self.cursor.execute(query, values)
+            self.prepared_cursor.execute(query, values)
             self.conn.commit()
             logger.debug("API import logged successfully")
         except Exception as e:
+            self.conn.rollback()
             logger.error(f"Failed to log API import: {str(e)}", exc_info=True)
@@ -1,8 +1,15 @@
-import requests
 import os
 from datetime import datetime
 
-from etl.extract.utils_extract import save_to_file, process_api_response
+from etl.commons.metrics import metrics
+from etl.extract.utils_extract import (
+    get_breaker,
+    get_session,
+    http_timeout,
+    process_api_response,
+    save_to_file,
+    validate_payload,
+)
 from etl.extract.database_extract import DBConnectorExtract
 from etl.extract.logger_extract import logger
 
@@ -14,12 +21,13 @@ class GoldExtract:
     Methods:
         __init__()         -- Initializes with a DB connection
         call()             -- Run extraction process for all currencies
-        get_gold_data()    -- Fetch and store gold price data for a specific base currency
+        get_gold_data()    -- Fetch and store (or hand off) gold price data for a base currency
 
     Instance Variables:
-        api_key  -- API key for Gold API
-        base_url -- Endpoint URL for API requests
-        conn     -- DBConnectorExtract instance for DB operations
+        api_key        -- API key for Gold API
+        base_url       -- Endpoint URL for latest-price requests
+        historical_url -- Endpoint URL for prices of a past date
+        conn           -- DBConnectorExtract instance for DB operations
     """
 
     def __init__(self, conn: DBConnectorExtract):
@@ -31,15 +39,25 @@ class GoldExtract:
         """
         self.api_key = os.environ.get("GOLD_API_KEY")
         self.base_url = "https://gold.g.apised.com/v1/latest"
+        self.historical_url = "https://gold.g.apised.com/v1/historical"
         self.conn = conn
         logger.debug("GoldAPI client initialized")
 
-    def get_gold_data(self, symbol):
+    def get_gold_data(self, symbol, sink=None, date=None, publish=None):
         """
         Fetch gold prices for a given base currency and save the result to a file.
 
+        When a sink is given, the parsed payload is handed to it instead of
+        being written to data/raw and logged in import_log. When a date is
+        given, the prices of that day are requested from the historical
+        endpoint instead of the latest prices. A publish callable receives
+        the import_log ID of each file once it is saved and logged.
+
         Parameters:
-            symbol -- The base currency (e.g., 'USD')
+            symbol  -- The base currency (e.g., 'USD')
+            sink    -- Optional callable(api_type, currency_code, currency_id, data, row_count)
+            date    -- Optional past date to fetch prices for
+            publish -- Optional callable(import_log_id)
 
         Returns:
             tuple -- start time, end time, response code, error message
@@ -57,25 +75,49 @@ class GoldExtract:
             "currencies": currencies_param,
         }
 
+        url = self.base_url
+        if date is not None:
+            url = self.historical_url
+            params["date"] = date.isoformat()
+
         headers = {"x-api-key": self.api_key}
 
-        logger.debug(
-            f"Making API request to {self.base_url} with params: {params}"
-        )
+        logger.debug(f"Making API request to {url} with params: {params}")
 
         start = datetime.now()
         start_time = start.strftime("%Y-%m-%d %H:%M:%S.%f")[:-2]
 
+        breaker = get_breaker("XAU")
+        if not breaker.allow():
+            logger.warning(f"Gold API circuit is open, skipping {symbol}")
+            return start_time, None, None, "XAU circuit open"
+
         try:
-            response = requests.get(
-                self.base_url, params=params, headers=headers
-            )
+            with metrics.step("extract.gold_api_request"):
+                response = get_session().get(
+                    url, params=params, headers=headers, timeout=http_timeout()
+                )
 
             end = datetime.now()
             end_time = end.strftime("%Y-%m-%d %H:%M:%S.%f")[:-2]
 
             response_code, error_message, data = process_api_response(response)
 
+            error_message, quota_exhausted = validate_payload("gold", data)
+            if error_message:
+                breaker.record_failure(quota_exhausted)
+                logger.error(
+                    f"Gold API returned no data for {symbol}: {error_message}"
+                )
+                return start_time, end_time, response_code, error_message
+            breaker.record_success()
+
+            if sink is not None:
+                row_count = len(data.get("data", {}).get("metal_prices", {}))
+                currency_id = self.conn.get_currency_by_code(symbol)
+                sink("gold", symbol, currency_id, data, row_count)
+                return start_time, end_time, response_code, error_message
+
             logger.debug("Saving data to file")
             file_path, file_created_date, file_last_modified_date = (
                 save_to_file(data, "gold")
@@ -88,7 +130,7 @@ class GoldExtract:
             currency_id = self.conn.get_currency_by_code(symbol)
             if currency_id:
                 logger.debug(f"Logging import for currency_id: {currency_id}")
-                self.conn.log_import(
+                import_log_id = self.conn.log_import(
                     currency_id,
                     os.path.dirname(file_path),
                     os.path.basename(file_path),
@@ -96,6 +138,8 @@ class GoldExtract:
                     file_last_modified_date,
                     row_count,
                 )
+                if publish is not None and import_log_id:
+                    publish(import_log_id)
             else:
                 logger.error(
                     f"Could not find currency_id for symbol: {symbol}"
@@ -103,17 +147,25 @@ class GoldExtract:
 
             return start_time, end_time, response_code, error_message
         except Exception as e:
+            breaker.record_failure(
+                getattr(getattr(e, "response", None), "status_code", None)
+                == 429
+            )
             logger.error(
-                f"Failed to fetch or process Bitcoin data: {str(e)}",
+                f"Failed to fetch or process Gold data: {str(e)}",
                 exc_info=True,
             )
             return start_time, None, None, str(e)
 
-    def call(self):
+    def call(self, sink=None, publish=None):
         """
         Extract and log gold price data for all currencies in the system.
         Iterates over available currencies and logs API metadata.
 
+        Parameters:
+            sink    -- Optional payload consumer passed to get_gold_data()
+            publish -- Optional saved-file consumer passed to get_gold_data()
+
         Returns:
             None
         """
@@ -122,16 +174,25 @@ class GoldExtract:
         currencies = self.conn.get_currencies()
         logger.info(f"Processing {len(currencies)} currencies for Gold data")
 
-        for currency in currencies:
+        breaker = get_breaker("XAU")
+        for index, currency in enumerate(currencies):
             currency_id = currency[0]
             currency_code = currency[1]
+            if breaker.is_open():
+                logger.warning(
+                    f"Gold API circuit is open, skipping the remaining "
+                    f"{len(currencies) - index} currencies"
+                )
+                break
             logger.info(
                 f"Processing currency: {currency_code} (ID: {currency_id})"
             )
 
             try:
                 start_time, end_time, response_code, error_message = (
-                    self.get_gold_data(currency_code)
+                    self.get_gold_data(
+                        currency_code, sink=sink, publish=publish
+                    )
                 )
                 logger.debug(f"API response code: {response_code}")
                 self.conn.log_api_import(
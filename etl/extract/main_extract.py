@@ -1,35 +1,43 @@
+from etl.commons.metrics import metrics
+from etl.commons.stages import ASSETS
 from etl.extract.btc_extract import BitcoinExtract
 from etl.extract.gold_extract import GoldExtract
 from etl.extract.database_extract import DBConnectorExtract
 from etl.extract.logger_extract import logger
 
 
-def extract():
+@metrics.timed("extract")
+def extract(assets=ASSETS):
     """
      Run the full data extraction process.
 
-     This function establishes a connection to the MySQL database,
+     This function establishes a connection to the database,
      extracts data from the Bitcoin and Gold APIs, logs the imports,
      and then closes the DB connection.
+
+     Parameters:
+         assets -- Assets to extract, 'btc' and/or 'gold' (default: both)
      """
     logger.info("Starting Extract process")
 
-    logger.info("Connecting to MySQL database")
     conn = DBConnectorExtract(logger=logger)
+    logger.info(f"Connecting to {conn.engine.name} database")
 
     conn.connect()
 
-    logger.info("Starting Bitcoin API data extraction")
-    btc = BitcoinExtract(conn)
-    btc.call()
-    logger.info("Bitcoin API data extraction complete")
+    if "btc" in assets:
+        logger.info("Starting Bitcoin API data extraction")
+        btc = BitcoinExtract(conn)
+        btc.call()
+        logger.info("Bitcoin API data extraction complete")
 
-    logger.info("Starting Gold API data extraction")
-    gold = GoldExtract(conn)
-    gold.call()
-    logger.info("Gold API data extraction complete")
+    if "gold" in assets:
+        logger.info("Starting Gold API data extraction")
+        gold = GoldExtract(conn)
+        gold.call()
+        logger.info("Gold API data extraction complete")
 
     conn.disconnect()
-    logger.info("Connection to MySQL database closed")
+    logger.info(f"Connection to {conn.engine.name} database closed")
 
     logger.info("Extract process completed successfully")
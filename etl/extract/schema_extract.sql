@@ -31,6 +31,7 @@ USE extract;
 DROP TABLE IF EXISTS api;
 DROP TABLE IF EXISTS api_import_log;
 DROP TABLE IF EXISTS import_log;
+DROP TABLE IF EXISTS backfill_state;
 
 
 CREATE TABLE api(
@@ -67,4 +68,20 @@ CREATE TABLE api_import_log(
     error_messages VARCHAR(255),
     FOREIGN KEY (api_id) REFERENCES api(Id) ON DELETE SET NULL,
     FOREIGN KEY (currency_id) REFERENCES warehouse.dim_currency(Id) ON DELETE SET NULL
+);
+
+
+CREATE TABLE backfill_state(
+    Id INT AUTO_INCREMENT PRIMARY KEY,
+    api_id VARCHAR(3) NOT NULL,
+    currency_id INT NOT NULL,
+    chunk_start DATE NOT NULL,
+    chunk_end DATE NOT NULL,
+    status VARCHAR(15) NOT NULL,
+    row_count INT,
+    error_messages VARCHAR(255),
+    updated_at TIMESTAMP(4) NOT NULL,
+    FOREIGN KEY (api_id) REFERENCES api(Id),
+    FOREIGN KEY (currency_id) REFERENCES warehouse.dim_currency(Id),
+    UNIQUE INDEX idx_unit (api_id, currency_id, chunk_start, chunk_end)
 );
\ No newline at end of file
@@ -1,10 +1,55 @@
 import os
+import threading
+import time
 from datetime import datetime
 import json
 
+import requests
+from requests.adapters import HTTPAdapter
+
+from etl.commons.metrics import metrics
 from etl.extract.logger_extract import logger
 
 
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Return the HTTP session shared by the API clients.
+
+    Reusing one session keeps TCP connections and TLS sessions to the APIs
+    alive across currencies, stages and daemon cycles. HTTP_POOL_SIZE sets
+    the number of pooled connections per host.
+
+    Returns:
+        requests.Session -- Process-wide session
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                pool_size = int(os.getenv("HTTP_POOL_SIZE", "8"))
+                session = requests.Session()
+                session.mount(
+                    "https://",
+                    HTTPAdapter(pool_connections=4, pool_maxsize=pool_size),
+                )
+                _session = session
+    return _session
+
+
+def http_timeout():
+    """
+    Return the timeout applied to API requests (HTTP_TIMEOUT, in seconds).
+
+    Returns:
+        float -- Timeout in seconds
+    """
+    return float(os.getenv("HTTP_TIMEOUT", "30"))
+
+
 def process_api_response(response):
     """
     Handle and parse an HTTP API response.
@@ -30,6 +75,7 @@ def process_api_response(response):
             logger.debug("API request successful")
 
         response.raise_for_status()
+        metrics.add_bytes_read(len(response.content))
         data = response.json()
         logger.debug("API response parsed successfully")
 
@@ -42,12 +88,190 @@ def process_api_response(response):
         raise
 
 
+# Top-level keys Alpha Vantage uses for error bodies returned with HTTP 200.
+# "Note" and "Information" announce an exhausted request quota.
+BTC_ERROR_KEYS = ("Error Message", "Note", "Information")
+BTC_QUOTA_KEYS = ("Note", "Information")
+
+
+def validate_payload(api_type, data):
+    """
+    Check that a parsed API response carries data rather than an error body.
+
+    Parameters:
+        api_type -- 'btc' or 'gold'
+        data     -- Parsed JSON response
+
+    Returns:
+        tuple -- (error message or None, True if the quota is exhausted)
+    """
+    if not isinstance(data, dict):
+        return f"Unexpected {api_type} response: {type(data).__name__}", False
+
+    if api_type == "btc":
+        for key in BTC_ERROR_KEYS:
+            if key in data:
+                return f"{key}: {data[key]}", key in BTC_QUOTA_KEYS
+        if not data.get("Time Series (Digital Currency Daily)"):
+            return "No Time Series in Bitcoin response", False
+        return None, False
+
+    if data.get("status") != "success":
+        message = data.get("message") or data.get("error")
+        return f"Gold API status {data.get('status')}: {message}", False
+    if not data.get("data", {}).get("metal_prices"):
+        return "No metal prices in Gold response", False
+    return None, False
+
+
+class CircuitBreaker:
+    """
+    Stops calling an API after repeated failures or an exhausted quota, and
+    lets a trial request through once a cool-down has passed.
+
+    Once the cool-down has passed the circuit is half-open: allow() lets
+    exactly one caller send the trial request and turns every other caller
+    away until the trial records a success (closing the circuit) or a
+    failure (opening it for another cool-down). A trial that never reports
+    back is replaced by a new one after a further cool-down.
+
+    Methods:
+        __init__()       -- Configures the threshold and the cool-down
+        allow()          -- Whether a request may be sent now
+        is_open()        -- Whether requests are currently turned away
+        record_success() -- Close the circuit after a good response
+        record_failure() -- Count a failure, opening the circuit if needed
+
+    Instance Variables:
+        name              -- API identifier used in log messages
+        failure_threshold -- Consecutive failures that open the circuit
+        cool_down         -- Seconds the circuit stays open
+    """
+
+    def __init__(self, name, failure_threshold=3, cool_down=900.0):
+        """
+        Initialize a closed circuit.
+
+        Parameters:
+            name              -- API identifier used in log messages
+            failure_threshold -- Consecutive failures that open the circuit
+            cool_down         -- Seconds the circuit stays open
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.cool_down = cool_down
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Return True if a request may be sent.
+
+        The first caller after the cool-down gets the trial request; the
+        circuit's cool-down restarts with it, so concurrent callers keep
+        getting False until the trial records its outcome.
+
+        Returns:
+            bool -- False while the circuit is open or a trial is running
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at < self.cool_down:
+                return False
+            self._opened_at = now
+            logger.info(f"{self.name} circuit half-open, sending a trial request")
+            return True
+
+    def is_open(self):
+        """
+        Return True if requests are turned away, without taking the trial.
+
+        Returns:
+            bool -- True while the circuit is open or a trial is running
+        """
+        with self._lock:
+            return (
+                self._opened_at is not None
+                and time.monotonic() - self._opened_at < self.cool_down
+            )
+
+    def record_success(self):
+        """
+        Reset the failure count and close the circuit.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info(f"{self.name} circuit closed after a success")
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self, quota_exhausted=False):
+        """
+        Count a failed request and open the circuit when the threshold is
+        reached, or at once if the API reported an exhausted quota.
+
+        Parameters:
+            quota_exhausted -- True if the API said the quota is used up
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._failures += 1
+            if quota_exhausted or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                logger.warning(
+                    f"{self.name} circuit open for {self.cool_down:g}s after "
+                    f"{self._failures} failed requests"
+                    + (" (quota exhausted)" if quota_exhausted else "")
+                )
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(api_id):
+    """
+    Return the process-wide circuit breaker of an API.
+
+    CIRCUIT_FAILURE_THRESHOLD and CIRCUIT_COOL_DOWN configure new breakers.
+
+    Parameters:
+        api_id -- API identifier ('BTC' or 'XAU')
+
+    Returns:
+        CircuitBreaker -- Breaker shared by every caller of that API
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(api_id)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                api_id,
+                failure_threshold=int(
+                    os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3")
+                ),
+                cool_down=float(os.getenv("CIRCUIT_COOL_DOWN", "900")),
+            )
+            _breakers[api_id] = breaker
+        return breaker
+
+
+@metrics.timed("extract.save_to_file")
 def save_to_file(data, api_type):
     """
     Save API data to a JSON file in a type-specific directory.
 
     The file is written to a path based on the type of API (e.g., 'btc' or 'gold'),
-    under the 'data/raw/' directory. Returns path and timestamps.
+    under the 'data/raw/' directory, and named after the extraction time down to
+    the microsecond, e.g. 'btc_20250101_120000_123456.json' (parsed back by
+    etl.reprocess.utils_reprocess.archive_stamp()). Returns path and timestamps.
 
     Parameters:
         data     -- Dictionary data to be written to file
@@ -66,12 +290,13 @@ def save_to_file(data, api_type):
         os.makedirs(output_dir, exist_ok=True)
         logger.debug(f"Output directory: {output_dir}")
 
-        file_name = f'{api_type}_{datetime.today().strftime("%Y%m%d_%H%M%S_%f")[:-3]}.json'
+        file_name = f'{api_type}_{datetime.today().strftime("%Y%m%d_%H%M%S_%f")}.json'
         file_path = os.path.join(output_dir, file_name)
         logger.debug(f"File path: {file_path}")
 
         with open(file_path, "w") as json_file:
             json.dump(data, json_file, indent=4)
+        metrics.add_bytes_written(os.path.getsize(file_path))
         logger.debug(f"Saved new API response to {file_path}")
 
         file_created_date = datetime.fromtimestamp(os.path.getctime(file_path))
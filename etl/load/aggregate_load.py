@@ -0,0 +1,252 @@
+from collections import defaultdict
+from datetime import date, timedelta
+
+from etl.load.database_load import DBConnectorLoad
+from etl.load.logger_load import logger
+
+
+def week_bounds(day):
+    """
+    Returns the Monday and Sunday of the ISO week containing a date.
+
+    Parameters:
+        day -- Date inside the week
+
+    Returns:
+        tuple -- (period_start, period_end)
+    """
+    start = day - timedelta(days=day.weekday())
+    return start, start + timedelta(days=6)
+
+
+def month_bounds(day):
+    """
+    Returns the first and last day of the month containing a date.
+
+    Parameters:
+        day -- Date inside the month
+
+    Returns:
+        tuple -- (period_start, period_end)
+    """
+    start = day.replace(day=1)
+    next_month = date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return start, next_month - timedelta(days=1)
+
+
+def year_bounds(day):
+    """
+    Returns the first and last day of the year containing a date.
+
+    Parameters:
+        day -- Date inside the year
+
+    Returns:
+        tuple -- (period_start, period_end)
+    """
+    return date(day.year, 1, 1), date(day.year, 12, 31)
+
+
+PERIODS = {
+    "weekly": week_bounds,
+    "monthly": month_bounds,
+    "yearly": year_bounds,
+}
+
+
+def _average(values):
+    values = [value for value in values if value is not None]
+    return sum(values) / len(values) if values else None
+
+
+def summarise_btc(days):
+    """
+    Computes the OHLC summary of a period from daily fact_btc rows.
+
+    Parameters:
+        days -- (date, open, high, low, close, volume) tuples ordered by date
+
+    Returns:
+        tuple -- (open, high, low, close, avg_close, volume, day_count)
+    """
+    return (
+        days[0][1],
+        max(day[2] for day in days),
+        min(day[3] for day in days),
+        days[-1][4],
+        _average(day[4] for day in days),
+        sum(day[5] for day in days),
+        len(days),
+    )
+
+
+def summarise_gold(days):
+    """
+    Computes the OHLC summary of a period from daily fact_gold rows.
+
+    Parameters:
+        days -- (date, open, high, low, price, price_24k, price_18k, price_14k)
+                tuples ordered by date
+
+    Returns:
+        tuple -- (open, high, low, close, avg_price, avg_price_24k,
+                  avg_price_18k, avg_price_14k, day_count)
+    """
+    return (
+        days[0][1],
+        max(day[2] for day in days),
+        min(day[3] for day in days),
+        days[-1][4],
+        _average(day[4] for day in days),
+        _average(day[5] for day in days),
+        _average(day[6] for day in days),
+        _average(day[7] for day in days),
+        len(days),
+    )
+
+
+# Fact table -> (aggregate table prefix, fact columns read, summary columns,
+# summary function)
+AGGREGATES = {
+    "fact_btc": (
+        "agg_btc",
+        ["open", "high", "low", "close", "volume"],
+        ["open", "high", "low", "close", "avg_close", "volume", "day_count"],
+        summarise_btc,
+    ),
+    "fact_gold": (
+        "agg_gold",
+        ["open", "high", "low", "price", "price_24k", "price_18k", "price_14k"],
+        [
+            "open",
+            "high",
+            "low",
+            "close",
+            "avg_price",
+            "avg_price_24k",
+            "avg_price_18k",
+            "avg_price_14k",
+            "day_count",
+        ],
+        summarise_gold,
+    ),
+}
+
+
+class AggregateLoad:
+    """
+    Maintains the weekly, monthly and yearly aggregate tables of the fact tables.
+
+    Only the periods containing fact rows written by the current load are
+    recomputed, from the daily rows of those periods, in the transaction of
+    the fact rows. An aggregate table that is still empty, e.g. on the first
+    load after it was added, is built from the whole fact table instead.
+
+    Methods:
+        __init__()         -- Initializes with a DB connection
+        touched_periods()  -- Periods containing changed fact rows
+        load_aggregates()  -- Recompute the aggregates of one fact table
+
+    Instance Variables:
+        conn -- DBConnectorLoad instance for DB operations
+    """
+
+    def __init__(self, conn: DBConnectorLoad):
+        """
+        Initializes AggregateLoad with a database connection.
+
+        Parameters:
+            conn -- DBConnectorLoad instance used for database operations
+        """
+        self.conn = conn
+
+    @staticmethod
+    def touched_periods(changed, bounds):
+        """
+        Groups changed fact dates into periods per currency.
+
+        Parameters:
+            changed -- (currency_id, date) tuples of changed fact rows
+            bounds  -- Function returning (period_start, period_end) of a date
+
+        Returns:
+            dict -- currency_id -> set of (period_start, period_end)
+        """
+        periods = defaultdict(set)
+        for currency_id, day in changed:
+            periods[currency_id].add(bounds(day))
+        return periods
+
+    def load_aggregates(self, fact_table, changed):
+        """
+        Recomputes the aggregate periods of a fact table containing changed rows.
+
+        Empty aggregate tables are rebuilt from every row of the fact table,
+        so the history loaded before they existed is aggregated once.
+        The rows are not committed and errors are raised, so the caller
+        commits the aggregates together with the fact rows they come from,
+        or rolls both back.
+
+        Parameters:
+            fact_table -- 'fact_btc' or 'fact_gold'
+            changed    -- (currency_id, date) keys of the fact rows written
+
+        Returns:
+            int -- Number of aggregate rows written
+        """
+        prefix, fact_columns, agg_columns, summarise = AGGREGATES[fact_table]
+
+        written = 0
+        history = None
+        for period_name, bounds in PERIODS.items():
+            agg_table = f"{prefix}_{period_name}"
+            keys = changed
+            if self.conn.is_table_empty(agg_table):
+                if history is None:
+                    history = self.conn.get_fact_keys(fact_table)
+                if history:
+                    logger.info(
+                        f"{agg_table} is empty, building it from the "
+                        f"{len(history)} rows of {fact_table}"
+                    )
+                keys = history
+            if not keys:
+                continue
+
+            rows = []
+            for currency_id, periods in self.touched_periods(
+                keys, bounds
+            ).items():
+                days = self.conn.get_daily_facts(
+                    fact_table,
+                    fact_columns,
+                    currency_id,
+                    min(start for start, _ in periods),
+                    max(end for _, end in periods),
+                )
+
+                by_period = defaultdict(list)
+                for day in days:
+                    by_period[bounds(day[0])].append(day)
+
+                for period_start, period_end in sorted(periods):
+                    period_days = by_period.get((period_start, period_end))
+                    if period_days:
+                        rows.append(
+                            (currency_id, period_start, period_end)
+                            + summarise(period_days)
+                        )
+
+            written += self.conn.upsert_aggregates(
+                agg_table,
+                ["currency_id", "period_start", "period_end"] + agg_columns,
+                rows,
+            )
+
+        if written:
+            logger.info(
+                f"Aggregates of {fact_table} refreshed for {len(changed)} changed rows"
+            )
+        else:
+            logger.info(f"No changed rows in {fact_table}, aggregates are current")
+        return written
@@ -1,4 +1,6 @@
+from etl.load.aggregate_load import AggregateLoad
 from etl.load.database_load import DBConnectorLoad
+from etl.load.index_load import upsert_changed_facts
 from etl.load.logger_load import logger
 
 
@@ -36,17 +38,19 @@ class BitcoinLoad:
 
     def load_fact_bitcoin(self):
         """
-        Loads data from 'btc_data_import' into the 'fact_btc' table.
+        Loads the new or changed rows of 'btc_data_import' into the 'fact_btc' table
+        and refreshes the aggregate periods containing them.
 
         Returns:
             bool -- True if the load succeeds, False otherwise
         """
         logger.info("Loading data into fact_btc from staging table")
         try:
-            rows = self.conn.upsert_fact_btc()
+            changed = upsert_changed_facts(self.conn, "fact_btc")
+            AggregateLoad(self.conn).load_aggregates("fact_btc", changed)
             self.conn.conn.commit()
             logger.info(
-                f"Total data loaded into fact_btc: {rows} rows affected"
+                f"Total data loaded into fact_btc: {len(changed)} rows affected"
             )
             return True
         except Exception as e:
@@ -60,7 +64,7 @@ class BitcoinLoad:
         Runs 'dim_date' and 'fact_btc' load methods.
 
         Returns:
-            None
+            bool -- True if fact_btc was loaded, False otherwise
         """
         self.load_dim_date()
-        self.load_fact_bitcoin()
+        return self.load_fact_bitcoin()
@@ -1,202 +1,328 @@
 from etl.commons.database import DBConnector
+from etl.commons.metrics import metrics
 from etl.load.logger_load import logger
 
 
+# Exchange rates per executemany() batch; bounds the Decimal parameters
+# built from the fixed-point RateRow records
+RATE_BATCH_ROWS = 1000
+
+
 class DBConnectorLoad(DBConnector):
     """
     Handles data loading operations into the data warehouse.
 
     Methods:
-        upsert_fact_btc()        -- Load data into fact_btc table
-        upsert_fact_gold()       -- Load data into fact_gold table
-        upsert_exchange_rates()  -- Load exchange rates into fact_exchange_rates
+        get_fact_version()       -- MAX(updated_at) and row count of a fact table
+        get_fact_hashes()        -- (currency, date) -> value hash of fact rows
+        get_staging_rows()       -- Staging rows with the hash of their values
+        upsert_fact_rows()       -- Upsert rows into a fact table in one batch
+        insert_gold_ticks()      -- Append staged gold ticks to fact_gold_tick
+        get_gold_tick_days()     -- Daily gold prices of the staged days from their ticks
+        update_gold_staging()    -- Overwrite staged gold prices in one batch
+        get_staging_rates()      -- Currency rate vectors of the gold staging rows
+        get_exchange_rates()     -- Stored exchange rates in a date range
+        upsert_exchange_rates()  -- Upsert exchange rates in batches
         upsert_dim_date()        -- Load dates into dim_date from given source
+        get_daily_facts()        -- Daily fact rows of a currency in a date range
+        get_fact_keys()          -- (currency_id, date) keys of every fact row
+        is_table_empty()         -- Whether a warehouse table has no rows
+        upsert_aggregates()      -- Upsert computed rows into an aggregate table
+        mark_staging_loaded()    -- Mark completed transform runs as loaded
     """
 
-    def upsert_fact_btc(self):
+    @metrics.timed("load.get_fact_version")
+    def get_fact_version(self, fact_table):
         """
-        Inserts new or updated Bitcoin data into the 'fact_btc' table.
+        Returns a cheap fingerprint of a fact table's contents.
+
+        Every upsert sets updated_at to NOW(4), so the pair changes whenever
+        a row is inserted or updated.
+
+        Parameters:
+            fact_table -- Warehouse fact table, e.g. 'fact_btc'
 
         Returns:
-            int -- Number of affected rows
+            tuple -- (MAX(updated_at), COUNT(*))
         """
-        logger.info("Starting upsert for fact_btc")
-        try:
-            query = """
-                INSERT INTO warehouse.fact_btc (
-                    date, currency_id, open, high, low, close, volume, created_at, updated_at
-                )
-                SELECT 
-                    imp.date, 
-                    imp.currency_id, 
-                    imp.open, 
-                    imp.high, 
-                    imp.low, 
-                    imp.close, 
-                    imp.volume,
-                    NOW(4), 
-                    NOW(4)
-                FROM transform.btc_data_import imp
-                WHERE NOT EXISTS (
-                    SELECT 1 FROM warehouse.fact_btc fact
-                    WHERE fact.currency_id = imp.currency_id
-                      AND fact.date = imp.date
-                      AND MD5(CONCAT_WS(',', fact.open, fact.high, fact.low, fact.close, fact.volume)) =
-                          MD5(CONCAT_WS(',', imp.open, imp.high, imp.low, imp.close, imp.volume))
-                )
-                ON DUPLICATE KEY UPDATE
-                    open = VALUES(open),
-                    high = VALUES(high),
-                    low = VALUES(low),
-                    close = VALUES(close),
-                    volume = VALUES(volume),
-                    updated_at = NOW(4)
-            """
+        query = f"""
+            SELECT MAX(updated_at), COUNT(*)
+            FROM warehouse.{fact_table}
+        """
+        self.cursor.execute(query)
+        return tuple(self.cursor.fetchone())
 
-            self.cursor.execute(query)
-            rows = self.cursor.rowcount
-            logger.info(f"Upserted {rows} rows into fact_btc")
-            return rows
+    @metrics.timed("load.get_fact_hashes")
+    def get_fact_hashes(self, fact_table, columns, start, end):
+        """
+        Returns the value hash of every fact row in a date range.
 
-        except Exception as e:
-            self.conn.rollback()
-            logger.error(f"Error upserting fact_btc: {str(e)}", exc_info=True)
+        Only the key and an MD5 of the value columns are read, so the
+        projection stays narrow whatever the number of columns.
+
+        Parameters:
+            fact_table -- Warehouse fact table, e.g. 'fact_btc'
+            columns    -- Value columns covered by the hash
+            start      -- First date (inclusive)
+            end        -- Last date (inclusive)
+
+        Returns:
+            list -- (currency_id, date, md5 hex digest) tuples
+        """
+        query = f"""
+            SELECT currency_id, date, MD5(CONCAT_WS(',', {", ".join(columns)}))
+            FROM warehouse.{fact_table}
+            WHERE date >= %s AND date <= %s
+        """
+        self.cursor.execute(query, (start, end))
+        return self.cursor.fetchall()
+
+    @metrics.timed("load.get_staging_rows")
+    def get_staging_rows(self, staging_table, columns):
+        """
+        Returns the rows of a staging table with the hash of their values.
+
+        The hash is computed with the same expression as get_fact_hashes(),
+        so equal values give equal hashes.
+
+        Parameters:
+            staging_table -- Staging table, e.g. 'transform.btc_data_import'
+            columns       -- Value columns to read and hash
+
+        Returns:
+            list -- (currency_id, date, md5 hex digest, *columns) tuples
+        """
+        query = f"""
+            SELECT
+                currency_id,
+                date,
+                MD5(CONCAT_WS(',', {", ".join(columns)})),
+                {", ".join(columns)}
+            FROM {staging_table}
+        """
+        self.cursor.execute(query)
+        return self.cursor.fetchall()
+
+    @metrics.timed("load.upsert_fact_rows")
+    def upsert_fact_rows(self, fact_table, columns, rows):
+        """
+        Inserts or updates fact rows in one batch.
+
+        Parameters:
+            fact_table -- Warehouse fact table, e.g. 'fact_btc'
+            columns    -- Value columns following currency_id and date
+            rows       -- (currency_id, date, *columns) tuples
+
+        Returns:
+            int -- Number of rows written
+        """
+        if not rows:
             return 0
 
-    def upsert_fact_gold(self):
+        logger.info(f"Upserting {len(rows)} changed rows into {fact_table}")
+        placeholders = ", ".join(["%s"] * (len(columns) + 2))
+        updates = ",\n                ".join(
+            f"{column} = VALUES({column})" for column in columns
+        )
+        query = f"""
+            INSERT INTO warehouse.{fact_table} (
+                currency_id, date, {", ".join(columns)}, created_at, updated_at
+            )
+            VALUES ({placeholders}, NOW(4), NOW(4))
+            ON DUPLICATE KEY UPDATE
+                {updates},
+                updated_at = NOW(4)
+        """
+
+        self.cursor.executemany(query, rows)
+        metrics.add_rows(len(rows))
+        return len(rows)
+
+    @metrics.timed("load.insert_gold_ticks")
+    def insert_gold_ticks(self):
         """
-        Inserts new or updated gold data into the 'fact_gold' table.
+        Appends the staged gold ticks to 'fact_gold_tick' in one statement.
+
+        Ticks already stored (same currency, date and timestamp) are ignored.
 
         Returns:
-            int -- Number of affected rows
+            int -- Number of ticks appended
         """
-        logger.info("Starting upsert for fact_gold")
-        try:
-            insert_query = """
-                INSERT INTO warehouse.fact_gold (
-                    currency_id, 
-                    date, 
-                    open, 
-                    high, 
-                    low, 
-                    price, 
-                    price_24k, 
-                    price_18k, 
-                    price_14k, 
-                    created_at, 
-                    updated_at
-                )
-                SELECT 
-                    imp.currency_id, 
-                    imp.date, 
-                    imp.open, 
-                    imp.high, 
-                    imp.low, 
-                    imp.price, 
-                    imp.price_24k, 
-                    imp.price_18k, 
-                    imp.price_14k,
-                    NOW(4),
-                    NOW(4)
-                FROM transform.gold_data_import imp
-                WHERE NOT EXISTS (
-                    SELECT 1 FROM warehouse.fact_gold fact
-                    WHERE fact.currency_id = imp.currency_id
-                      AND fact.date = imp.date
-                      AND MD5(CONCAT_WS(',', 
-                          fact.open, fact.high, fact.low, fact.price, 
-                          fact.price_24k, fact.price_18k, fact.price_14k
-                      )) = MD5(CONCAT_WS(',', 
-                          imp.open, imp.high, imp.low, imp.price, 
-                          imp.price_24k, imp.price_18k, imp.price_14k
-                      ))
-                )
-                ON DUPLICATE KEY UPDATE
-                    open = VALUES(open),
-                    high = VALUES(high),
-                    low = VALUES(low),
-                    price = VALUES(price),
-                    price_24k = VALUES(price_24k),
-                    price_18k = VALUES(price_18k),
-                    price_14k = VALUES(price_14k),
-                    updated_at = NOW(4)
-            """
+        query = """
+            INSERT IGNORE INTO warehouse.fact_gold_tick (
+                currency_id, date, ts, open, high, low,
+                price, price_24k, price_18k, price_14k
+            )
+            SELECT
+                currency_id, date, ts, open, high, low,
+                price, price_24k, price_18k, price_14k
+            FROM transform.gold_tick_import
+        """
+        self.cursor.execute(query)
+        metrics.add_rows(max(self.cursor.rowcount, 0))
+        return max(self.cursor.rowcount, 0)
 
-            self.cursor.execute(insert_query)
-            rows = self.cursor.rowcount
-            logger.info(f"Upserted {rows} rows into fact_gold")
-            return rows
+    @metrics.timed("load.get_gold_tick_days")
+    def get_gold_tick_days(self):
+        """
+        Derives the daily gold prices of the staged days from all their ticks.
 
-        except Exception as e:
-            self.conn.rollback()
-            logger.error(f"Error upserting fact_gold: {str(e)}", exc_info=True)
+        Each staged (currency, date) is aggregated over every tick stored
+        for that day, including ticks loaded by earlier runs: open is the
+        first tick's open, high and low are the extremes, and the price and
+        karat prices are those of the last tick.
+
+        Returns:
+            list -- (currency_id, date, open, high, low, price, price_24k,
+                     price_18k, price_14k) tuples with scaled integer prices
+        """
+        query = """
+            SELECT
+                d.currency_id,
+                d.date,
+                f.open,
+                d.high,
+                d.low,
+                l.price,
+                l.price_24k,
+                l.price_18k,
+                l.price_14k
+            FROM (
+                SELECT
+                    t.currency_id,
+                    t.date,
+                    MIN(t.ts) AS first_ts,
+                    MAX(t.ts) AS last_ts,
+                    MAX(t.high) AS high,
+                    MIN(t.low) AS low
+                FROM transform.gold_data_import s
+                JOIN warehouse.fact_gold_tick t
+                    ON t.currency_id = s.currency_id AND t.date = s.date
+                GROUP BY t.currency_id, t.date
+            ) d
+            JOIN warehouse.fact_gold_tick f
+                ON f.currency_id = d.currency_id
+                AND f.date = d.date
+                AND f.ts = d.first_ts
+            JOIN warehouse.fact_gold_tick l
+                ON l.currency_id = d.currency_id
+                AND l.date = d.date
+                AND l.ts = d.last_ts
+        """
+        self.cursor.execute(query)
+        return self.cursor.fetchall()
+
+    @metrics.timed("load.update_gold_staging")
+    def update_gold_staging(self, rows):
+        """
+        Overwrites the prices of staged gold days in one batch.
+
+        Parameters:
+            rows -- (open, high, low, price, price_24k, price_18k, price_14k,
+                     currency_id, date) tuples
+
+        Returns:
+            int -- Number of rows sent
+        """
+        if not rows:
             return 0
 
-    def upsert_exchange_rates(self, currency_code):
+        query = """
+            UPDATE transform.gold_data_import
+            SET open = %s,
+                high = %s,
+                low = %s,
+                price = %s,
+                price_24k = %s,
+                price_18k = %s,
+                price_14k = %s
+            WHERE currency_id = %s AND date = %s
+        """
+        self.cursor.executemany(query, rows)
+        return len(rows)
+
+    @metrics.timed("load.get_staging_rates")
+    def get_staging_rates(self, currency_codes):
         """
-        Inserts new or updated exchange rate data into the 'fact_exchange_rates' table.
+        Returns the currency rate vectors of the gold staging rows.
 
         Parameters:
-            currency_code -- Currency code used to target specific rate column
+            currency_codes -- Codes whose rate_<code> columns are read
 
         Returns:
-            int -- Number of affected rows
+            list -- (date, base currency_id, *rates) tuples ordered by date
         """
-        logger.info(f"Starting upsert for exchange rates: {currency_code}")
-        try:
-            currency_id = self.get_currency_by_code(currency_code)
-            if not currency_id:
-                logger.warning(
-                    f"No currency_id found for {currency_code}, skipping"
-                )
-                return 0
+        rate_columns = ", ".join(
+            f"rate_{code.lower()}" for code in currency_codes
+        )
+        query = f"""
+            SELECT date, currency_id, {rate_columns}
+            FROM transform.gold_data_import
+            ORDER BY date
+        """
+        self.cursor.execute(query)
+        return self.cursor.fetchall()
 
-            insert_query = f"""
-                 INSERT INTO warehouse.fact_exchange_rates (
-                     date,
-                     base_currency_id,
-                     target_currency_id,
-                     rate,
-                     created_at,
-                     updated_at
-                 )
-                 SELECT 
-                     imp.date,
-                     imp.currency_id AS base_currency_id,
-                     %s AS target_currency_id,
-                     imp.rate_{currency_code} AS rate,
-                     NOW(4),
-                     NOW(4)
-                 FROM transform.gold_data_import imp
-                 WHERE imp.rate_{currency_code} IS NOT NULL
-                   AND imp.currency_id != %s
-                   AND NOT EXISTS (
-                       SELECT 1 FROM warehouse.fact_exchange_rates fact
-                       WHERE fact.date = imp.date
-                         AND fact.base_currency_id = imp.currency_id
-                         AND fact.target_currency_id = %s
-                         AND fact.rate = imp.rate_{currency_code}
-                   )
-                 ON DUPLICATE KEY UPDATE
-                     rate = VALUES(rate),
-                     updated_at = NOW(4)
-             """
-
-            self.cursor.execute(
-                insert_query, (currency_id, currency_id, currency_id)
+    @metrics.timed("load.get_exchange_rates")
+    def get_exchange_rates(self, start, end):
+        """
+        Returns the stored exchange rates in a date range.
+
+        Parameters:
+            start -- First date (inclusive)
+            end   -- Last date (inclusive)
+
+        Returns:
+            list -- (date, base_currency_id, target_currency_id, rate) tuples
+        """
+        query = """
+            SELECT date, base_currency_id, target_currency_id, rate
+            FROM warehouse.fact_exchange_rates
+            WHERE date >= %s AND date <= %s
+        """
+        self.cursor.execute(query, (start, end))
+        return self.cursor.fetchall()
+
+    @metrics.timed("load.upsert_exchange_rates")
+    def upsert_exchange_rates(self, rows):
+        """
+        Inserts or updates exchange rates in 'fact_exchange_rates' in batches
+        of RATE_BATCH_ROWS.
+
+        Parameters:
+            rows -- RateRow records
+
+        Returns:
+            int -- Number of rows written
+        """
+        if not rows:
+            return 0
+
+        logger.info(f"Upserting {len(rows)} rows into fact_exchange_rates")
+        query = """
+            INSERT INTO warehouse.fact_exchange_rates (
+                date,
+                base_currency_id,
+                target_currency_id,
+                rate,
+                created_at,
+                updated_at
             )
-            rows = self.cursor.rowcount
-            logger.info(f"Upserted {rows} rows for {currency_code}")
-            return rows
+            VALUES (%s, %s, %s, %s, NOW(4), NOW(4))
+            ON DUPLICATE KEY UPDATE
+                rate = VALUES(rate),
+                updated_at = NOW(4)
+        """
 
-        except Exception as e:
-            self.conn.rollback()
-            logger.error(
-                f"Error upserting exchange rates for {currency_code}: {str(e)}",
-                exc_info=True,
+        for offset in range(0, len(rows), RATE_BATCH_ROWS):
+            self.cursor.executemany(
+                query,
+                [row.params() for row in rows[offset:offset + RATE_BATCH_ROWS]],
             )
-            return 0
+        metrics.add_rows(len(rows))
+        return len(rows)
 
+    @metrics.timed("load.upsert_dim_date")
     def upsert_dim_date(self, source_table):
         """
         Inserts new dates from a source table into the 'dim_date' table.
@@ -257,6 +383,7 @@ class DBConnectorLoad(DBConnector):
 
             self.cursor.execute(insert_query)
             rows = self.cursor.rowcount
+            metrics.add_rows(rows)
             self.conn.commit()
             logger.info(f"Upserted {rows} rows into dim_date")
             return rows
@@ -268,3 +395,130 @@ class DBConnectorLoad(DBConnector):
                 exc_info=True,
             )
             return 0
+
+    @metrics.timed("load.get_daily_facts")
+    def get_daily_facts(self, fact_table, columns, currency_id, start, end):
+        """
+        Returns the daily fact rows of one currency, ordered by date.
+
+        Parameters:
+            fact_table  -- Warehouse fact table, e.g. 'fact_btc'
+            columns     -- Columns to select after the date
+            currency_id -- Currency to read
+            start       -- First date (inclusive)
+            end         -- Last date (inclusive)
+
+        Returns:
+            list -- Tuples of (date, *columns)
+        """
+        query = f"""
+            SELECT date, {", ".join(columns)}
+            FROM warehouse.{fact_table}
+            WHERE currency_id = %s AND date >= %s AND date <= %s
+            ORDER BY date
+        """
+        self.cursor.execute(query, (currency_id, start, end))
+        return self.cursor.fetchall()
+
+    @metrics.timed("load.get_fact_keys")
+    def get_fact_keys(self, fact_table):
+        """
+        Returns the key of every row of a fact table.
+
+        Parameters:
+            fact_table -- Warehouse fact table, e.g. 'fact_btc'
+
+        Returns:
+            list -- (currency_id, date) tuples
+        """
+        query = f"""
+            SELECT currency_id, date
+            FROM warehouse.{fact_table}
+            WHERE currency_id IS NOT NULL
+        """
+        self.cursor.execute(query)
+        return self.cursor.fetchall()
+
+    @metrics.timed("load.is_table_empty")
+    def is_table_empty(self, table):
+        """
+        Returns True if a warehouse table has no rows.
+
+        Parameters:
+            table -- Warehouse table, e.g. 'agg_btc_monthly'
+
+        Returns:
+            bool -- True if the table is empty
+        """
+        self.cursor.execute(f"SELECT 1 FROM warehouse.{table} LIMIT 1")
+        return self.cursor.fetchone() is None
+
+    @metrics.timed("load.upsert_aggregates")
+    def upsert_aggregates(self, agg_table, columns, rows):
+        """
+        Inserts or replaces rows of an aggregate table in one batch.
+
+        The rows are not committed and errors are raised; the caller commits
+        or rolls back together with the fact rows the aggregates come from.
+
+        Parameters:
+            agg_table -- Aggregate table, e.g. 'agg_btc_monthly'
+            columns   -- Column names, starting with currency_id and period_start
+            rows      -- Sequence of value tuples in column order
+
+        Returns:
+            int -- Number of rows written
+        """
+        if not rows:
+            return 0
+
+        logger.info(f"Upserting {len(rows)} rows into {agg_table}")
+        placeholders = ", ".join(["%s"] * len(columns))
+        updates = ",\n                ".join(
+            f"{column} = VALUES({column})" for column in columns[2:]
+        )
+        query = f"""
+            INSERT INTO warehouse.{agg_table} (
+                {", ".join(columns)}, created_at, updated_at
+            )
+            VALUES ({placeholders}, NOW(4), NOW(4))
+            ON DUPLICATE KEY UPDATE
+                {updates},
+                updated_at = NOW(4)
+        """
+
+        self.cursor.executemany(query, rows)
+        metrics.add_rows(len(rows))
+        return len(rows)
+
+    @metrics.timed("load.mark_staging_loaded")
+    def mark_staging_loaded(self, asset):
+        """
+        Marks the completed transform runs of an asset as loaded.
+
+        The next transform run of the asset then starts from empty staging
+        tables instead of keeping rows that were never loaded.
+
+        Parameters:
+            asset -- 'btc' or 'gold'
+
+        Returns:
+            bool -- True if the runs were updated, False otherwise
+        """
+        try:
+            query = """
+                UPDATE transform.transform_run
+                SET status = 'loaded'
+                WHERE asset = %s AND status = 'completed'
+            """
+            self.cursor.execute(query, (asset,))
+            self.conn.commit()
+            return True
+
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(
+                f"Error marking {asset} transform runs as loaded: {str(e)}",
+                exc_info=True,
+            )
+            return False
@@ -1,5 +1,13 @@
+from etl.commons.records import from_fixed
+from etl.load.aggregate_load import AggregateLoad
 from etl.load.database_load import DBConnectorLoad
+from etl.load.index_load import upsert_changed_facts
 from etl.load.logger_load import logger
+from etl.load.rates_load import ExchangeRateLoad
+
+
+# Decimals of the price columns of gold_data_import and fact_gold
+PRICE_DECIMALS = (2, 2, 2, 2, 8, 8, 8)
 
 
 class GoldLoad:
@@ -9,6 +17,7 @@ class GoldLoad:
     Methods:
         __init__()                 -- Initializes with a DB connection
         load_dim_date()            -- Populates the dim_date table
+        load_fact_gold_tick()      -- Appends ticks and derives the daily prices
         load_fact_gold()           -- Loads data into the fact_gold table
         load_fact_exchange_rates() -- Loads data into the fact_exchange_rates table
         call()                     -- Executes the full data load process
@@ -35,19 +44,59 @@ class GoldLoad:
         """
         self.conn.upsert_dim_date("transform.gold_data_import")
 
+    def load_fact_gold_tick(self):
+        """
+        Appends the staged ticks to the 'fact_gold_tick' table and derives the
+        daily prices of the staged days from their ticks, in one aggregate
+        pass, before they are loaded into 'fact_gold'.
+
+        Returns:
+            bool -- True if the load succeeds, False otherwise
+        """
+        logger.info("Loading data into fact_gold_tick from staging table")
+        try:
+            ticks = self.conn.insert_gold_ticks()
+
+            rows = []
+            for currency_id, date, *prices in self.conn.get_gold_tick_days():
+                rows.append(
+                    tuple(
+                        from_fixed(price, decimals)
+                        for price, decimals in zip(prices, PRICE_DECIMALS)
+                    )
+                    + (currency_id, date)
+                )
+            self.conn.update_gold_staging(rows)
+
+            self.conn.conn.commit()
+            logger.info(
+                f"Appended {ticks} ticks to fact_gold_tick, "
+                f"derived {len(rows)} daily gold rows"
+            )
+            return True
+
+        except Exception as e:
+            self.conn.conn.rollback()
+            logger.error(
+                f"Error loading fact_gold_tick: {str(e)}", exc_info=True
+            )
+            return False
+
     def load_fact_gold(self):
         """
-        Loads data from the 'gold_data_import' table into the 'fact_gold' table.
+        Loads the new or changed rows of the 'gold_data_import' table into the 'fact_gold' table
+        and refreshes the aggregate periods containing them.
 
         Returns:
             bool -- True if the load succeeds, False otherwise
         """
         logger.info("Loading data into fact_gold from staging table")
         try:
-            rows = self.conn.upsert_fact_gold()
+            changed = upsert_changed_facts(self.conn, "fact_gold")
+            AggregateLoad(self.conn).load_aggregates("fact_gold", changed)
             self.conn.conn.commit()
             logger.info(
-                f"Total data loaded into fact_gold: {rows} rows affected"
+                f"Total data loaded into fact_gold: {len(changed)} rows affected"
             )
             return True
 
@@ -58,27 +107,17 @@ class GoldLoad:
 
     def load_fact_exchange_rates(self):
         """
-        Loads currency exchange rates into the 'fact_exchange_rates' table.
+        Loads the cross rates of every currency pair into the 'fact_exchange_rates' table.
 
         Returns:
             bool -- True if the load succeeds, False otherwise
         """
         logger.info("Loading data into fact_exchange_rates from staging table")
         try:
-            currency_codes = self.conn.get_rate_cols()
-            total_rows_affected = 0
-
-            for currency_code in currency_codes:
-                logger.debug(
-                    f"Processing exchange rates for currency: {currency_code}"
-                )
-                rows = self.conn.upsert_exchange_rates(currency_code)
-                if rows:
-                    total_rows_affected += rows
-
+            rows = ExchangeRateLoad(self.conn).call()
             self.conn.conn.commit()
             logger.info(
-                f"Total data loaded into fact_exchange_rates: {total_rows_affected} rows affected"
+                f"Total data loaded into fact_exchange_rates: {rows} rows affected"
             )
             return True
 
@@ -92,11 +131,14 @@ class GoldLoad:
     def call(self):
         """
         Executes the full load process for gold data and exchange rates.
-        Runs 'dim_date', 'fact_gold', and 'fact_exchange_rates' load methods.
+        Runs 'dim_date', 'fact_gold_tick', 'fact_gold', and 'fact_exchange_rates'
+        load methods.
 
         Returns:
-            None
+            bool -- True if every fact table was loaded, False otherwise
         """
         self.load_dim_date()
-        self.load_fact_gold()
-        self.load_fact_exchange_rates()
+        ticks_loaded = self.load_fact_gold_tick()
+        gold_loaded = self.load_fact_gold()
+        rates_loaded = self.load_fact_exchange_rates()
+        return ticks_loaded and gold_loaded and rates_loaded
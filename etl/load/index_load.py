@@ -0,0 +1,197 @@
+import threading
+
+from etl.load.database_load import DBConnectorLoad
+from etl.load.logger_load import logger
+
+
+# Fact table -> (staging table, value columns)
+FACTS = {
+    "fact_btc": (
+        "transform.btc_data_import",
+        ["open", "high", "low", "close", "volume"],
+    ),
+    "fact_gold": (
+        "transform.gold_data_import",
+        ["open", "high", "low", "price", "price_24k", "price_18k", "price_14k"],
+    ),
+}
+
+# Fact table -> FactIndex, kept for the life of the process so that daemon
+# cycles reuse it while the fact table has not been written by anyone else.
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def clear_fact_indexes():
+    """
+    Drop the cached fact indexes, forcing the next load to rebuild them.
+
+    Returns:
+        None
+    """
+    with _indexes_lock:
+        _indexes.clear()
+
+
+class FactIndex:
+    """
+    In-memory (currency_id, date) -> value hash index of a fact table over a
+    date range.
+
+    Hashes are stored as 16-byte MD5 digests. The index is valid as long as
+    the table's version (MAX(updated_at), COUNT(*)) is the one it was built
+    or last updated with.
+
+    Methods:
+        __init__()  -- Builds the index from (currency_id, date, hash) rows
+        covers()    -- Whether a date range is inside the indexed range
+        changed()   -- Whether a staging row differs from the fact row
+        update()    -- Record rows that have just been written
+
+    Instance Variables:
+        start   -- First indexed date
+        end     -- Last indexed date
+        version -- Fact table version the index matches
+        hashes  -- (currency_id, date) -> MD5 digest
+    """
+
+    def __init__(self, start, end, version, rows):
+        """
+        Build the index.
+
+        Parameters:
+            start   -- First indexed date
+            end     -- Last indexed date
+            version -- Fact table version read before the rows
+            rows    -- (currency_id, date, md5 hex digest) tuples
+        """
+        self.start = start
+        self.end = end
+        self.version = version
+        self.hashes = {
+            (currency_id, date): bytes.fromhex(digest)
+            for currency_id, date, digest in rows
+        }
+
+    def covers(self, start, end):
+        """
+        Return True if the index holds every fact row between two dates.
+
+        Parameters:
+            start -- First date of the range
+            end   -- Last date of the range
+
+        Returns:
+            bool -- True if [start, end] is inside the indexed range
+        """
+        return self.start <= start and end <= self.end
+
+    def changed(self, currency_id, date, digest):
+        """
+        Return True if a staging row is new or differs from its fact row.
+
+        Parameters:
+            currency_id -- Currency of the row
+            date        -- Date of the row
+            digest      -- MD5 hex digest of the staging values
+
+        Returns:
+            bool -- True if the row has to be written
+        """
+        return self.hashes.get((currency_id, date)) != bytes.fromhex(digest)
+
+    def update(self, rows, version):
+        """
+        Record rows written to the fact table and its new version.
+
+        Parameters:
+            rows    -- (currency_id, date, md5 hex digest) tuples
+            version -- Fact table version after the write
+
+        Returns:
+            None
+        """
+        for currency_id, date, digest in rows:
+            self.hashes[(currency_id, date)] = bytes.fromhex(digest)
+        self.version = version
+
+
+def get_fact_index(conn: DBConnectorLoad, fact_table, start, end):
+    """
+    Return an index of a fact table covering a date range.
+
+    The cached index is reused if it covers the range and the table version
+    has not changed; otherwise it is rebuilt from a narrow hash projection.
+
+    Parameters:
+        conn       -- Connected DBConnectorLoad
+        fact_table -- 'fact_btc' or 'fact_gold'
+        start      -- First date of the range
+        end        -- Last date of the range
+
+    Returns:
+        FactIndex -- Index valid for the current table contents
+    """
+    version = conn.get_fact_version(fact_table)
+
+    with _indexes_lock:
+        index = _indexes.get(fact_table)
+    if index and index.version == version and index.covers(start, end):
+        logger.info(f"Reusing cached {fact_table} index ({len(index.hashes)} rows)")
+        return index
+
+    _, columns = FACTS[fact_table]
+    index = FactIndex(
+        start,
+        end,
+        version,
+        conn.get_fact_hashes(fact_table, columns, start, end),
+    )
+    logger.info(
+        f"Built {fact_table} index for {start} to {end} ({len(index.hashes)} rows)"
+    )
+
+    with _indexes_lock:
+        _indexes[fact_table] = index
+    return index
+
+
+def upsert_changed_facts(conn: DBConnectorLoad, fact_table):
+    """
+    Upsert the staging rows of a fact table that are new or changed.
+
+    Staging rows are compared with the fact index of their date range, and
+    only the rows whose hash differs are sent to the database, in one
+    executemany batch. The caller commits; if it rolls back, the index's
+    version no longer matches the table and it is rebuilt by the next load.
+
+    Parameters:
+        conn       -- Connected DBConnectorLoad
+        fact_table -- 'fact_btc' or 'fact_gold'
+
+    Returns:
+        list -- (currency_id, date) keys of the rows written
+    """
+    staging_table, columns = FACTS[fact_table]
+    staged = conn.get_staging_rows(staging_table, columns)
+    if not staged:
+        logger.info(f"No staging rows for {fact_table}")
+        return []
+
+    dates = [row[1] for row in staged]
+    index = get_fact_index(conn, fact_table, min(dates), max(dates))
+
+    changed = [row for row in staged if index.changed(*row[:3])]
+    logger.info(
+        f"{len(changed)} of {len(staged)} staging rows changed for {fact_table}"
+    )
+    if not changed:
+        return []
+
+    conn.upsert_fact_rows(
+        fact_table,
+        columns,
+        [(row[0], row[1]) + tuple(row[3:]) for row in changed],
+    )
+    index.update((row[:3] for row in changed), conn.get_fact_version(fact_table))
+    return [(row[0], row[1]) for row in changed]
@@ -1,3 +1,3 @@
-from etl.commons.logger import setup_logger
+from etl.commons.logger import lazy_logger
 
-logger = setup_logger('load')
+logger = lazy_logger('load')
@@ -1,15 +1,24 @@
+from etl.commons.metrics import metrics
+from etl.commons.stages import ASSETS
 from etl.load.btc_load import BitcoinLoad
 from etl.load.gold_load import GoldLoad
 from etl.load.database_load import DBConnectorLoad
 from etl.load.logger_load import logger
 
 
-def load():
+@metrics.timed("load")
+def load(assets=ASSETS):
     """
     Run the full data loading process.
 
     This function initializes the database connection, processes Bitcoin and Gold data loading,
-    logs each process, then closes the database connection.
+    together with the aggregate periods touched by this load, logs each process,
+    then closes the database connection. Completed transform runs of the assets
+    that loaded successfully are marked as loaded, so the next transform run
+    may truncate their staging tables.
+
+    Parameters:
+        assets -- Assets to load, 'btc' and/or 'gold' (default: both)
     """
     logger.info("Starting Load process")
 
@@ -17,11 +26,15 @@ def load():
 
     conn.connect()
 
-    btc = BitcoinLoad(conn)
-    btc.call()
+    if "btc" in assets:
+        btc = BitcoinLoad(conn)
+        if btc.call():
+            conn.mark_staging_loaded("btc")
 
-    gold = GoldLoad(conn)
-    gold.call()
+    if "gold" in assets:
+        gold = GoldLoad(conn)
+        if gold.call():
+            conn.mark_staging_loaded("gold")
 
     conn.disconnect()
     logger.info("Load process completed successfully")
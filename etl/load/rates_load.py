@@ -0,0 +1,157 @@
+import os
+from collections import defaultdict
+
+import numpy as np
+
+from etl.commons.records import RateRow, to_fixed
+from etl.load.database_load import DBConnectorLoad
+from etl.load.logger_load import logger
+
+
+# fact_exchange_rates.rate is DECIMAL(16,5)
+RATE_DECIMALS = 5
+
+
+def cross_rate_matrix(rates, base_indexes):
+    """
+    Builds the N x N cross-rate matrix of one date from the rate vectors of
+    its gold snapshots.
+
+    Each snapshot gives the units of every currency per unit of its base.
+    The vectors are moved to a common pivot (the currency quoted by most
+    snapshots) in log space and averaged, and the matrix is the outer
+    difference of the averaged vector, so rate(a, c) == rate(a, b) * rate(b, c)
+    holds for every triangle by construction. The deviation between each
+    quoted rate and the matrix measures how far the API's own quotes are
+    from triangular consistency.
+
+    Parameters:
+        rates        -- (B, N) array of quotes per snapshot, NaN when missing
+        base_indexes -- Column index of the base currency of each snapshot
+
+    Returns:
+        tuple -- ((N, N) matrix of units of column per unit of row, NaN where
+                 unknown; maximum relative deviation of a quote)
+    """
+    rates = np.array(rates, dtype=float)
+    rates[np.arange(len(base_indexes)), base_indexes] = 1.0
+    rates[~(rates > 0)] = np.nan
+    logs = np.log(rates)
+
+    quoted = np.isfinite(logs)
+    pivot = int(quoted.sum(axis=0).argmax())
+    usable = quoted[:, pivot]
+    if not usable.any():
+        size = rates.shape[1]
+        return np.full((size, size), np.nan), 0.0
+
+    # Log units of each currency per unit of the pivot, per snapshot
+    normalised = logs[usable] - logs[usable, pivot][:, None]
+    counts = np.isfinite(normalised).sum(axis=0)
+    totals = np.where(np.isfinite(normalised), normalised, 0.0).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        levels = np.where(counts > 0, totals / counts, np.nan)
+
+    matrix_logs = levels[None, :] - levels[:, None]
+    deviation = np.abs(logs - matrix_logs[base_indexes])
+    deviation = deviation[np.isfinite(deviation)]
+    max_deviation = float(np.expm1(deviation.max())) if deviation.size else 0.0
+
+    return np.exp(matrix_logs), max_deviation
+
+
+class ExchangeRateLoad:
+    """
+    Loads every currency pair of each staged date into fact_exchange_rates.
+
+    Methods:
+        __init__()  -- Initializes with a DB connection
+        pair_rows() -- Cross-rate rows of the staged dates
+        call()      -- Upsert the new or changed pairs in one batch
+
+    Instance Variables:
+        conn      -- DBConnectorLoad instance for DB operations
+        tolerance -- Relative deviation above which a date is reported
+                     (EXCHANGE_RATE_TOLERANCE, default 0.01)
+    """
+
+    def __init__(self, conn: DBConnectorLoad):
+        """
+        Initializes ExchangeRateLoad with a database connection.
+
+        Parameters:
+            conn -- DBConnectorLoad instance used for database operations
+        """
+        self.conn = conn
+        self.tolerance = float(os.getenv("EXCHANGE_RATE_TOLERANCE", "0.01"))
+
+    def pair_rows(self):
+        """
+        Computes the cross rates of every staged date.
+
+        Only currencies present in dim_currency are kept, since
+        fact_exchange_rates references it.
+
+        Returns:
+            list -- RateRow of every pair, rates rounded to RATE_DECIMALS
+        """
+        currency_ids = dict(
+            (code, currency_id) for currency_id, code in self.conn.get_currencies()
+        )
+        codes = [code for code in self.conn.get_rate_cols() if code in currency_ids]
+        ids = [currency_ids[code] for code in codes]
+        column_of = {currency_id: index for index, currency_id in enumerate(ids)}
+
+        by_date = defaultdict(list)
+        for date, base_id, *rates in self.conn.get_staging_rates(codes):
+            if base_id in column_of:
+                by_date[date].append((column_of[base_id], rates))
+
+        rows = []
+        for date, snapshots in by_date.items():
+            matrix, deviation = cross_rate_matrix(
+                [
+                    [np.nan if rate is None else float(rate) for rate in rates]
+                    for _, rates in snapshots
+                ],
+                [base_index for base_index, _ in snapshots],
+            )
+            if deviation > self.tolerance:
+                logger.warning(
+                    f"Exchange rates of {date} are not triangularly consistent: "
+                    f"a quote deviates {deviation:.2%} from the cross rates"
+                )
+
+            bases, targets = np.nonzero(np.isfinite(matrix))
+            off_diagonal = bases != targets
+            for base, target in zip(bases[off_diagonal], targets[off_diagonal]):
+                rate = to_fixed(round(float(matrix[base, target]), RATE_DECIMALS))
+                # Pairs too small for the column's precision are left out
+                if rate:
+                    rows.append(RateRow(date, ids[base], ids[target], rate))
+        return rows
+
+    def call(self):
+        """
+        Upserts the cross rates that are new or differ from the stored ones.
+
+        Returns:
+            int -- Number of rows written
+        """
+        rows = self.pair_rows()
+        if not rows:
+            logger.info("No staged exchange rates to load")
+            return 0
+
+        dates = [row.date for row in rows]
+        stored = {
+            (date, base_id, target_id): to_fixed(round(float(rate), RATE_DECIMALS))
+            for date, base_id, target_id, rate in self.conn.get_exchange_rates(
+                min(dates), max(dates)
+            )
+        }
+        changed = [row for row in rows if stored.get(row.key()) != row.rate]
+        logger.info(
+            f"{len(changed)} of {len(rows)} currency pairs changed in fact_exchange_rates"
+        )
+        return self.conn.upsert_exchange_rates(changed)
@@ -4,8 +4,15 @@ USE warehouse;
 
 DROP TABLE IF EXISTS fact_btc;
 DROP TABLE IF EXISTS fact_gold;
+DROP TABLE IF EXISTS fact_gold_tick;
 DROP TABLE IF EXISTS fact_exchange_rates;
 DROP TABLE IF EXISTS dim_date;
+DROP TABLE IF EXISTS agg_btc_weekly;
+DROP TABLE IF EXISTS agg_btc_monthly;
+DROP TABLE IF EXISTS agg_btc_yearly;
+DROP TABLE IF EXISTS agg_gold_weekly;
+DROP TABLE IF EXISTS agg_gold_monthly;
+DROP TABLE IF EXISTS agg_gold_yearly;
 
 
 CREATE TABLE dim_date(
@@ -59,6 +66,25 @@ CREATE TABLE fact_gold(
 );
 
 
+# Append-only intraday gold snapshots. ts is the API timestamp in milliseconds
+# and prices are stored as integers in units of 10^-8 (price * 100000000),
+# which keeps the 8 decimals of the karat prices exact.
+CREATE TABLE fact_gold_tick(
+    currency_id INT NOT NULL,
+    date DATE NOT NULL,
+    ts BIGINT NOT NULL,
+    open BIGINT NOT NULL,
+    high BIGINT NOT NULL,
+    low BIGINT NOT NULL,
+    price BIGINT NOT NULL,
+    price_24k BIGINT,
+    price_18k BIGINT,
+    price_14k BIGINT,
+    FOREIGN KEY (currency_id) REFERENCES dim_currency(Id),
+    PRIMARY KEY (currency_id, date, ts)
+);
+
+
 CREATE TABLE fact_exchange_rates(
     Id INT AUTO_INCREMENT PRIMARY KEY,
     date DATE NOT NULL,
@@ -71,4 +97,124 @@ CREATE TABLE fact_exchange_rates(
     FOREIGN KEY (target_currency_id) REFERENCES dim_currency(Id),
     FOREIGN KEY (date) REFERENCES dim_date(date),
     UNIQUE INDEX idx_currency_date (base_currency_id, target_currency_id, date)
+);
+
+
+CREATE TABLE agg_btc_weekly(
+    Id INT AUTO_INCREMENT PRIMARY KEY,
+    currency_id INT,
+    period_start DATE NOT NULL,
+    period_end DATE NOT NULL,
+    open DECIMAL(16,2) NOT NULL,
+    high DECIMAL(16,2) NOT NULL,
+    low DECIMAL(16,2) NOT NULL,
+    close DECIMAL(16,2) NOT NULL,
+    avg_close DECIMAL(16,2) NOT NULL,
+    volume DECIMAL(24,8) NOT NULL,
+    day_count INT NOT NULL,
+    created_at TIMESTAMP(4) NOT NULL,
+    updated_at TIMESTAMP(4) NOT NULL,
+    FOREIGN KEY (currency_id) REFERENCES dim_currency(Id) ON DELETE SET NULL,
+    UNIQUE INDEX idx_currency_period (currency_id, period_start)
+);
+
+
+CREATE TABLE agg_btc_monthly(
+    Id INT AUTO_INCREMENT PRIMARY KEY,
+    currency_id INT,
+    period_start DATE NOT NULL,
+    period_end DATE NOT NULL,
+    open DECIMAL(16,2) NOT NULL,
+    high DECIMAL(16,2) NOT NULL,
+    low DECIMAL(16,2) NOT NULL,
+    close DECIMAL(16,2) NOT NULL,
+    avg_close DECIMAL(16,2) NOT NULL,
+    volume DECIMAL(24,8) NOT NULL,
+    day_count INT NOT NULL,
+    created_at TIMESTAMP(4) NOT NULL,
+    updated_at TIMESTAMP(4) NOT NULL,
+    FOREIGN KEY (currency_id) REFERENCES dim_currency(Id) ON DELETE SET NULL,
+    UNIQUE INDEX idx_currency_period (currency_id, period_start)
+);
+
+
+CREATE TABLE agg_btc_yearly(
+    Id INT AUTO_INCREMENT PRIMARY KEY,
+    currency_id INT,
+    period_start DATE NOT NULL,
+    period_end DATE NOT NULL,
+    open DECIMAL(16,2) NOT NULL,
+    high DECIMAL(16,2) NOT NULL,
+    low DECIMAL(16,2) NOT NULL,
+    close DECIMAL(16,2) NOT NULL,
+    avg_close DECIMAL(16,2) NOT NULL,
+    volume DECIMAL(24,8) NOT NULL,
+    day_count INT NOT NULL,
+    created_at TIMESTAMP(4) NOT NULL,
+    updated_at TIMESTAMP(4) NOT NULL,
+    FOREIGN KEY (currency_id) REFERENCES dim_currency(Id) ON DELETE SET NULL,
+    UNIQUE INDEX idx_currency_period (currency_id, period_start)
+);
+
+
+CREATE TABLE agg_gold_weekly(
+    Id INT AUTO_INCREMENT PRIMARY KEY,
+    currency_id INT,
+    period_start DATE NOT NULL,
+    period_end DATE NOT NULL,
+    open DECIMAL(16,2) NOT NULL,
+    high DECIMAL(16,2) NOT NULL,
+    low DECIMAL(16,2) NOT NULL,
+    close DECIMAL(16,2) NOT NULL,
+    avg_price DECIMAL(16,2) NOT NULL,
+    avg_price_24k DECIMAL(16,8),
+    avg_price_18k DECIMAL(16,8),
+    avg_price_14k DECIMAL(16,8),
+    day_count INT NOT NULL,
+    created_at TIMESTAMP(4) NOT NULL,
+    updated_at TIMESTAMP(4) NOT NULL,
+    FOREIGN KEY (currency_id) REFERENCES dim_currency(Id) ON DELETE SET NULL,
+    UNIQUE INDEX idx_currency_period (currency_id, period_start)
+);
+
+
+CREATE TABLE agg_gold_monthly(
+    Id INT AUTO_INCREMENT PRIMARY KEY,
+    currency_id INT,
+    period_start DATE NOT NULL,
+    period_end DATE NOT NULL,
+    open DECIMAL(16,2) NOT NULL,
+    high DECIMAL(16,2) NOT NULL,
+    low DECIMAL(16,2) NOT NULL,
+    close DECIMAL(16,2) NOT NULL,
+    avg_price DECIMAL(16,2) NOT NULL,
+    avg_price_24k DECIMAL(16,8),
+    avg_price_18k DECIMAL(16,8),
+    avg_price_14k DECIMAL(16,8),
+    day_count INT NOT NULL,
+    created_at TIMESTAMP(4) NOT NULL,
+    updated_at TIMESTAMP(4) NOT NULL,
+    FOREIGN KEY (currency_id) REFERENCES dim_currency(Id) ON DELETE SET NULL,
+    UNIQUE INDEX idx_currency_period (currency_id, period_start)
+);
+
+
+CREATE TABLE agg_gold_yearly(
+    Id INT AUTO_INCREMENT PRIMARY KEY,
+    currency_id INT,
+    period_start DATE NOT NULL,
+    period_end DATE NOT NULL,
+    open DECIMAL(16,2) NOT NULL,
+    high DECIMAL(16,2) NOT NULL,
+    low DECIMAL(16,2) NOT NULL,
+    close DECIMAL(16,2) NOT NULL,
+    avg_price DECIMAL(16,2) NOT NULL,
+    avg_price_24k DECIMAL(16,8),
+    avg_price_18k DECIMAL(16,8),
+    avg_price_14k DECIMAL(16,8),
+    day_count INT NOT NULL,
+    created_at TIMESTAMP(4) NOT NULL,
+    updated_at TIMESTAMP(4) NOT NULL,
+    FOREIGN KEY (currency_id) REFERENCES dim_currency(Id) ON DELETE SET NULL,
+    UNIQUE INDEX idx_currency_period (currency_id, period_start)
 );
\ No newline at end of file
@@ -0,0 +1,154 @@
+import os
+import queue
+import threading
+
+from etl.commons.metrics import metrics
+from etl.extract.database_extract import DBConnectorExtract
+from etl.extract.utils_extract import save_to_file
+from etl.pipeline.logger_pipeline import logger
+from etl.transform.database_transform import DBConnectorTransform
+from etl.transform.utils_transform import move_file
+
+
+DATA_TYPES = {"btc": "bitcoin", "gold": "gold"}
+
+
+class LineageWriter(threading.Thread):
+    """
+    Background thread writing raw files and audit rows for payloads that
+    were transformed in memory.
+
+    For every payload it does what the file-based path would have done:
+    save the raw file, log it in import_log, archive it and log it in
+    transform_log, so lineage is identical and the next file-based
+    transform run does not pick the file up again.
+
+    Methods:
+        __init__()  -- Initializes the job queue
+        submit()    -- Queue a transformed payload for archiving
+        close()     -- Wait until all queued payloads are written
+        run()       -- Thread body writing queued payloads
+
+    Instance Variables:
+        jobs -- Bounded queue of pending payloads
+    """
+
+    def __init__(self, max_pending=100):
+        """
+        Initialize the writer.
+
+        Parameters:
+            max_pending -- Maximum queued payloads before submit() blocks
+        """
+        super().__init__(name="lineage-writer", daemon=True)
+        self.jobs = queue.Queue(maxsize=max_pending)
+
+    def submit(
+        self, api_type, currency_id, data, row_count, processed_count, run_id=None
+    ):
+        """
+        Queue a payload that has already been transformed.
+
+        Parameters:
+            api_type        -- 'btc' or 'gold'
+            currency_id     -- Currency ID of the payload
+            data            -- Parsed API payload
+            row_count       -- Rows contained in the payload
+            processed_count -- Rows upserted into staging by the transform
+            run_id          -- transform_run the payload was staged under (None outside runs)
+
+        Returns:
+            None
+        """
+        self.jobs.put(
+            (api_type, currency_id, data, row_count, processed_count, run_id)
+        )
+
+    def close(self):
+        """
+        Signal the end of input and wait for the writer to finish.
+
+        Returns:
+            None
+        """
+        self.jobs.put(None)
+        self.join()
+
+    def run(self):
+        """
+        Write queued payloads until close() is called.
+
+        Returns:
+            None
+        """
+        extract_conn = DBConnectorExtract(logger=logger)
+        transform_conn = DBConnectorTransform(logger=logger)
+        extract_conn.connect()
+        transform_conn.connect()
+
+        try:
+            while True:
+                job = self.jobs.get()
+                if job is None:
+                    break
+                try:
+                    with metrics.step("pipeline.lineage_write"):
+                        self.write(extract_conn, transform_conn, *job)
+                except Exception as e:
+                    logger.error(
+                        f"Failed to write lineage for {job[0]} payload: {str(e)}",
+                        exc_info=True,
+                    )
+        finally:
+            extract_conn.disconnect()
+            transform_conn.disconnect()
+
+    @staticmethod
+    def write(
+        extract_conn,
+        transform_conn,
+        api_type,
+        currency_id,
+        data,
+        row_count,
+        processed_count,
+        run_id,
+    ):
+        """
+        Save, log and archive one payload.
+
+        Parameters:
+            extract_conn    -- Connected DBConnectorExtract
+            transform_conn  -- Connected DBConnectorTransform
+            api_type        -- 'btc' or 'gold'
+            currency_id     -- Currency ID of the payload
+            data            -- Parsed API payload
+            row_count       -- Rows contained in the payload
+            processed_count -- Rows upserted into staging by the transform
+            run_id          -- transform_run the payload was staged under (None outside runs)
+
+        Returns:
+            None
+        """
+        file_path, file_created_date, file_last_modified_date = save_to_file(
+            data, api_type
+        )
+        extract_conn.log_import(
+            currency_id,
+            os.path.dirname(file_path),
+            os.path.basename(file_path),
+            file_created_date,
+            file_last_modified_date,
+            row_count,
+        )
+
+        status = "processed" if processed_count > 0 else "error"
+        new_file_path = move_file(status, DATA_TYPES[api_type], file_path)
+        transform_conn.log_transform(
+            currency_id,
+            os.path.dirname(new_file_path),
+            os.path.basename(new_file_path),
+            processed_count,
+            status,
+            run_id,
+        )
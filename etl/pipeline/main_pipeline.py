@@ -0,0 +1,278 @@
+import os
+import queue
+import threading
+
+from etl.commons.metrics import metrics
+from etl.commons.stages import ASSETS
+from etl.extract.btc_extract import BitcoinExtract
+from etl.extract.gold_extract import GoldExtract
+from etl.extract.database_extract import DBConnectorExtract
+from etl.extract.logger_extract import logger as extract_logger
+from etl.load.main_load import load
+from etl.pipeline.lineage_pipeline import LineageWriter
+from etl.pipeline.logger_pipeline import logger
+from etl.transform.btc_transform import BitcoinTransform
+from etl.transform.gold_transform import GoldTransform
+from etl.transform.database_transform import DBConnectorTransform
+from etl.transform.main_transform import resume_or_start_runs
+from etl.transform.worker_transform import DATA_TYPES, TransformWorker
+from etl.validate.main_validate import validate
+
+
+def _produce(payloads):
+    """
+    Run the extract stage, handing every payload to the in-memory queue.
+
+    Parameters:
+        payloads -- Bounded queue receiving (api_type, currency_code, currency_id, data, row_count)
+
+    Returns:
+        None
+    """
+    conn = DBConnectorExtract(logger=extract_logger)
+    conn.connect()
+
+    def sink(api_type, currency_code, currency_id, data, row_count):
+        payloads.put((api_type, currency_code, currency_id, data, row_count))
+
+    try:
+        with metrics.step("extract"):
+            BitcoinExtract(conn).call(sink=sink)
+            GoldExtract(conn).call(sink=sink)
+    except Exception as e:
+        logger.error(f"Extract producer failed: {str(e)}", exc_info=True)
+    finally:
+        payloads.put(None)
+        conn.disconnect()
+
+
+@metrics.timed("pipeline.in_memory")
+def run_in_memory():
+    """
+    Run extract, transform and load without the raw-file round-trip.
+
+    Extracted payloads are passed to the transformers as parsed objects
+    through a bounded queue (PIPELINE_QUEUE_SIZE), while a background
+    LineageWriter saves the raw files and writes import_log/transform_log
+    rows. Payloads are staged under a transform run per asset, opened like
+    in the transform stage: staging rows of runs that were not loaded are
+    kept, and files left in import_log by earlier runs are drained first.
+    The runs are completed and the validate and load stages run once all
+    payloads are in staging.
+    """
+    logger.info("Starting in-memory ETL process")
+
+    lineage = LineageWriter()
+    lineage.start()
+    try:
+        _transform_payloads(lineage)
+        validate()
+        load()
+    finally:
+        logger.info("Waiting for background lineage writes to finish")
+        lineage.close()
+
+    logger.info("In-memory ETL process completed successfully")
+
+
+def _transform_payloads(lineage):
+    """
+    Extract on a producer thread and stage every payload as it arrives.
+
+    Each payload is committed on its own. A payload that fails is rolled
+    back and archived with status 'error', and the next one is processed.
+
+    Parameters:
+        lineage -- Started LineageWriter archiving the payloads
+
+    Returns:
+        None
+    """
+    conn = DBConnectorTransform(logger=logger)
+    conn.connect()
+    try:
+        run_ids = resume_or_start_runs(conn, ASSETS)
+        transformers = {
+            "btc": BitcoinTransform(conn, run_ids["btc"]),
+            "gold": GoldTransform(conn, run_ids["gold"]),
+        }
+        # Queued before the producer starts: the payloads logged in import_log
+        # by the lineage writer are transformed already
+        for asset in ASSETS:
+            conn.enqueue_files(DATA_TYPES[asset], run_ids[asset])
+    except Exception:
+        conn.disconnect()
+        raise
+
+    payloads = queue.Queue(maxsize=int(os.getenv("PIPELINE_QUEUE_SIZE", "4")))
+    producer = threading.Thread(
+        target=_produce, args=(payloads,), name="extract-producer"
+    )
+    producer.start()
+
+    try:
+        with metrics.step("transform"):
+            TransformWorker(conn).drain([DATA_TYPES[asset] for asset in ASSETS])
+
+            while True:
+                item = payloads.get()
+                if item is None:
+                    break
+
+                api_type, currency_code, currency_id, data, row_count = item
+                source = f"in-memory {api_type} payload for {currency_code}"
+                try:
+                    currency_id, processed_count = transformers[
+                        api_type
+                    ].transform_data([data], currency_id, source)
+                    conn.conn.commit()
+                    metrics.add_rows(processed_count)
+                    logger.info(
+                        f"Transformed {processed_count} data points from {source}"
+                    )
+                except Exception as e:
+                    conn.conn.rollback()
+                    processed_count = 0
+                    logger.error(
+                        f"Error transforming {source}: {str(e)}", exc_info=True
+                    )
+
+                lineage.submit(
+                    api_type,
+                    currency_id,
+                    data,
+                    row_count,
+                    processed_count,
+                    run_ids[api_type],
+                )
+
+        for asset in ASSETS:
+            conn.finish_run(run_ids[asset])
+    finally:
+        # Unblock the producer if the loop ended early.
+        while producer.is_alive():
+            try:
+                payloads.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        producer.join()
+        conn.disconnect()
+
+
+def _publish_files(files, assets):
+    """
+    Run the extract stage, publishing every saved file as soon as it is logged.
+
+    After the last file of an asset, (asset, None) marks its extract as done.
+
+    Parameters:
+        files  -- Queue receiving (asset, import_log_id) items, then None
+        assets -- Assets to extract
+
+    Returns:
+        None
+    """
+    conn = DBConnectorExtract(logger=extract_logger)
+    conn.connect()
+    extractors = {"btc": BitcoinExtract, "gold": GoldExtract}
+
+    try:
+        with metrics.step("extract"):
+            for asset in assets:
+                try:
+                    extractors[asset](conn).call(
+                        publish=lambda import_log_id, asset=asset: files.put(
+                            (asset, import_log_id)
+                        )
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Extract of {asset} failed: {str(e)}", exc_info=True
+                    )
+                finally:
+                    files.put((asset, None))
+    finally:
+        files.put(None)
+        conn.disconnect()
+
+
+def _load_assets(ready):
+    """
+    Validate and load each asset as soon as its staging is complete.
+
+    Parameters:
+        ready -- Queue receiving asset names, then None
+
+    Returns:
+        None
+    """
+    for asset in iter(ready.get, None):
+        try:
+            validate(assets=[asset])
+            load(assets=[asset])
+        except Exception as e:
+            logger.error(f"Load of {asset} failed: {str(e)}", exc_info=True)
+
+
+@metrics.timed("pipeline.pipelined")
+def run_pipelined(assets=ASSETS):
+    """
+    Run extract, transform and load as overlapping stages.
+
+    The extract runs on a producer thread and publishes every raw file as
+    soon as it is saved and logged in import_log; the transform processes
+    it right away. When the last file of an asset is transformed, the
+    asset's transform run is completed and a loader thread validates and
+    loads it while the next asset is still being extracted. Files left in
+    import_log by earlier runs are queued and drained first, like in the
+    transform stage.
+
+    Parameters:
+        assets -- Assets to process, 'btc' and/or 'gold' (default: both)
+    """
+    logger.info("Starting pipelined ETL process")
+
+    conn = DBConnectorTransform(logger=logger)
+    conn.connect()
+    run_ids = resume_or_start_runs(conn, assets)
+    transformers = {
+        "btc": BitcoinTransform(conn, run_ids.get("btc")),
+        "gold": GoldTransform(conn, run_ids.get("gold")),
+    }
+    # Queued before the producer starts, so new files are not picked up twice
+    for asset in assets:
+        conn.enqueue_files(DATA_TYPES[asset], run_ids[asset])
+
+    files = queue.Queue()
+    ready = queue.Queue()
+    producer = threading.Thread(
+        target=_publish_files, args=(files, assets), name="extract-producer"
+    )
+    loader = threading.Thread(target=_load_assets, args=(ready,), name="loader")
+    producer.start()
+    loader.start()
+
+    try:
+        with metrics.step("transform"):
+            TransformWorker(conn).drain([DATA_TYPES[asset] for asset in assets])
+
+            for asset, import_log_id in iter(files.get, None):
+                if import_log_id is None:
+                    conn.finish_run(run_ids[asset])
+                    logger.info(
+                        f"Staging of {asset} complete, handing it to the loader"
+                    )
+                    ready.put(asset)
+                    continue
+
+                file_info = conn.get_import_file(import_log_id)
+                if file_info:
+                    transformers[asset].transform(file_info)
+    finally:
+        # The file queue is unbounded, so the producer never blocks on it.
+        producer.join()
+        ready.put(None)
+        loader.join()
+        conn.disconnect()
+
+    logger.info("Pipelined ETL process completed successfully")
@@ -0,0 +1,204 @@
+import functools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from etl.commons.metrics import metrics
+from etl.load.main_load import load
+from etl.reprocess.logger_reprocess import logger
+from etl.reprocess.utils_reprocess import (
+    merge_btc,
+    merge_gold,
+    parse_archive_file,
+    scan_archive,
+)
+from etl.transform.database_transform import DBConnectorTransform
+from etl.transform.utils_transform import recover_pending_moves
+from etl.validate.main_validate import validate
+
+
+# Data type of the archive -> asset it is loaded as
+ASSETS = {"bitcoin": "btc", "gold": "gold"}
+
+
+def parse_files(data_type, date_from, date_to, paths):
+    """
+    Parse archived files on REPROCESS_WORKERS processes (default: one per CPU).
+
+    Worker processes are spawned rather than forked, so they start their
+    own log listeners instead of inheriting the parent's threads.
+
+    Parameters:
+        data_type -- 'bitcoin' or 'gold'
+        date_from -- First date to keep
+        date_to   -- Last date to keep
+        paths     -- Files to parse, oldest extraction first
+
+    Returns:
+        list -- Record lists of parse_archive_file(), in the order of paths
+    """
+    workers = int(os.getenv("REPROCESS_WORKERS", "0")) or os.cpu_count() or 1
+    parse = functools.partial(parse_archive_file, data_type, date_from, date_to)
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        return list(
+            pool.map(parse, paths, chunksize=max(1, len(paths) // (workers * 4)))
+        )
+
+
+def stage_btc(conn, results, currency_ids, batch_size):
+    """
+    Merge the parsed Bitcoin files and upsert them into btc_data_import.
+
+    Parameters:
+        conn         -- Connected DBConnectorTransform
+        results      -- Record lists of parse_archive_file(), oldest file first
+        currency_ids -- Currency code -> dim_currency ID
+        batch_size   -- Rows per executemany() batch
+
+    Returns:
+        int -- Number of staged rows
+    """
+    rows = []
+    for (currency_code, _), row in merge_btc(results).items():
+        if currency_code in currency_ids:
+            row.currency_id = currency_ids[currency_code]
+            rows.append(row)
+    for offset in range(0, len(rows), batch_size):
+        conn.upsert_btc_rows(rows[offset:offset + batch_size])
+    return len(rows)
+
+
+def stage_gold(conn, results, currency_ids, batch_size):
+    """
+    Merge the parsed Gold files, upsert the newest snapshot of each day into
+    gold_data_import and every snapshot into gold_tick_import.
+
+    Parameters:
+        conn         -- Connected DBConnectorTransform
+        results      -- Record lists of parse_archive_file(), oldest file first
+        currency_ids -- Currency code -> dim_currency ID
+        batch_size   -- Rows per executemany() batch
+
+    Returns:
+        int -- Number of staged daily rows
+    """
+    days, ticks = merge_gold(results)
+
+    for snapshots in (days, ticks):
+        for (currency_code, _), row in snapshots.items():
+            row.currency_id = currency_ids.get(currency_code)
+    rows = [row for row in days.values() if row.currency_id]
+    tick_rows = [row for row in ticks.values() if row.currency_id]
+    rate_codes = tuple(sorted({code for row in rows for code in row.rate_codes}))
+
+    conn.check_rate_columns(rate_codes)
+    for offset in range(0, len(rows), batch_size):
+        conn.upsert_gold_rows(rows[offset:offset + batch_size], rate_codes)
+    for offset in range(0, len(tick_rows), batch_size):
+        conn.insert_gold_ticks(tick_rows[offset:offset + batch_size])
+    return len(rows)
+
+
+@metrics.timed("reprocess")
+def reprocess(data_type, date_from, date_to):
+    """
+    Replay archived files through the current transform logic and load the
+    result into the warehouse.
+
+    The files of data/processed/<data_type> are listed with os.scandir and
+    parsed in parallel with the transform's parsing functions. Overlapping
+    payloads are merged, keeping the most recent values per key, and the
+    result is bulk-loaded into staging under a new transform run, then
+    validated and loaded like a regular run. Nothing is written to
+    transform_log and no file is moved.
+
+    The staging tables are emptied first unless they hold rows of a run
+    that was not loaded yet, which are then loaded together with the
+    reprocessed rows. An interrupted transform run must be resumed first.
+
+    Parameters:
+        data_type -- 'bitcoin' or 'gold'
+        date_from -- First date to reprocess
+        date_to   -- Last date to reprocess
+
+    Returns:
+        None
+    """
+    asset = ASSETS[data_type]
+    logger.info(f"Starting reprocessing of {data_type} from {date_from} to {date_to}")
+
+    conn = DBConnectorTransform(logger=logger)
+    conn.connect()
+    try:
+        last_run = conn.get_last_run(asset)
+        if last_run and last_run[1] == "running":
+            logger.error(
+                f"{asset} transform run {last_run[0]} is still running or was "
+                f"interrupted; run the transform before reprocessing"
+            )
+            return
+        if last_run:
+            recovered = recover_pending_moves(conn.get_logged_moves(last_run[0]))
+            if recovered:
+                logger.info(
+                    f"Completed {recovered} pending file moves of run {last_run[0]}"
+                )
+
+        with metrics.step("reprocess.scan"):
+            paths = scan_archive(data_type, date_from)
+        if not paths:
+            logger.info(f"No archived {data_type} files to reprocess")
+            return
+        logger.info(f"Parsing {len(paths)} archived {data_type} files")
+
+        with metrics.step("reprocess.parse"):
+            results = parse_files(data_type, date_from, date_to, paths)
+
+        currency_ids = {code: id_ for id_, code in conn.get_currencies()}
+        unknown = {
+            record[0]
+            for records in results
+            for record in records
+            if record[0] not in currency_ids
+        }
+        if unknown:
+            logger.warning(
+                f"Skipping records of unknown currencies: {', '.join(sorted(unknown))}"
+            )
+
+        run_id = conn.start_run(asset)
+        if last_run is None or last_run[1] == "loaded":
+            conn.truncate_import_tables([asset])
+        else:
+            logger.info(
+                f"Keeping {asset} staging rows of run {last_run[0]}, which were not loaded"
+            )
+
+        batch_size = int(os.getenv("REPROCESS_BATCH_ROWS", "5000"))
+        try:
+            with metrics.step("reprocess.stage"):
+                if asset == "btc":
+                    staged = stage_btc(conn, results, currency_ids, batch_size)
+                else:
+                    staged = stage_gold(conn, results, currency_ids, batch_size)
+                conn.conn.commit()
+            metrics.add_rows(staged)
+        except Exception as e:
+            conn.conn.rollback()
+            conn.finish_run(run_id, "error")
+            logger.error(
+                f"Error staging reprocessed {data_type} rows: {str(e)}",
+                exc_info=True,
+            )
+            return
+
+        conn.finish_run(run_id)
+        logger.info(f"Staged {staged} reprocessed {asset} rows under run {run_id}")
+    finally:
+        conn.disconnect()
+
+    validate([asset])
+    load([asset])
+    logger.info("Reprocessing completed")
@@ -0,0 +1,159 @@
+import os
+import re
+from datetime import datetime, timedelta
+
+from etl.transform.btc_transform import parse_btc_payload
+from etl.transform.gold_transform import parse_gold_payload
+from etl.transform.utils_transform import load_json_file
+from etl.reprocess.logger_reprocess import logger
+
+
+# Extraction time in the name of a saved payload, e.g.
+# gold_20250101_120000_000000.json, or gold_20250101_120000_000.json for
+# files saved with millisecond stamps
+ARCHIVE_STAMP_RE = re.compile(r"_(\d{8}_\d{6})_(\d{3}|\d{6})\.json$")
+
+
+def archive_stamp(name):
+    """
+    Return the extraction time in the name of an archived file, with the
+    fraction of a second padded to microseconds so that millisecond and
+    microsecond stamps sort together.
+
+    Parameters:
+        name -- File name
+
+    Returns:
+        str or None -- 'YYYYMMDD_HHMMSS_ffffff', None if the name has no stamp
+    """
+    match = ARCHIVE_STAMP_RE.search(name)
+    if match is None:
+        return None
+    return f"{match.group(1)}_{match.group(2).ljust(6, '0')}"
+
+
+def scan_archive(data_type, date_from):
+    """
+    List the archived files of a data type that may hold data from a date on,
+    oldest extraction first.
+
+    A payload never holds data newer than its extraction, so files extracted
+    more than a day before date_from are skipped without being opened.
+    Files whose name carries no extraction time are ordered by modification
+    time.
+
+    Parameters:
+        data_type -- 'bitcoin' or 'gold'
+        date_from -- First date of the reprocessed range
+
+    Returns:
+        list -- File paths
+    """
+    directory = os.path.join(os.path.normpath("data"), "processed", data_type)
+    if not os.path.isdir(directory):
+        logger.warning(f"Archive directory not found: {directory}")
+        return []
+
+    oldest = (date_from - timedelta(days=1)).strftime("%Y%m%d")
+    files = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".json") or not entry.is_file():
+                continue
+
+            stamp = archive_stamp(entry.name)
+            if stamp:
+                if stamp[:8] < oldest:
+                    continue
+            else:
+                stamp = datetime.fromtimestamp(entry.stat().st_mtime).strftime(
+                    "%Y%m%d_%H%M%S_%f"
+                )
+            files.append((stamp, entry.path))
+
+    files.sort()
+    return [path for _, path in files]
+
+
+def parse_archive_file(data_type, date_from, date_to, path):
+    """
+    Parse one archived file with the transform's parsing rules and keep the
+    records dated within the range. Runs in a worker process.
+
+    Parameters:
+        data_type -- 'bitcoin' or 'gold'
+        date_from -- First date to keep
+        date_to   -- Last date to keep
+        path      -- Archived file
+
+    Returns:
+        list -- (code, BtcRow or GoldRow) tuples, rows with no currency_id
+    """
+    records = []
+    try:
+        data_list = load_json_file(path)
+        if data_list is None:
+            return records
+
+        with data_list:
+            for data in data_list:
+                if data_type == "bitcoin":
+                    currency_code, rows = parse_btc_payload(data, path)
+                    records.extend(
+                        (currency_code, row)
+                        for row in rows
+                        if date_from <= row.date <= date_to
+                    )
+                else:
+                    snapshot = parse_gold_payload(data, path)
+                    if snapshot and date_from <= snapshot[1].date <= date_to:
+                        records.append(snapshot)
+
+    except Exception as e:
+        logger.error(f"Error parsing archived file {path}: {str(e)}", exc_info=True)
+        return []
+
+    return records
+
+
+def merge_btc(results):
+    """
+    Merge the Bitcoin records of several files, keeping per (code, date) the
+    values of the most recently extracted file.
+
+    Parameters:
+        results -- Record lists of parse_archive_file(), oldest file first
+
+    Returns:
+        dict -- (code, date) -> BtcRow
+    """
+    rows = {}
+    for records in results:
+        for currency_code, row in records:
+            rows[(currency_code, row.date)] = row
+    return rows
+
+
+def merge_gold(results):
+    """
+    Merge the Gold snapshots of several files.
+
+    Every distinct snapshot (code, timestamp) is kept as a tick, the most
+    recently extracted one winning when a snapshot was archived twice. The
+    daily row of a (code, date) is the snapshot with the newest timestamp.
+
+    Parameters:
+        results -- Record lists of parse_archive_file(), oldest file first
+
+    Returns:
+        tuple -- ((code, date) -> GoldRow, (code, timestamp_ms) -> GoldRow)
+    """
+    days = {}
+    ticks = {}
+    for records in results:
+        for currency_code, row in records:
+            ticks[(currency_code, row.ts)] = row
+            newest = days.get((currency_code, row.date))
+            if newest is None or row.ts >= newest.ts:
+                days[(currency_code, row.date)] = row
+    return days, ticks
@@ -1,12 +1,81 @@
 import os
 from datetime import datetime
 
+from etl.commons.metrics import metrics
+from etl.commons.records import BtcRow, to_fixed
 from etl.transform.database_transform import DBConnectorTransform
 from etl.transform.utils_transform import (
+    archive_path,
+    batched,
     move_file,
     load_json_file,
 )
-from etl.transform.logger_transform import logger
+from etl.transform.logger_transform import logger, row_logger
+
+
+# Keys of the daily values of an Alpha Vantage time series entry
+DAILY_FIELDS = ("1. open", "2. high", "3. low", "4. close", "5. volume")
+
+
+def parse_btc_payload(data, source):
+    """
+    Extract the market code and the daily prices of an Alpha Vantage payload.
+
+    Used by the transform and by the reprocessing of archived files, so both
+    apply the same parsing rules. Entries that cannot be parsed are logged
+    and skipped.
+
+    The rows are parsed lazily, one time series entry at a time as they are
+    consumed, so a payload is never held in memory as a whole.
+
+    Parameters:
+        data   -- API response object (dict or LazyObject view)
+        source -- Description of where the payload came from, used in log messages
+
+    Returns:
+        tuple -- (market code or None, iterable of BtcRow with no currency_id)
+    """
+    meta = data.get("Meta Data", {})
+    if not meta:
+        logger.warning(f"No Meta Data found in {source}")
+        return None, []
+
+    currency_code = meta.get("4. Market Code", "")
+    if not currency_code:
+        logger.warning(f"No Market Code found in {source}")
+        return None, []
+
+    time_series = data.get("Time Series (Digital Currency Daily)", {})
+    if not time_series:
+        logger.warning(f"No Time Series data found in {source}")
+        return currency_code, []
+
+    return currency_code, _parse_time_series(time_series)
+
+
+def _parse_time_series(time_series):
+    """
+    Yield the BtcRow of every parsable entry of an Alpha Vantage time series.
+
+    Parameters:
+        time_series -- Date string -> daily values mapping
+
+    Returns:
+        generator -- BtcRow with no currency_id
+    """
+    for date_str, daily_data in time_series.items():
+        try:
+            date = datetime.strptime(date_str, "%Y-%m-%d").date()
+            row_logger.debug("Processing data for date: %s", date)
+            values = [to_fixed(daily_data.get(field)) for field in DAILY_FIELDS]
+            if None in values:
+                raise ValueError("missing price or volume")
+        except Exception as e:
+            logger.error(
+                f"Error processing date {date_str}: {str(e)}", exc_info=True
+            )
+            continue
+        yield BtcRow(None, date, *values)
 
 
 class BitcoinTransform:
@@ -15,42 +84,91 @@ class BitcoinTransform:
     and loads them into the database.
 
     Methods:
-        __init__()   -- Initializes with a DB connection
-        transform()  -- Processes and loads data from a single file
-        call()       -- Triggers processing of all files based on import_log
+        __init__()       -- Initializes with a DB connection
+        transform_data() -- Processes and loads already-parsed API payloads
+        transform()      -- Processes and loads data from a single file
+        call()           -- Triggers processing of all files based on import_log
 
     Instance Variables:
         conn      -- Database connection object (DBConnectorTransform)
+        run_id    -- transform_run the processed files are logged under
 
     """
 
-    def __init__(self, conn: DBConnectorTransform):
+    def __init__(self, conn: DBConnectorTransform, run_id=None):
         """
         Initialize the transformer with a database connection.
 
         Parameters:
-            conn -- DBConnectorTransform instance for DB operations
+            conn   -- DBConnectorTransform instance for DB operations
+            run_id -- transform_run ID written to transform_log (default: None)
         """
         self.conn = conn
+        self.run_id = run_id
+
+    def transform_data(self, data_list, currency_id, source):
+        """
+        Transform already-parsed Bitcoin API payloads and upsert them into the staging table.
+
+        The rows of each payload are parsed lazily and upserted in batches of
+        TRANSFORM_BATCH_ROWS, and left uncommitted; the caller commits them.
+
+        Parameters:
+            data_list   -- Iterable of API response objects (dicts or LazyObject views)
+            currency_id -- Currency ID from import_log (looked up from the payload if None)
+            source      -- Description of where the payloads came from, used in log messages
+
+        Returns:
+            tuple -- (currency_id, number of processed data points)
+        """
+        processed_count = 0
+
+        for data in data_list:
+            currency_code, rows = parse_btc_payload(data, source)
+            if not currency_code:
+                continue
+
+            logger.debug(
+                f"Processing data for currency code: {currency_code}"
+            )
+
+            if not currency_id:
+                currency_id = self.conn.get_currency_by_code(currency_code)
 
+            if not currency_id:
+                logger.warning(
+                    f"No currency ID found for code: {currency_code}"
+                )
+                continue
+
+            logger.debug(f"Processing time series entries from {source}")
+            for batch in batched(rows):
+                for row in batch:
+                    row.currency_id = currency_id
+                processed_count += self.conn.upsert_btc_rows(batch)
+
+        return currency_id, processed_count
+
+    @metrics.timed("transform.bitcoin_file")
     def transform(self, file_info):
         """
         Process a single Bitcoin data file, transform its contents, and insert into DB.
 
         Parameters:
-            file_info -- Dictionary containing file information from import_log
+            file_info -- FileWorkItem of the file (with queue_id and worker
+                         set when leased from the queue)
 
         Returns:
             None
         """
-        file_path = file_info['full_path']
-        import_log_id = file_info['id']
+        file_path = file_info.full_path
+        import_log_id = file_info.id
 
         logger.info(f"Processing bitcoin file: {file_path} (import_log_id: {import_log_id})")
         data_type = "bitcoin"
         status = "error"
         processed_count = 0
-        currency_id = file_info['currency_id']
+        currency_id = file_info.currency_id
 
         try:
             data_list = load_json_file(file_path)
@@ -58,75 +176,12 @@ class BitcoinTransform:
             if data_list is None:
                 return
 
-            for data in data_list:
-                meta = data.get("Meta Data", {})
-                if not meta:
-                    logger.warning(f"No Meta Data found in file: {file_path}")
-                    continue
-
-                currency_code = meta.get("4. Market Code", "")
-                if not currency_code:
-                    logger.warning(
-                        f"No Market Code found in file: {file_path}"
-                    )
-                    continue
-
-                logger.debug(
-                    f"Processing data for currency code: {currency_code}"
-                )
-
-                if not currency_id:
-                    currency_id = self.conn.get_currency_by_code(currency_code)
-
-                if not currency_id:
-                    logger.warning(
-                        f"No currency ID found for code: {currency_code}"
-                    )
-                    continue
-
-                time_series = data.get(
-                    "Time Series (Digital Currency Daily)", {}
-                )
-                if not time_series:
-                    logger.warning(
-                        f"No Time Series data found in file: {file_path}"
-                    )
-                    continue
-
-                logger.debug(
-                    f"Processing {len(time_series)} time series entries"
+            with data_list:
+                currency_id, processed_count = self.transform_data(
+                    data_list, currency_id, file_path
                 )
-                for date_str, daily_data in time_series.items():
-                    try:
-                        date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                        logger.debug(f"Processing data for date: {date}")
-
-                        open_price = float(daily_data.get("1. open"))
-                        high = float(daily_data.get("2. high"))
-                        low = float(daily_data.get("3. low"))
-                        close = float(daily_data.get("4. close"))
-                        volume = float(daily_data.get("5. volume"))
-
-                        logger.debug(
-                            f"Upserting bitcoin data for currency_id {currency_id}, date {date}"
-                        )
-                        self.conn.upsert_btc_data(
-                            currency_id,
-                            date,
-                            open_price,
-                            high,
-                            low,
-                            close,
-                            volume,
-                        )
-
-                        processed_count += 1
-                    except Exception as e:
-                        logger.error(
-                            f"Error processing date {date_str}: {str(e)}",
-                            exc_info=True,
-                        )
 
+            metrics.add_rows(processed_count)
             if processed_count > 0:
                 status = "processed"
                 logger.info(
@@ -140,17 +195,36 @@ class BitcoinTransform:
                 f"Error processing file {file_path}: {str(e)}", exc_info=True
             )
             status = "error"
-
-        new_file_path = move_file(status, data_type, file_path)
+            processed_count = 0
+            # Discard the rows staged from the failed file
+            self.conn.conn.rollback()
+
+        # The staging rows and the log entry commit together; the file is
+        # moved only afterwards, and an interrupted move is completed by the
+        # next run from transform_log.
+        new_file_path = archive_path(status, data_type, file_path)
+
+        # A file leased from the work queue leaves it in the same commit,
+        # unless its lease expired and another worker has taken it over.
+        if file_info.queue_id is not None and not self.conn.complete_claim(
+            file_info.queue_id, file_info.worker
+        ):
+            self.conn.conn.rollback()
+            logger.warning(
+                f"Lease on {file_path} was lost to another worker, discarding its rows"
+            )
+            return
 
         logger.info(f"Logging transformation for file {file_path}")
-        self.conn.log_transform(
+        if self.conn.log_transform(
             currency_id,
             os.path.dirname(new_file_path),
             os.path.basename(new_file_path),
             processed_count,
-            status
-        )
+            status,
+            self.run_id,
+        ):
+            move_file(status, data_type, file_path)
 
     def call(self):
         """
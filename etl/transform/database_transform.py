@@ -1,8 +1,65 @@
+import os
 import re
-from datetime import datetime
+from datetime import date, datetime
 
 from etl.commons.database import DBConnector
-from etl.transform.logger_transform import logger
+from etl.commons.metrics import metrics
+from etl.commons.records import FileWorkItem
+from etl.commons.state import get_state_cache
+from etl.transform.logger_transform import logger, row_logger
+
+
+# Currency codes accepted as rate column suffixes
+CURRENCY_CODE_RE = re.compile(r"^[A-Z]{3}$")
+
+# import_log columns read for a file, in the order FileWorkItem.from_row() expects
+IMPORT_LOG_COLUMNS = """
+    il.Id,
+    il.batch_date,
+    il.currency_id,
+    il.import_directory_name,
+    il.import_file_name,
+    il.file_created_date,
+    il.file_last_modified_date,
+    il.row_count
+"""
+
+# Claim attempts lost to other workers before claim_file() gives up until the next poll
+CLAIM_RETRIES = 10
+
+
+def _encode_row(row):
+    """
+    Convert an import_log row to a JSON-serializable list for the state cache.
+
+    Parameters:
+        row -- Row with the IMPORT_LOG_COLUMNS
+
+    Returns:
+        list -- Row with dates as ISO strings
+    """
+    return [
+        value.isoformat() if isinstance(value, (date, datetime)) else value
+        for value in row
+    ]
+
+
+def _decode_row(row):
+    """
+    Restore an import_log row stored by _encode_row().
+
+    Parameters:
+        row -- List read from the state cache
+
+    Returns:
+        tuple -- Row with the IMPORT_LOG_COLUMNS
+    """
+    row = list(row)
+    row[1] = date.fromisoformat(row[1])
+    for index in (5, 6):
+        if row[index] is not None:
+            row[index] = datetime.fromisoformat(row[index])
+    return tuple(row)
 
 
 class DBConnectorTransform(DBConnector):
@@ -11,189 +68,138 @@ class DBConnectorTransform(DBConnector):
     including inserting Bitcoin and Gold data, logging, and table management.
 
     Methods:
-        upsert_btc_data()        -- Inserts or updates Bitcoin data
-        upsert_gold_data()       -- Inserts or updates Gold data with dynamic rate columns
+        insert_gold_ticks()      -- Appends gold snapshots to the tick staging table
+        upsert_btc_rows()        -- Inserts or updates Bitcoin rows in one batch
+        upsert_gold_rows()       -- Inserts or updates Gold rows in one batch,
+                                    with dynamic rate columns
         log_transform()          -- Logs file transformation status
         truncate_import_tables() -- Clears import tables for a fresh load
         check_rate_columns()     -- Ensures required currency rate columns exist
+        get_files_to_process()   -- Lists imported files not yet transformed
+                                    (incrementally, from the state cache)
+        get_import_file()        -- File information of one import_log row
+        get_last_run()           -- Latest transform run of an asset
+        start_run()              -- Records the start of a transform run
+        finish_run()             -- Records the end of a transform run
+        get_logged_moves()       -- Archive moves of the files logged by a run
+        enqueue_files()          -- Queues a run's files for the transform workers
+        claim_file()             -- Leases the next queued file to a worker
+        extend_leases()          -- Heartbeat extending a worker's leases
+        complete_claim()         -- Removes a processed file from the queue
+        fail_claim()             -- Marks a file that could not be transformed as failed
+        release_claims()         -- Returns a worker's leased files to the queue
+        count_queued()           -- Number of files still queued or leased
 
     Instance Variables:
         conn   -- Inherited MySQL connection object
         cursor -- Inherited DB cursor object
     """
 
-    def upsert_btc_data(
-        self, currency_id, date, open, high, low, close, volume
-    ):
+    @metrics.timed("transform.insert_gold_ticks")
+    def insert_gold_ticks(self, ticks):
         """
-        Insert or update Bitcoin data in the 'btc_data_import' table.
+        Append gold snapshots to the 'gold_tick_import' table in one batch.
 
-        This method performs an 'INSERT' operation if the record does not exist,
-        or an 'UPDATE' if the record already exists based on the currency_id and date.
+        Snapshots already staged (same currency and timestamp) are ignored.
+        The rows are not committed: they become visible together with the
+        transform_log entry of their file.
 
         Parameters:
-            currency_id -- The ID of the currency in the database.
-            date        -- The date of the Bitcoin data.
-            open        -- The opening price of Bitcoin on the given date.
-            high        -- The highest price of Bitcoin on the given date.
-            low         -- The lowest price of Bitcoin on the given date.
-            close       -- The closing price of Bitcoin on the given date.
-            volume      -- The trading volume of Bitcoin on the given date.
+            ticks -- GoldRow records; the tick prices are their fixed-point
+                     integers
 
         Returns:
-            bool -- True if the upsert operation was successful, False otherwise.
+            int -- Number of ticks sent
         """
-        try:
-            logger.debug(
-                f"Upserting BTC data for currency_id {currency_id}, date {date}"
-            )
-            query = """
-            INSERT INTO transform.btc_data_import (currency_id, date, open, high, low, close, volume)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE 
-                open = VALUES(open),
-                high = VALUES(high),
-                low = VALUES(low),
-                close = VALUES(close),
-                volume = VALUES(volume)
-            """
-            values = (currency_id, date, open, high, low, close, volume)
-
-            self.cursor.execute(query, values)
-            self.conn.commit()
-
-            if self.cursor.rowcount == 1:
-                logger.debug(
-                    f"Inserted new record for currency_id {currency_id}, date {date}"
-                )
-            elif self.cursor.rowcount == 2:
-                logger.debug(
-                    f"Updated record for currency_id {currency_id}, date {date}"
-                )
-            return True
+        if not ticks:
+            return 0
 
-        except Exception as e:
-            self.conn.rollback()
-            logger.error(f"Error in upsert_btc_data: {str(e)}", exc_info=True)
-            return False
+        query = """
+            INSERT IGNORE INTO transform.gold_tick_import (
+                currency_id, date, ts, open, high, low,
+                price, price_24k, price_18k, price_14k
+            )
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """
+        self.cursor.executemany(query, [row.tick_params() for row in ticks])
+        return len(ticks)
 
-    def upsert_gold_data(
-        self,
-        currency_id,
-        date,
-        open_price,
-        high_price,
-        low_price,
-        price,
-        price_24k,
-        price_18k,
-        price_14k,
-        rate_data,
-    ):
+    @metrics.timed("transform.upsert_btc_rows")
+    def upsert_btc_rows(self, rows):
         """
-        Insert or update Gold data in the 'gold_data_import' table.
+        Insert or update many rows of the 'btc_data_import' table in one batch.
 
-        This method performs an 'INSERT' operation if the record does not exist,
-        or an 'UPDATE' if the record already exists based on the currency_id and date.
-        It also supports adding new rate columns if the provided rate data includes new
-        currencies.
+        The rows are not committed; the caller commits them.
 
         Parameters:
-            currency_id -- The ID of the currency in the database.
-            date        -- The date of the Gold data.
-            open_price  -- The opening price of Gold on the given date.
-            high_price  -- The highest price of Gold on the given date.
-            low_price   -- The lowest price of Gold on the given date.
-            price       -- The price of Gold on the given date.
-            price_24k   -- The 24k Gold price on the given date.
-            price_18k   -- The 18k Gold price on the given date.
-            price_14k   -- The 14k Gold price on the given date.
-            rate_data   -- A dictionary containing rate data for different currencies.
+            rows -- BtcRow records
 
         Returns:
-            bool -- True if the upsert operation was successful, False otherwise.
+            int -- Number of rows sent
         """
-        try:
-            logger.debug(
-                f"Upserting gold data for currency_id {currency_id}, date {date}"
-            )
-
-            if rate_data is None:
-                rate_data = {}
+        if not rows:
+            return 0
 
-            if not self.check_rate_columns(rate_data):
-                return False
-
-            rate_columns = []
-            rate_placeholders = []
-            rate_values = []
-            rate_updates = []
-
-            for currency_code, rate_value in rate_data.items():
-                column_name = f"rate_{currency_code.lower()}"
-                rate_columns.append(column_name)
-                rate_placeholders.append("%s")
-                rate_values.append(rate_value)
-                rate_updates.append(f"{column_name} = VALUES({column_name})")
-
-            base_columns = "currency_id, date, open, high, low, price, price_24k, price_18k, price_14k"
-            base_values = "%s, %s, %s, %s, %s, %s, %s, %s, %s"
-            base_updates = """
+        query = """
+            INSERT INTO transform.btc_data_import (
+                currency_id, date, open, high, low, close, volume
+            )
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
                 open = VALUES(open),
                 high = VALUES(high),
                 low = VALUES(low),
-                price = VALUES(price),
-                price_24k = VALUES(price_24k),
-                price_18k = VALUES(price_18k),
-                price_14k = VALUES(price_14k)
-            """
-
-            if rate_columns:
-                columns = f"{base_columns}, {', '.join(rate_columns)}"
-                placeholders = f"{base_values}, {', '.join(rate_placeholders)}"
-                updates = f"{base_updates}, {', '.join(rate_updates)}"
-            else:
-                columns = base_columns
-                placeholders = base_values
-                updates = base_updates
-
-            query = f"""
-            INSERT INTO transform.gold_data_import ({columns})
-            VALUES ({placeholders})
-            ON DUPLICATE KEY UPDATE 
-                {updates}
-            """
+                close = VALUES(close),
+                volume = VALUES(volume)
+        """
+        self.cursor.executemany(query, [row.params() for row in rows])
+        return len(rows)
 
-            values = [
-                currency_id,
-                date,
-                open_price,
-                high_price,
-                low_price,
-                price,
-                price_24k,
-                price_18k,
-                price_14k,
-            ] + rate_values
+    @metrics.timed("transform.upsert_gold_rows")
+    def upsert_gold_rows(self, rows, rate_codes):
+        """
+        Insert or update many rows of the 'gold_data_import' table in one
+        batch.
 
-            self.cursor.execute(query, values)
-            self.conn.commit()
+        The rate columns must exist (see check_rate_columns()). The rows are
+        not committed; the caller commits them.
 
-            if self.cursor.rowcount == 1:
-                logger.debug(
-                    f"Inserted new record for currency_id {currency_id}, date {date}"
-                )
-            elif self.cursor.rowcount == 2:
-                logger.debug(
-                    f"Updated record for currency_id {currency_id}, date {date}"
-                )
+        Parameters:
+            rows       -- GoldRow records
+            rate_codes -- Currency codes of the rate columns to write; rates
+                          a row does not quote are written as NULL
 
-            return True
-        except Exception as e:
-            self.conn.rollback()
-            logger.error(f"Error in upsert_gold_data: {str(e)}", exc_info=True)
-            return False
+        Returns:
+            int -- Number of rows sent
+        """
+        if not rows:
+            return 0
+
+        columns = [
+            "currency_id",
+            "date",
+            "open",
+            "high",
+            "low",
+            "price",
+            "price_24k",
+            "price_18k",
+            "price_14k",
+        ] + [f"rate_{code.lower()}" for code in rate_codes]
+        updates = ", ".join(
+            f"{column} = VALUES({column})" for column in columns[2:]
+        )
+        query = f"""
+            INSERT INTO transform.gold_data_import ({", ".join(columns)})
+            VALUES ({", ".join(["%s"] * len(columns))})
+            ON DUPLICATE KEY UPDATE {updates}
+        """
+        self.cursor.executemany(
+            query, [row.params(rate_codes) for row in rows]
+        )
+        return len(rows)
 
+    @metrics.timed("transform.log_transform")
     def log_transform(
         self,
         currency_id,
@@ -201,12 +207,15 @@ class DBConnectorTransform(DBConnector):
         processed_file_name,
         row_count,
         status,
+        run_id=None,
     ):
         """
         Logs the details of the data transformation process into the 'transform_log' table.
 
         This method logs the currency ID, processed file information, number of rows
-        processed, and the transformation status (success or failure).
+        processed, and the transformation status (success or failure). The commit
+        also makes the file's staging rows visible, so a file is either fully
+        transformed and logged or not at all.
 
         Parameters:
             currency_id              -- The ID of the currency in the database.
@@ -214,6 +223,7 @@ class DBConnectorTransform(DBConnector):
             processed_file_name      -- The name of the processed file.
             row_count                -- The number of rows processed from the file.
             status                   -- The status of the transformation (either 'success' or 'error').
+            run_id                   -- transform_run the file belongs to (None outside transform runs).
 
         Returns:
             bool -- True if the log operation was successful, False otherwise.
@@ -223,8 +233,8 @@ class DBConnectorTransform(DBConnector):
                 f"Logging transform: currency_id={currency_id}, file={processed_file_name}, rows={row_count}, status={status}"
             )
             query = """
-                  INSERT INTO transform.transform_log (batch_date, currency_id, processed_directory_name ,processed_file_name, row_count, status)
-                  VALUES (%s, %s, %s, %s, %s, %s)
+                  INSERT INTO transform.transform_log (batch_date, currency_id, processed_directory_name ,processed_file_name, row_count, status, run_id)
+                  VALUES (%s, %s, %s, %s, %s, %s, %s)
                   """
             values = (
                 datetime.today(),
@@ -233,36 +243,43 @@ class DBConnectorTransform(DBConnector):
                 processed_file_name,
                 row_count,
                 status,
+                run_id,
             )
             self.cursor.execute(query, values)
             self.conn.commit()
             logger.info(f"Transform log entry created successfully")
+            return True
         except Exception as e:
             self.conn.rollback()
             logger.error(f"Error in log_transform: {str(e)}", exc_info=True)
             return False
 
-    def truncate_import_tables(self):
+    @metrics.timed("transform.truncate_import_tables")
+    def truncate_import_tables(self, assets=("btc", "gold")):
         """
-        Clears all records from the import tables ('btc_data_import' and 'gold_data_import').
+        Clears all records from the import tables ('btc_data_import', 'gold_data_import'
+        and 'gold_tick_import').
+
+        This method truncates the import tables through the storage engine to clear
+        existing records before new data is inserted.
 
-        This method executes 'TRUNCATE' commands on the import tables to clear existing
-        records before new data is inserted.
+        Parameters:
+            assets -- Assets whose import tables are cleared (default: both)
 
         Returns:
             bool -- True if the truncate operation was successful, False otherwise.
         """
-        tables = ["transform.btc_data_import", "transform.gold_data_import"]
+        tables = [
+            f"transform.{asset}_data_import"
+            for asset in ("btc", "gold")
+            if asset in assets
+        ]
+        if "gold" in assets:
+            tables.append("transform.gold_tick_import")
         logger.info(f"Truncating import tables")
 
         try:
-            self.cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
-
-            for table in tables:
-                logger.debug(f"Truncating table: {table}")
-                self.cursor.execute(f"TRUNCATE TABLE {table}")
-
-            self.cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+            self.engine.truncate(self.cursor, tables)
 
             self.conn.commit()
             logger.info("All import tables truncated successfully")
@@ -275,123 +292,222 @@ class DBConnectorTransform(DBConnector):
             )
             return False
 
-    def check_rate_columns(self, rate_data):
+    @metrics.timed("transform.check_rate_columns")
+    def check_rate_columns(self, rate_codes):
         """
         Ensures that columns for currency exchange rates (like 'rate_usd', 'rate_eur')
         exist in the 'gold_data_import' table and adds them if necessary.
 
+        Every code is validated before any column is added. Neither commits
+        nor rolls back: callers run it before staging the rows of a file, as
+        MySQL commits implicitly on ALTER TABLE, and handle its errors with
+        their own file-level rollback.
+
         Parameters:
-            rate_data -- A dictionary containing rate data for different currencies.
+            rate_codes -- Iterable of currency codes
 
         Returns:
-            bool -- True if rate columns were successfully verified/added, False if there was an error.
+            int -- Number of columns added
+
+        Raises:
+            ValueError -- If a code is not three upper-case letters
         """
-        logger.debug(
-            f"Ensuring rate columns exist for currencies: {', '.join(rate_data.keys())}"
+        rate_codes = list(rate_codes)
+        row_logger.debug(
+            "Ensuring rate columns exist for currencies: %s", ", ".join(rate_codes)
         )
 
-        try:
-            columns_added = 0
-            columns_already_exist = 0
+        for currency_code in rate_codes:
+            if not CURRENCY_CODE_RE.match(currency_code):
+                raise ValueError(f"Invalid currency code: {currency_code}")
+
+        existing_columns = set(self.get_import_columns())
+        missing = [
+            f"rate_{currency_code.lower()}"
+            for currency_code in rate_codes
+            if f"rate_{currency_code.lower()}" not in existing_columns
+        ]
+        if missing:
+            # The cached columns may predate a column added by another process
+            existing_columns = set(self.get_import_columns(refresh=True))
+            missing = [
+                column_name
+                for column_name in missing
+                if column_name not in existing_columns
+            ]
+
+        for column_name in missing:
+            logger.info(f"Adding column {column_name} to gold_data_import table")
+            self.cursor.execute(
+                f"""
+                ALTER TABLE transform.gold_data_import 
+                ADD COLUMN {column_name} DECIMAL(18,6) NULL
+            """
+            )
 
-            for currency_code in rate_data.keys():
-                if not re.match(r"^[A-Z]{3}$", currency_code):
-                    raise ValueError(f"Invalid currency code: {currency_code}")
+        if missing:
+            self.get_import_columns(refresh=True)
+            logger.info(
+                f"Rate columns summary: {len(missing)} columns added, "
+                f"{len(rate_codes) - len(missing)} columns already existed"
+            )
+        return len(missing)
 
-                column_name = f"rate_{currency_code.lower()}"
+    def _advance_pending_rows(self, entry, logs):
+        """
+        Bring cached pending import_log rows up to date by reading only the
+        log rows added after their watermarks.
 
-                self.cursor.execute(
-                    f"""
-                    SELECT COUNT(*) 
-                    FROM information_schema.columns 
-                    WHERE table_schema = 'transform' 
-                    AND table_name = 'gold_data_import' 
-                    AND column_name = '{column_name}'
-                """
-                )
+        Each log is read from its watermark row on, which must still hold the
+        file name recorded with it; together with the row counts this
+        detects rows committed out of Id order or a recreated database, in
+        which case the rows must be computed from scratch.
 
-                if self.cursor.fetchone()[0] == 0:
-                    logger.info(
-                        f"Adding column {column_name} to gold_data_import table"
-                    )
-                    self.cursor.execute(
-                        f"""
-                        ALTER TABLE transform.gold_data_import 
-                        ADD COLUMN {column_name} DECIMAL(18,6) NULL
-                    """
-                    )
-                    self.conn.commit()
-                    columns_added += 1
-                else:
-                    columns_already_exist += 1
+        Parameters:
+            entry -- (watermarks, encoded rows) read from the state cache
+            logs  -- Current 'import_log' and 'transform_log' versions
 
-            if columns_added > 0:
-                logger.info(
-                    f"Rate columns summary: {columns_added} columns added, {columns_already_exist} columns already existed"
-                )
+        Returns:
+            list or None -- Pending rows, None if they must be recomputed
+        """
+        watermarks, cached_rows = entry
+        il_max, il_count, il_name = watermarks["import_log"]
+        tl_max, tl_count, tl_name = watermarks["transform_log"]
+        if logs["import_log"][0] < il_max or logs["transform_log"][0] < tl_max:
+            return None
+
+        query = f"""
+            SELECT {IMPORT_LOG_COLUMNS}, tl.Id
+            FROM extract.import_log il
+            LEFT JOIN transform.transform_log tl
+                ON il.import_file_name = tl.processed_file_name
+            WHERE il.Id >= %s AND il.Id <= %s
+            ORDER BY il.Id
+        """
+        self.cursor.execute(query, (il_max, logs["import_log"][0]))
+        imported = self.cursor.fetchall()
+        if il_max:
+            if not imported or (imported[0][0], imported[0][4]) != (
+                il_max,
+                il_name,
+            ):
+                return None
+            imported = imported[1:]
+
+        query = """
+            SELECT Id, processed_file_name
+            FROM transform.transform_log
+            WHERE Id >= %s AND Id <= %s
+            ORDER BY Id
+        """
+        self.cursor.execute(query, (tl_max, logs["transform_log"][0]))
+        logged = self.cursor.fetchall()
+        if tl_max:
+            if not logged or tuple(logged[0]) != (tl_max, tl_name):
+                return None
+            logged = logged[1:]
+
+        if (
+            il_count + len(imported) != logs["import_log"][1]
+            or tl_count + len(logged) != logs["transform_log"][1]
+        ):
+            return None
+
+        transformed = {name for _, name in logged}
+        rows = [
+            row
+            for row in map(_decode_row, cached_rows)
+            if row[4] not in transformed
+        ]
+        rows.extend(row[:8] for row in imported if row[8] is None)
+        return rows
+
+    def _pending_import_rows(self, state):
+        """
+        Return the import_log rows of every data type not transformed yet,
+        using the state cache.
 
-            return True
+        When neither log changed since the cached rows were computed, no
+        other statement than the version check is sent. Otherwise only the
+        new log rows are read, and the full anti-join runs only when the
+        cached rows cannot be brought up to date.
 
-        except Exception as e:
-            self.conn.rollback()
-            logger.error(
-                f"Error ensuring rate columns exist: {str(e)}", exc_info=True
-            )
-            return False
+        Parameters:
+            state -- StateCache of the database
 
+        Returns:
+            list -- Rows with the IMPORT_LOG_COLUMNS, newest batch first
+        """
+        version = self.get_state_version()
+        logs = {
+            "import_log": version["import_log"],
+            "transform_log": version["transform_log"],
+        }
+        entry = state.get("pending_files")
+        if entry and entry[0] == logs:
+            logger.debug("Using pending files from the state cache")
+            return [_decode_row(row) for row in entry[1]]
+
+        rows = self._advance_pending_rows(entry, logs) if entry else None
+        if rows is None:
+            query = f"""
+                SELECT {IMPORT_LOG_COLUMNS}
+                FROM extract.import_log il
+                LEFT JOIN transform.transform_log tl
+                    ON il.import_file_name = tl.processed_file_name
+                WHERE tl.Id IS NULL
+                AND il.Id <= %s
+            """
+            self.cursor.execute(query, (logs["import_log"][0],))
+            rows = self.cursor.fetchall()
+
+        rows.sort(key=lambda row: row[1], reverse=True)
+        state.put("pending_files", logs, [_encode_row(row) for row in rows])
+        return rows
+
+    @metrics.timed("transform.get_files_to_process")
     def get_files_to_process(self, data_type):
         """
         Retrieves files to process from the import_log table based on data type,
         excluding files that have already been processed (exist in transform_log).
 
+        With the state cache enabled, the pending files of every data type
+        are kept with the import_log and transform_log watermarks they were
+        computed at, and only the log rows added since are read.
+
         Parameters:
             data_type -- Type of data ('gold' or 'bitcoin')
 
         Returns:
-            list -- List of dictionaries containing file information
+            list -- FileWorkItem of each file
         """
         try:
             logger.info(f"Retrieving {data_type} files to process from import_log (excluding already processed files)")
 
-            directory_pattern = f"%{data_type}%"
+            state = get_state_cache(self.engine, logger)
+            if state:
+                results = [
+                    row
+                    for row in self._pending_import_rows(state)
+                    if data_type in row[3].lower()
+                ]
+            else:
+                query = f"""
+            SELECT {IMPORT_LOG_COLUMNS}
+            FROM 
+                extract.import_log il
+            LEFT JOIN 
+                transform.transform_log tl ON il.import_file_name = tl.processed_file_name
+            WHERE 
+                il.import_directory_name LIKE %s
+                AND tl.Id IS NULL
+            ORDER BY 
+                il.batch_date DESC
+            """
+                self.cursor.execute(query, (f"%{data_type}%",))
+                results = self.cursor.fetchall()
 
-            query = """
-        SELECT 
-            il.Id, 
-            il.batch_date, 
-            il.currency_id, 
-            il.import_directory_name, 
-            il.import_file_name,
-            il.file_created_date,
-            il.file_last_modified_date,
-            il.row_count
-        FROM 
-            extract.import_log il
-        LEFT JOIN 
-            transform.transform_log tl ON il.import_file_name = tl.processed_file_name
-        WHERE 
-            il.import_directory_name LIKE %s
-            AND tl.Id IS NULL
-        ORDER BY 
-            il.batch_date DESC
-        """
-
-            self.cursor.execute(query, (directory_pattern,))
-            results = self.cursor.fetchall()
-
-            files_to_process = []
-            for row in results:
-                files_to_process.append({
-                    'id': row[0],
-                    'batch_date': row[1],
-                    'currency_id': row[2],
-                    'directory': row[3],
-                    'filename': row[4],
-                    'created_date': row[5],
-                    'modified_date': row[6],
-                    'row_count': row[7],
-                    'full_path': f"{row[3]}\\{row[4]}"
-                })
+            files_to_process = [FileWorkItem.from_row(row) for row in results]
 
             logger.info(f"Found {len(files_to_process)} new {data_type} files to process")
             return files_to_process
@@ -400,3 +516,420 @@ class DBConnectorTransform(DBConnector):
             logger.error(f"Error retrieving files to process: {str(e)}", exc_info=True)
             return []
 
+    @metrics.timed("transform.get_import_file")
+    def get_import_file(self, import_log_id):
+        """
+        Retrieves the file information of one import_log row.
+
+        Parameters:
+            import_log_id -- ID of the import_log row
+
+        Returns:
+            FileWorkItem or None -- File information, None if the row does not exist
+        """
+        query = """
+            SELECT
+                Id,
+                batch_date,
+                currency_id,
+                import_directory_name,
+                import_file_name,
+                file_created_date,
+                file_last_modified_date,
+                row_count
+            FROM extract.import_log
+            WHERE Id = %s
+        """
+        self.cursor.execute(query, (import_log_id,))
+        row = self.cursor.fetchone()
+        return FileWorkItem.from_row(row) if row else None
+
+    @metrics.timed("transform.get_last_run")
+    def get_last_run(self, asset):
+        """
+        Returns the latest transform run of an asset.
+
+        Parameters:
+            asset -- 'btc' or 'gold'
+
+        Returns:
+            tuple or None -- (run_id, status), or None if the asset never ran
+        """
+        query = """
+            SELECT Id, status
+            FROM transform.transform_run
+            WHERE asset = %s
+            ORDER BY Id DESC
+            LIMIT 1
+        """
+        self.cursor.execute(query, (asset,))
+        row = self.cursor.fetchone()
+        return tuple(row) if row else None
+
+    @metrics.timed("transform.start_run")
+    def start_run(self, asset):
+        """
+        Records the start of a transform run.
+
+        Parameters:
+            asset -- 'btc' or 'gold'
+
+        Returns:
+            int -- ID of the new transform_run row
+        """
+        query = """
+            INSERT INTO transform.transform_run (asset, started_at, status)
+            VALUES (%s, NOW(4), 'running')
+        """
+        self.cursor.execute(query, (asset,))
+        self.conn.commit()
+        return self.cursor.lastrowid
+
+    @metrics.timed("transform.finish_run")
+    def finish_run(self, run_id, status="completed"):
+        """
+        Records the end of a transform run.
+
+        Parameters:
+            run_id -- ID of the transform_run row
+            status -- Final status of the run
+
+        Returns:
+            bool -- True if the run was updated, False otherwise
+        """
+        try:
+            query = """
+                UPDATE transform.transform_run
+                SET status = %s, finished_at = NOW(4)
+                WHERE Id = %s
+            """
+            self.cursor.execute(query, (status, run_id))
+            self.conn.commit()
+            return True
+
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(
+                f"Error finishing transform run {run_id}: {str(e)}",
+                exc_info=True,
+            )
+            return False
+
+    @metrics.timed("transform.get_logged_moves")
+    def get_logged_moves(self, run_id):
+        """
+        Returns the archive moves of the files logged by a transform run.
+
+        Parameters:
+            run_id -- ID of the transform_run row
+
+        Returns:
+            list -- (source path, archive path) tuples
+        """
+        query = """
+            SELECT
+                il.import_directory_name,
+                il.import_file_name,
+                tl.processed_directory_name,
+                tl.processed_file_name
+            FROM transform.transform_log tl
+            JOIN extract.import_log il
+                ON il.import_file_name = tl.processed_file_name
+            WHERE tl.run_id = %s
+        """
+        self.cursor.execute(query, (run_id,))
+        return [
+            (
+                os.path.join(source_dir, source_file),
+                os.path.join(target_dir, target_file),
+            )
+            for source_dir, source_file, target_dir, target_file
+            in self.cursor.fetchall()
+        ]
+
+    @metrics.timed("transform.enqueue_files")
+    def enqueue_files(self, data_type, run_id):
+        """
+        Adds the files not transformed yet to the work queue of a run.
+
+        Files that are already queued keep their lease and are moved to the
+        given run, so a resumed run picks up the files of the interrupted one.
+        Failed files are queued again and keep their attempt count.
+
+        Parameters:
+            data_type -- Type of data ('gold' or 'bitcoin')
+            run_id    -- transform_run the files are logged under
+
+        Returns:
+            int -- Number of files queued
+        """
+        files = self.get_files_to_process(data_type)
+        if not files:
+            return 0
+
+        query = """
+            INSERT INTO transform.transform_queue (
+                import_log_id, data_type, run_id, status, attempts, enqueued_at
+            )
+            VALUES (%s, %s, %s, 'pending', 0, NOW(4))
+            ON DUPLICATE KEY UPDATE
+                run_id = VALUES(run_id),
+                status = CASE WHEN status = 'failed' THEN 'pending' ELSE status END
+        """
+        self.cursor.executemany(
+            query,
+            [(file_info.id, data_type, run_id) for file_info in files],
+        )
+        self.conn.commit()
+        return len(files)
+
+    @metrics.timed("transform.claim_file")
+    def claim_file(self, data_types, worker, lease_seconds):
+        """
+        Leases the oldest claimable queued file to a worker.
+
+        A file is claimable while it is pending or its lease has expired,
+        i.e. the worker holding it stopped sending heartbeats. Rows locked
+        by other workers are skipped (SELECT ... FOR UPDATE SKIP LOCKED), and
+        the lease is only taken if the row is still claimable, so two
+        workers never hold the same file. A claim lost to another worker
+        is retried with the next claimable file, up to CLAIM_RETRIES times.
+
+        Parameters:
+            data_types    -- Types of data to claim ('bitcoin', 'gold')
+            worker        -- Worker identifier
+            lease_seconds -- Lease duration
+
+        Returns:
+            FileWorkItem or None -- File information with queue_id, worker,
+                                    run_id and data_type set, or None if
+                                    nothing is claimable
+        """
+        placeholders = ", ".join(["%s"] * len(data_types))
+        query = f"""
+            SELECT Id, status, worker, attempts
+            FROM transform.transform_queue
+            WHERE data_type IN ({placeholders})
+            AND (status = 'pending' OR lease_until < NOW(4))
+            ORDER BY Id
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+        """
+        for _ in range(CLAIM_RETRIES):
+            try:
+                self.cursor.execute(query, tuple(data_types))
+                row = self.cursor.fetchone()
+                if row is None:
+                    self.conn.commit()
+                    return None
+
+                queue_id, status, previous_worker, attempts = row
+                self.cursor.execute(
+                    """
+                    UPDATE transform.transform_queue
+                    SET status = 'claimed',
+                        worker = %s,
+                        lease_until = DATE_ADD(NOW(4), INTERVAL %s SECOND),
+                        attempts = attempts + 1
+                    WHERE Id = %s
+                    AND (status = 'pending' OR lease_until < NOW(4))
+                    """,
+                    (worker, lease_seconds, queue_id),
+                )
+                claimed = self.cursor.rowcount == 1
+                self.conn.commit()
+
+            except Exception as e:
+                self.conn.rollback()
+                logger.error(f"Error claiming a queued file: {str(e)}", exc_info=True)
+                return None
+
+            if claimed:
+                break
+            # Taken by another worker between the SELECT and the UPDATE, try again
+        else:
+            logger.warning(
+                f"Lost {CLAIM_RETRIES} claim races in a row, retrying on the next poll"
+            )
+            return None
+
+        if status == "claimed":
+            logger.warning(
+                f"Reclaimed expired lease of queue entry {queue_id} from worker "
+                f"{previous_worker} (attempt {attempts + 1})"
+            )
+
+        self.cursor.execute(
+            """
+            SELECT
+                il.Id,
+                il.batch_date,
+                il.currency_id,
+                il.import_directory_name,
+                il.import_file_name,
+                il.file_created_date,
+                il.file_last_modified_date,
+                il.row_count,
+                q.run_id,
+                q.data_type
+            FROM transform.transform_queue q
+            JOIN extract.import_log il ON il.Id = q.import_log_id
+            WHERE q.Id = %s
+            """,
+            (queue_id,),
+        )
+        row = self.cursor.fetchone()
+        file_info = FileWorkItem.from_row(row)
+        file_info.queue_id = queue_id
+        file_info.worker = worker
+        file_info.run_id = row[8]
+        file_info.data_type = row[9]
+        file_info.attempts = attempts + 1
+        return file_info
+
+    @metrics.timed("transform.extend_leases")
+    def extend_leases(self, worker, lease_seconds):
+        """
+        Extends the leases of every file held by a worker.
+
+        Parameters:
+            worker        -- Worker identifier
+            lease_seconds -- New lease duration from now
+
+        Returns:
+            int -- Number of leases extended
+        """
+        try:
+            self.cursor.execute(
+                """
+                UPDATE transform.transform_queue
+                SET lease_until = DATE_ADD(NOW(4), INTERVAL %s SECOND)
+                WHERE worker = %s AND status = 'claimed'
+                """,
+                (lease_seconds, worker),
+            )
+            self.conn.commit()
+            return self.cursor.rowcount
+
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(
+                f"Error extending leases of worker {worker}: {str(e)}",
+                exc_info=True,
+            )
+            return 0
+
+    @metrics.timed("transform.complete_claim")
+    def complete_claim(self, queue_id, worker):
+        """
+        Removes a processed file from the queue if the worker still holds it.
+
+        Not committed: the removal commits together with the file's staging
+        rows and transform_log entry.
+
+        Parameters:
+            queue_id -- transform_queue ID of the file
+            worker   -- Worker identifier
+
+        Returns:
+            bool -- False if the lease was lost to another worker
+        """
+        self.cursor.execute(
+            """
+            DELETE FROM transform.transform_queue
+            WHERE Id = %s AND worker = %s AND status = 'claimed'
+            """,
+            (queue_id, worker),
+        )
+        return self.cursor.rowcount == 1
+
+    @metrics.timed("transform.fail_claim")
+    def fail_claim(self, queue_id, worker):
+        """
+        Marks a leased file that could not be transformed as failed.
+
+        Failed files are not claimed again in the current run; the next
+        transform run queues them again with their attempt count.
+
+        Parameters:
+            queue_id -- transform_queue ID of the file
+            worker   -- Worker identifier
+
+        Returns:
+            bool -- False if the lease was lost to another worker
+        """
+        try:
+            self.cursor.execute(
+                """
+                UPDATE transform.transform_queue
+                SET status = 'failed', worker = NULL, lease_until = NULL
+                WHERE Id = %s AND worker = %s AND status = 'claimed'
+                """,
+                (queue_id, worker),
+            )
+            self.conn.commit()
+            return self.cursor.rowcount == 1
+
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(
+                f"Error marking queue entry {queue_id} as failed: {str(e)}",
+                exc_info=True,
+            )
+            return False
+
+    @metrics.timed("transform.release_claims")
+    def release_claims(self, worker):
+        """
+        Returns the files leased by a worker to the queue, e.g. when it stops.
+
+        Parameters:
+            worker -- Worker identifier
+
+        Returns:
+            int -- Number of files released
+        """
+        try:
+            self.cursor.execute(
+                """
+                UPDATE transform.transform_queue
+                SET status = 'pending', worker = NULL, lease_until = NULL
+                WHERE worker = %s AND status = 'claimed'
+                """,
+                (worker,),
+            )
+            self.conn.commit()
+            return self.cursor.rowcount
+
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(
+                f"Error releasing leases of worker {worker}: {str(e)}",
+                exc_info=True,
+            )
+            return 0
+
+    @metrics.timed("transform.count_queued")
+    def count_queued(self, data_types):
+        """
+        Returns the number of files still queued or leased, failed files excluded.
+
+        Parameters:
+            data_types -- Types of data to count ('bitcoin', 'gold')
+
+        Returns:
+            int -- Number of queue entries
+        """
+        placeholders = ", ".join(["%s"] * len(data_types))
+        self.cursor.execute(
+            f"""
+            SELECT COUNT(*)
+            FROM transform.transform_queue
+            WHERE data_type IN ({placeholders})
+            AND status <> 'failed'
+            """,
+            tuple(data_types),
+        )
+        count = self.cursor.fetchone()[0]
+        self.conn.commit()
+        return count
@@ -1,12 +1,117 @@
 import os
 from datetime import datetime
+from itertools import groupby
 
-from etl.transform.database_transform import DBConnectorTransform
+from etl.commons.metrics import metrics
+from etl.commons.records import GoldRow, intern_rate_codes, to_fixed
+from etl.transform.database_transform import CURRENCY_CODE_RE, DBConnectorTransform
 from etl.transform.utils_transform import (
+    archive_path,
+    batched,
     move_file,
     load_json_file,
 )
-from etl.transform.logger_transform import logger
+from etl.transform.logger_transform import logger, row_logger
+
+
+# XAU price fields of a payload, in the column order of GoldRow
+PRICE_FIELDS = ("open", "high", "low", "price", "price_24k", "price_18k", "price_14k")
+
+
+def parse_gold_payload(data_obj, source):
+    """
+    Extract one snapshot from a Gold API payload.
+
+    Used by the transform and by the reprocessing of archived files, so both
+    apply the same parsing rules. Invalid payloads are logged and skipped.
+
+    Parameters:
+        data_obj -- API response object (dict or LazyObject view)
+        source   -- Description of where the payload came from, used in log messages
+
+    Returns:
+        tuple or None -- (base currency code, GoldRow with no currency_id),
+                         None for an invalid payload
+    """
+    if data_obj.get("status") != "success" or "data" not in data_obj:
+        logger.warning(f"Invalid data format in {source}")
+        return None
+
+    data = data_obj["data"]
+
+    base_currency = data.get("base_currency", "")
+    if not base_currency:
+        logger.warning(f"No base currency found in {source}")
+        return None
+
+    timestamp_ms = data.get("timestamp")
+    if not timestamp_ms:
+        logger.warning(f"No timestamp found in {source}")
+        return None
+
+    date = datetime.fromtimestamp(timestamp_ms / 1000).date()
+    row_logger.debug("Processing data for date: %s", date)
+
+    metal_prices = data.get("metal_prices", {}).get("XAU", {})
+    if not metal_prices:
+        logger.warning(f"No XAU metal prices found in {source}")
+        return None
+
+    currency_rates = data.get("currency_rates", {})
+    if not currency_rates:
+        logger.warning(f"No currency rates found in {source}")
+        return None
+
+    try:
+        prices = [to_fixed(metal_prices.get(field)) for field in PRICE_FIELDS]
+        if None in prices:
+            raise ValueError("missing XAU price")
+    except Exception as e:
+        logger.error(f"Error processing gold data: {str(e)}", exc_info=True)
+        return None
+
+    rate_data = {}
+    for currency_code, rate_value in currency_rates.items():
+        if not CURRENCY_CODE_RE.match(currency_code.upper()):
+            logger.warning(f"Invalid currency code in rates: {currency_code}")
+            continue
+        try:
+            rate = to_fixed(rate_value)
+        except (ValueError, TypeError):
+            rate = None
+        if rate is not None:
+            rate_data[currency_code.upper()] = rate
+        else:
+            logger.warning(
+                f"Invalid rate value for {currency_code}: {rate_value}"
+            )
+    row_logger.debug("Found %d currency rates", len(rate_data))
+
+    return base_currency, GoldRow(
+        None,
+        date,
+        int(timestamp_ms),
+        *prices,
+        intern_rate_codes(tuple(rate_data)),
+        tuple(rate_data.values()),
+    )
+
+
+def payload_rate_codes(data_obj):
+    """
+    Return the valid currency codes quoted by a Gold API payload, reading
+    only the keys of its rates.
+
+    Parameters:
+        data_obj -- API response object (dict or LazyObject view)
+
+    Returns:
+        list -- Upper-case currency codes
+    """
+    if data_obj.get("status") != "success" or "data" not in data_obj:
+        return []
+    codes = (code.upper() for code in data_obj["data"].get("currency_rates", {}))
+    return [code for code in codes if CURRENCY_CODE_RE.match(code)]
 
 
 class GoldTransform:
@@ -15,42 +120,121 @@ class GoldTransform:
     and loads them into the database.
 
     Methods:
-        __init__()   -- Initializes with a DB connection
-        transform()  -- Processes and loads data from a single file
-        call()       -- Triggers processing of all files based on import_log
+        __init__()       -- Initializes with a DB connection
+        transform_data() -- Processes and loads already-parsed API payloads
+        transform()      -- Processes and loads data from a single file
+        call()           -- Triggers processing of all files based on import_log
 
     Instance Variables:
         conn      -- Database connection object (DBConnectorTransform)
+        run_id    -- transform_run the processed files are logged under
 
     """
 
-    def __init__(self, conn: DBConnectorTransform):
+    def __init__(self, conn: DBConnectorTransform, run_id=None):
         """
         Initialize the transformer with a database connection.
 
         Parameters:
-            conn -- DBConnectorTransform instance for DB operations
+            conn   -- DBConnectorTransform instance for DB operations
+            run_id -- transform_run ID written to transform_log (default: None)
         """
         self.conn = conn
+        self.run_id = run_id
+
+    def transform_data(self, data_list, currency_id, source):
+        """
+        Transform already-parsed Gold API payloads and upsert them into the staging table.
+
+        Every snapshot is also kept as a tick, appended to gold_tick_import.
+        The payloads are read twice: first for the currency codes of their
+        rates, whose columns are added before the first upsert as MySQL
+        commits implicitly on ALTER TABLE, then for the snapshots, which are
+        upserted in batches of TRANSFORM_BATCH_ROWS. The rows are left
+        uncommitted; the caller commits them.
+
+        Parameters:
+            data_list   -- Re-iterable of API response objects (list, or
+                           JsonFile yielding LazyObject views)
+            currency_id -- Currency ID from import_log (looked up from the payload if None)
+            source      -- Description of where the payloads came from, used in log messages
 
+        Returns:
+            tuple -- (currency_id, number of processed data points)
+        """
+        processed_count = 0
+
+        self.conn.check_rate_columns(
+            dict.fromkeys(
+                code for data_obj in data_list for code in payload_rate_codes(data_obj)
+            )
+        )
+
+        for batch in batched(self._snapshots(data_list, currency_id, source)):
+            currency_id = batch[-1].currency_id
+            # Consecutive snapshots quoting the same currencies are upserted
+            # together. Batches keep the payload order, so the last snapshot
+            # of a day still wins.
+            for rate_codes, group in groupby(batch, key=lambda row: row.rate_codes):
+                processed_count += self.conn.upsert_gold_rows(list(group), rate_codes)
+            self.conn.insert_gold_ticks(batch)
+
+        return currency_id, processed_count
+
+    def _snapshots(self, data_list, currency_id, source):
+        """
+        Yield the snapshot of every valid payload with its currency set.
+
+        Parameters:
+            data_list   -- Iterable of API response objects
+            currency_id -- Currency ID from import_log (looked up from the payload if None)
+            source      -- Description of where the payloads came from, used in log messages
+
+        Returns:
+            generator -- GoldRow records
+        """
+        for data_obj in data_list:
+            snapshot = parse_gold_payload(data_obj, source)
+            if snapshot is None:
+                continue
+            base_currency, row = snapshot
+
+            logger.debug(
+                f"Processing data for base currency: {base_currency}"
+            )
+
+            if not currency_id:
+                currency_id = self.conn.get_currency_by_code(base_currency)
+
+            if not currency_id:
+                logger.warning(
+                    f"No currency ID found for code: {base_currency}"
+                )
+                continue
+
+            row.currency_id = currency_id
+            yield row
+
+    @metrics.timed("transform.gold_file")
     def transform(self, file_info):
         """
         Process a single Gold data file, transform its contents, and insert into DB.
 
         Parameters:
-            file_info -- Dictionary containing file information from import_log
+            file_info -- FileWorkItem of the file (with queue_id and worker
+                         set when leased from the queue)
 
         Returns:
             None
         """
-        file_path = file_info['full_path']
-        import_log_id = file_info['id']
+        file_path = file_info.full_path
+        import_log_id = file_info.id
 
         logger.info(f"Processing gold file: {file_path} (import_log_id: {import_log_id})")
         data_type = "gold"
         status = "error"
         processed_count = 0
-        currency_id = file_info['currency_id']
+        currency_id = file_info.currency_id
 
         try:
             data_list = load_json_file(file_path)
@@ -58,104 +242,12 @@ class GoldTransform:
             if data_list is None:
                 return
 
-            for data_obj in data_list:
-                if (
-                        data_obj.get("status") != "success"
-                        or "data" not in data_obj
-                ):
-                    logger.warning(f"Invalid data format in file: {file_path}")
-                    continue
-
-                data = data_obj["data"]
-
-                base_currency = data.get("base_currency", "")
-                if not base_currency:
-                    logger.warning(
-                        f"No base currency found in file: {file_path}"
-                    )
-                    continue
-
-                logger.debug(
-                    f"Processing data for base currency: {base_currency}"
+            with data_list:
+                currency_id, processed_count = self.transform_data(
+                    data_list, currency_id, file_path
                 )
 
-                if not currency_id:
-                    currency_id = self.conn.get_currency_by_code(base_currency)
-
-                if not currency_id:
-                    logger.warning(
-                        f"No currency ID found for code: {base_currency}"
-                    )
-                    continue
-
-                timestamp_ms = data.get("timestamp")
-                if not timestamp_ms:
-                    logger.warning(f"No timestamp found in file: {file_path}")
-                    continue
-
-                date = datetime.fromtimestamp(timestamp_ms / 1000).date()
-                logger.debug(f"Processing data for date: {date}")
-
-                metal_prices = data.get("metal_prices", {}).get("XAU", {})
-                if not metal_prices:
-                    logger.warning(
-                        f"No XAU metal prices found in file: {file_path}"
-                    )
-                    continue
-
-                currency_rates = data.get("currency_rates", {})
-                if not currency_rates:
-                    logger.warning(
-                        f"No currency rates found in file: {file_path}"
-                    )
-                    continue
-
-                try:
-                    open_price = float(metal_prices.get("open"))
-                    high_price = float(metal_prices.get("high"))
-                    low_price = float(metal_prices.get("low"))
-                    price = float(metal_prices.get("price"))
-                    price_24k = float(metal_prices.get("price_24k"))
-                    price_18k = float(metal_prices.get("price_18k"))
-                    price_14k = float(metal_prices.get("price_14k"))
-
-                    rate_data = {}
-                    for currency_code, rate_value in currency_rates.items():
-                        try:
-                            rate_data[currency_code.upper()] = float(
-                                rate_value
-                            )
-                        except (ValueError, TypeError):
-                            logger.warning(
-                                f"Invalid rate value for {currency_code}: {rate_value}"
-                            )
-
-                    logger.debug(f"Found {len(rate_data)} currency rates")
-
-                    logger.debug(
-                        f"Upserting gold data for currency_id {currency_id}, date {date}"
-                    )
-                    result = self.conn.upsert_gold_data(
-                        currency_id,
-                        date,
-                        open_price,
-                        high_price,
-                        low_price,
-                        price,
-                        price_24k,
-                        price_18k,
-                        price_14k,
-                        rate_data,
-                    )
-
-                    if result:
-                        processed_count += 1
-
-                except Exception as e:
-                    logger.error(
-                        f"Error processing gold data: {str(e)}", exc_info=True
-                    )
-
+            metrics.add_rows(processed_count)
             if processed_count > 0:
                 status = "processed"
                 logger.info(
@@ -169,17 +261,36 @@ class GoldTransform:
                 f"Error processing file {file_path}: {str(e)}", exc_info=True
             )
             status = "error"
-
-        new_file_path = move_file(status, data_type, file_path)
+            processed_count = 0
+            # Discard the rows staged from the failed file
+            self.conn.conn.rollback()
+
+        # The staging rows and the log entry commit together; the file is
+        # moved only afterwards, and an interrupted move is completed by the
+        # next run from transform_log.
+        new_file_path = archive_path(status, data_type, file_path)
+
+        # A file leased from the work queue leaves it in the same commit,
+        # unless its lease expired and another worker has taken it over.
+        if file_info.queue_id is not None and not self.conn.complete_claim(
+            file_info.queue_id, file_info.worker
+        ):
+            self.conn.conn.rollback()
+            logger.warning(
+                f"Lease on {file_path} was lost to another worker, discarding its rows"
+            )
+            return
 
         logger.info(f"Logging transformation for file {file_path}")
-        self.conn.log_transform(
+        if self.conn.log_transform(
             currency_id,
             os.path.dirname(new_file_path),
             os.path.basename(new_file_path),
             processed_count,
-            status
-        )
+            status,
+            self.run_id,
+        ):
+            move_file(status, data_type, file_path)
 
     def call(self):
         """
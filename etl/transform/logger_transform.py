@@ -1,3 +1,4 @@
-from etl.commons.logger import setup_logger
+from etl.commons.logger import lazy_logger
 
-logger = setup_logger('transform')
+logger = lazy_logger('transform')
+row_logger = lazy_logger('transform', rows=True)
@@ -1,35 +1,141 @@
-from etl.transform.btc_transform import BitcoinTransform
-from etl.transform.gold_transform import GoldTransform
+import os
+import signal
+
+from etl.commons.metrics import metrics
+from etl.commons.stages import ASSETS
 from etl.transform.database_transform import DBConnectorTransform
 from etl.transform.logger_transform import logger
+from etl.transform.utils_transform import recover_pending_moves
+from etl.transform.worker_transform import DATA_TYPES, TransformWorker
+
+
+def resume_or_start_runs(conn, assets):
+    """
+    Open a transform run per asset, resuming interrupted ones.
 
+    An asset whose last run is still 'running' was interrupted: the run
+    continues with the files it has not logged yet. After a 'completed' run
+    that was never loaded, a new run starts but keeps the staging rows.
+    Only assets whose last run was loaded (or that never ran) start from an
+    empty import table. Archive moves left pending by the previous run are
+    completed first.
 
-def transform():
+    Parameters:
+        conn   -- Connected DBConnectorTransform
+        assets -- Assets to transform
+
+    Returns:
+        dict -- asset -> transform_run ID
+    """
+    run_ids = {}
+    fresh = []
+
+    for asset in assets:
+        last_run = conn.get_last_run(asset)
+        if last_run is None:
+            run_ids[asset] = conn.start_run(asset)
+            fresh.append(asset)
+            continue
+
+        run_id, status = last_run
+        recovered = recover_pending_moves(conn.get_logged_moves(run_id))
+        if recovered:
+            logger.info(f"Completed {recovered} pending file moves of run {run_id}")
+
+        if status == "running":
+            logger.info(f"Resuming interrupted {asset} transform run {run_id}")
+            run_ids[asset] = run_id
+            continue
+
+        run_ids[asset] = conn.start_run(asset)
+        if status == "loaded":
+            fresh.append(asset)
+        else:
+            logger.info(
+                f"Keeping {asset} staging rows of run {run_id}, which were not loaded"
+            )
+
+    if fresh:
+        conn.truncate_import_tables(fresh)
+
+    return run_ids
+
+
+@metrics.timed("transform")
+def transform(assets=ASSETS):
     """
      Run the full data transformation process.
 
-     This function connects to the database, processes all Bitcoin and Gold files,
-     logs each transformation, and closes the connection.
+     This function connects to the database, queues all new Bitcoin and Gold files
+     in transform.transform_queue and drains the queue as a transform worker, together
+     with any workers started with 'python -m run worker'. Each file is committed
+     with its transform_log entry, so a run that dies is resumed by the next one
+     without redoing the files it completed. The runs are completed once every
+     queued file has been processed, by this process or another worker.
+
+     Parameters:
+         assets -- Assets to transform, 'btc' and/or 'gold' (default: both)
     """
     logger.info("Starting Transform process")
 
-    logger.info("Connecting to MySQL database")
     conn = DBConnectorTransform(logger=logger)
+    logger.info(f"Connecting to {conn.engine.name} database")
 
     conn.connect()
-    conn.truncate_import_tables()
+    run_ids = resume_or_start_runs(conn, assets)
 
-    logger.info("Starting Bitcoin data transformation")
-    btc = BitcoinTransform(conn)
-    btc.call()
-    logger.info("Bitcoin data transformation complete")
+    for asset in assets:
+        queued = conn.enqueue_files(DATA_TYPES[asset], run_ids[asset])
+        logger.info(f"Queued {queued} {asset} files for transform run {run_ids[asset]}")
 
-    logger.info("Starting Gold data transformation")
-    gold = GoldTransform(conn)
-    gold.call()
-    logger.info("Gold data transformation complete")
+    TransformWorker(conn).drain([DATA_TYPES[asset] for asset in assets])
+
+    for asset in assets:
+        conn.finish_run(run_ids[asset])
 
     conn.disconnect()
-    logger.info("Connection to MySQL database closed")
+    logger.info(f"Connection to {conn.engine.name} database closed")
 
     logger.info("Transform process completed successfully")
+
+
+@metrics.timed("worker")
+def work(assets=ASSETS):
+    """
+    Run a transform worker helping a transform run drain its queue.
+
+    Workers can be started on any host sharing the database and the data
+    directory. A worker exits once the queue has stayed empty for
+    TRANSFORM_WORKER_IDLE seconds (default 60). SIGTERM and SIGINT stop it
+    after the current file; a second signal aborts.
+
+    Parameters:
+        assets -- Assets whose files the worker processes (default: both)
+    """
+    logger.info("Starting transform worker")
+
+    conn = DBConnectorTransform(logger=logger)
+    conn.connect()
+    worker = TransformWorker(conn)
+
+    def request_stop(signum, frame):
+        if worker.stop_event.is_set():
+            logger.warning("Second stop signal received, aborting")
+            raise KeyboardInterrupt
+        logger.info(
+            f"Received {signal.Signals(signum).name}, stopping after the current file"
+        )
+        worker.stop()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    try:
+        worker.drain(
+            [DATA_TYPES[asset] for asset in assets],
+            idle_timeout=float(os.getenv("TRANSFORM_WORKER_IDLE", "60")),
+        )
+    finally:
+        conn.disconnect()
+
+    logger.info("Transform worker stopped")
@@ -3,9 +3,21 @@ CREATE SCHEMA transform;
 USE transform;
 
 
+DROP TABLE IF EXISTS transform_queue;
 DROP TABLE IF EXISTS transform_log;
+DROP TABLE IF EXISTS transform_run;
 DROP TABLE IF EXISTS btc_data_import;
 DROP TABLE IF EXISTS gold_data_import;
+DROP TABLE IF EXISTS gold_tick_import;
+
+
+CREATE TABLE transform_run(
+    Id INT AUTO_INCREMENT PRIMARY KEY,
+    asset VARCHAR(10) NOT NULL,
+    started_at TIMESTAMP(4) NOT NULL,
+    finished_at TIMESTAMP(4) NULL,
+    status VARCHAR(15) NOT NULL
+);
 
 
 CREATE TABLE transform_log(
@@ -16,7 +28,24 @@ CREATE TABLE transform_log(
     processed_file_name VARCHAR(50) NOT NULL UNIQUE ,
     row_count INT,
     status VARCHAR(15),
-    FOREIGN KEY (currency_id) REFERENCES warehouse.dim_currency(Id) ON DELETE SET NULL
+    run_id INT NULL,
+    FOREIGN KEY (currency_id) REFERENCES warehouse.dim_currency(Id) ON DELETE SET NULL,
+    FOREIGN KEY (run_id) REFERENCES transform_run(Id) ON DELETE SET NULL
+);
+
+
+CREATE TABLE transform_queue(
+    Id INT AUTO_INCREMENT PRIMARY KEY,
+    import_log_id INT NOT NULL,
+    data_type VARCHAR(10) NOT NULL,
+    run_id INT NULL,
+    status VARCHAR(15) NOT NULL,
+    worker VARCHAR(100) NULL,
+    lease_until TIMESTAMP(4) NULL,
+    attempts INT NOT NULL,
+    enqueued_at TIMESTAMP(4) NOT NULL,
+    FOREIGN KEY (run_id) REFERENCES transform_run(Id) ON DELETE SET NULL,
+    UNIQUE INDEX idx_import_log (import_log_id)
 );
 
 
@@ -50,4 +79,20 @@ CREATE TABLE gold_data_import(
     rate_gbp DECIMAL(6,5),
     FOREIGN KEY (currency_id) REFERENCES warehouse.dim_currency(Id) ON DELETE SET NULL,
     UNIQUE INDEX idx_currency_DATE (currency_id, date)
-);
\ No newline at end of file
+);
+
+
+# Gold snapshots of the current run, in the fact_gold_tick representation
+CREATE TABLE gold_tick_import(
+    currency_id INT NOT NULL,
+    date DATE NOT NULL,
+    ts BIGINT NOT NULL,
+    open BIGINT NOT NULL,
+    high BIGINT NOT NULL,
+    low BIGINT NOT NULL,
+    price BIGINT NOT NULL,
+    price_24k BIGINT,
+    price_18k BIGINT,
+    price_14k BIGINT,
+    PRIMARY KEY (currency_id, date, ts)
+);
@@ -0,0 +1,286 @@
+import json
+import mmap
+import os
+import re
+from collections.abc import Mapping
+
+
+# Objects larger than this many bytes are returned as LazyObject views over
+# the file instead of being parsed, so a long time series is decoded one
+# entry at a time.
+LAZY_OBJECT_BYTES = 64 * 1024
+
+_WHITESPACE = re.compile(rb"[ \t\r\n]*")
+_STRING_PATTERN = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+_STRING = re.compile(_STRING_PATTERN)
+_SCALAR = re.compile(rb"[^,:\]}\s]+")
+# Containers without nested containers, e.g. one time series entry
+_FLAT_PATTERN = (
+    rb'\{(?:[^{}\[\]"]|' + _STRING_PATTERN + rb")*\}"
+    + rb'|\[(?:[^{}\[\]"]|' + _STRING_PATTERN + rb")*\]"
+)
+_FLAT = re.compile(_FLAT_PATTERN)
+# Strings and flat containers are matched whole, so brackets inside strings
+# are ignored and only the brackets of nested containers are counted.
+_TOKEN = re.compile(
+    _STRING_PATTERN + rb"|" + _FLAT_PATTERN + rb"|[\[\]{}]"
+)
+
+_OPENING = (ord("{"), ord("["))
+_CLOSING = (ord("}"), ord("]"))
+
+
+def _skip(buf, pos):
+    return _WHITESPACE.match(buf, pos).end()
+
+
+def _expect(buf, pos, char):
+    pos = _skip(buf, pos)
+    if buf[pos:pos + 1] != char:
+        raise ValueError(f"Expected {char.decode()!r} at offset {pos}")
+    return _skip(buf, pos + 1)
+
+
+def _value_end(buf, pos, end):
+    """
+    Return the offset just past the JSON value starting at pos.
+
+    Containers are skipped by counting the brackets of nested containers,
+    without decoding anything.
+    """
+    first = buf[pos:pos + 1]
+
+    if first in (b"{", b"["):
+        flat = _FLAT.match(buf, pos, end)
+        if flat is not None:
+            return flat.end()
+
+        depth = 0
+        for match in _TOKEN.finditer(buf, pos, end):
+            if match.end() - match.start() > 1:
+                continue
+            char = buf[match.start()]
+            if char in _OPENING:
+                depth += 1
+            elif char in _CLOSING:
+                depth -= 1
+                if depth == 0:
+                    return match.end()
+        raise ValueError(f"Unterminated value at offset {pos}")
+
+    pattern = _STRING if first == b'"' else _SCALAR
+    match = pattern.match(buf, pos, end)
+    if match is None:
+        raise ValueError(f"Invalid value at offset {pos}")
+    return match.end()
+
+
+def _members(buf, start, end):
+    """
+    Yield (key_start, key_end, value_start, value_end) of each member of the
+    object starting at start.
+    """
+    pos = _skip(buf, start + 1)
+    if buf[pos:pos + 1] == b"}":
+        return
+
+    while True:
+        key = _STRING.match(buf, pos, end)
+        if key is None:
+            raise ValueError(f"Expected a key at offset {pos}")
+        pos = _expect(buf, key.end(), b":")
+        value_end = _value_end(buf, pos, end)
+        yield key.start(), key.end(), pos, value_end
+
+        pos = _skip(buf, value_end)
+        char = buf[pos:pos + 1]
+        if char == b"}":
+            return
+        if char != b",":
+            raise ValueError(f"Expected ',' or '}}' at offset {pos}")
+        pos = _skip(buf, pos + 1)
+
+
+def _elements(buf, start, end):
+    """
+    Yield (value_start, value_end) of each element of the array starting at
+    start.
+    """
+    pos = _skip(buf, start + 1)
+    if buf[pos:pos + 1] == b"]":
+        return
+
+    while True:
+        value_end = _value_end(buf, pos, end)
+        yield pos, value_end
+
+        pos = _skip(buf, value_end)
+        char = buf[pos:pos + 1]
+        if char == b"]":
+            return
+        if char != b",":
+            raise ValueError(f"Expected ',' or ']' at offset {pos}")
+        pos = _skip(buf, pos + 1)
+
+
+def _decode(buf, start, end):
+    if buf[start:start + 1] == b"{" and end - start > LAZY_OBJECT_BYTES:
+        return LazyObject(buf, start, end)
+    return json.loads(buf[start:end].decode())
+
+
+class LazyObject(Mapping):
+    """
+    Read-only mapping over a JSON object inside a memory-mapped file.
+
+    Members are located by scanning the object's bytes and decoded only when
+    accessed; nested objects above LAZY_OBJECT_BYTES are returned as
+    LazyObject views themselves. items() and values() stream the members,
+    so iterating a large time series keeps one entry in memory at a time.
+
+    Methods:
+        __getitem__() -- Decode the value of a key
+        __iter__()    -- Iterate over the keys
+        __len__()     -- Count the members
+        items()       -- Stream (key, value) pairs
+        values()      -- Stream values
+
+    Instance Variables:
+        start -- Offset of the object's opening brace
+        end   -- Offset just past the object's closing brace
+    """
+
+    def __init__(self, buf, start, end):
+        """
+        Initialize a view over buf[start:end].
+
+        Parameters:
+            buf   -- mmap (or bytes) holding the document
+            start -- Offset of the object's opening brace
+            end   -- Offset just past the object's closing brace
+        """
+        self._buf = buf
+        self.start = start
+        self.end = end
+
+    def _key(self, key_start, key_end):
+        key = self._buf[key_start + 1:key_end - 1]
+        if b"\\" in key:
+            return json.loads(self._buf[key_start:key_end].decode())
+        return key.decode()
+
+    def __getitem__(self, key):
+        for key_start, key_end, value_start, value_end in _members(
+            self._buf, self.start, self.end
+        ):
+            if self._key(key_start, key_end) == key:
+                return _decode(self._buf, value_start, value_end)
+        raise KeyError(key)
+
+    def __iter__(self):
+        for key_start, key_end, _, _ in _members(
+            self._buf, self.start, self.end
+        ):
+            yield self._key(key_start, key_end)
+
+    def __len__(self):
+        return sum(1 for _ in _members(self._buf, self.start, self.end))
+
+    def __bool__(self):
+        return self._buf[_skip(self._buf, self.start + 1)] != ord("}")
+
+    def items(self):
+        for key_start, key_end, value_start, value_end in _members(
+            self._buf, self.start, self.end
+        ):
+            yield (
+                self._key(key_start, key_end),
+                _decode(self._buf, value_start, value_end),
+            )
+
+    def values(self):
+        for _, _, value_start, value_end in _members(
+            self._buf, self.start, self.end
+        ):
+            yield _decode(self._buf, value_start, value_end)
+
+
+class JsonFile:
+    """
+    Memory-mapped JSON file yielding its top-level objects one at a time.
+
+    A file holding a JSON array yields each element, a file holding a single
+    object yields that object. The format is detected from the first
+    non-whitespace byte of the mapping, and values are decoded only as they
+    are reached, so memory use does not grow with the file size.
+
+    LazyObject views returned while iterating read from the mapping and must
+    not be used after close().
+
+    Methods:
+        __init__()  -- Maps the file and detects its format
+        __iter__()  -- Yield the top-level objects
+        close()     -- Unmap and close the file
+
+    Instance Variables:
+        file_path -- Path of the mapped file
+        size      -- File size in bytes
+        is_array  -- True if the file holds a JSON array
+    """
+
+    def __init__(self, file_path):
+        """
+        Map a JSON file.
+
+        Parameters:
+            file_path -- Path to the JSON file
+
+        Raises:
+            ValueError -- If the file is empty or not a JSON object or array
+        """
+        self.file_path = file_path
+        self._file = open(file_path, "rb")
+        self._buf = None
+
+        try:
+            self.size = os.fstat(self._file.fileno()).st_size
+            if not self.size:
+                raise ValueError("File is empty")
+            self._buf = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+
+            self._start = _skip(self._buf, 0)
+            first = self._buf[self._start:self._start + 1]
+            if first not in (b"[", b"{"):
+                raise ValueError("File does not hold a JSON object or array")
+            self.is_array = first == b"["
+        except Exception:
+            self.close()
+            raise
+
+    def __iter__(self):
+        if self.is_array:
+            for start, end in _elements(self._buf, self._start, self.size):
+                yield _decode(self._buf, start, end)
+        else:
+            end = _value_end(self._buf, self._start, self.size)
+            yield _decode(self._buf, self._start, end)
+
+    def close(self):
+        """
+        Unmap and close the file.
+
+        Returns:
+            None
+        """
+        if self._buf is not None:
+            self._buf.close()
+            self._buf = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
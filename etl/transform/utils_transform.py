@@ -1,10 +1,51 @@
-import json
 import os
 import shutil
+from itertools import islice
 
+from etl.commons.metrics import metrics
+from etl.transform.stream_transform import JsonFile
 from etl.transform.logger_transform import logger
 
 
+# Rows per executemany() batch; the rows of a file are streamed to staging
+# in batches of this size, so transform memory does not grow with the file
+TRANSFORM_BATCH_ROWS = int(os.getenv("TRANSFORM_BATCH_ROWS", "1000"))
+
+
+def batched(rows, size=TRANSFORM_BATCH_ROWS):
+    """
+    Split an iterable into lists of at most size items, consuming it lazily.
+
+    Parameters:
+        rows -- Iterable of rows
+        size -- Maximum number of rows per list
+
+    Returns:
+        generator -- Lists of rows, in order
+    """
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def archive_path(status, data_type, file_path):
+    """
+    Return the path a file is moved to once transformed.
+
+    Parameters:
+        status    -- 'processed' or 'error'.
+        data_type -- Type of data, e.g., 'bitcoin' or 'gold'.
+        file_path -- Original path of the file.
+
+    Returns:
+        str -- Path of the file in the status directory.
+    """
+    return os.path.join(
+        os.path.normpath("data"), status, data_type, os.path.basename(file_path)
+    )
+
+
+@metrics.timed("transform.move_file")
 def move_file(status, data_type, file_path):
     """
     Move a file to the corresponding status directory.
@@ -21,18 +62,12 @@ def move_file(status, data_type, file_path):
         f"Moving file {file_path} to {status} directory for {data_type}"
     )
     try:
-        base_dir = os.path.normpath("data")
-        logger.debug(f"Base directory: {base_dir}")
-
-        target_dir = os.path.join(base_dir, status, data_type)
-        logger.debug(f"Target directory: {target_dir}")
+        new_file_path = archive_path(status, data_type, file_path)
 
+        target_dir = os.path.dirname(new_file_path)
         os.makedirs(target_dir, exist_ok=True)
         logger.debug(f"Ensured target directory exists: {target_dir}")
 
-        filename = os.path.basename(file_path)
-        new_file_path = os.path.join(target_dir, filename)
-
         logger.debug(f"Moving from {file_path} to {new_file_path}")
         shutil.move(file_path, new_file_path)
 
@@ -46,6 +81,38 @@ def move_file(status, data_type, file_path):
         return file_path
 
 
+@metrics.timed("transform.recover_pending_moves")
+def recover_pending_moves(moves):
+    """
+    Finish archive moves that were interrupted after their transform_log commit.
+
+    A file is logged before it is moved, so a crash in between leaves it in
+    the import directory while transform_log already points to the archive.
+
+    Parameters:
+        moves -- (source path, archive path) tuples of logged files.
+
+    Returns:
+        int -- Number of files moved.
+    """
+    recovered = 0
+    for source_path, target_path in moves:
+        if os.path.exists(target_path) or not os.path.exists(source_path):
+            continue
+
+        logger.warning(f"Completing interrupted move of {source_path}")
+        try:
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            shutil.move(source_path, target_path)
+            recovered += 1
+        except Exception as e:
+            logger.error(
+                f"Error moving file {source_path}: {str(e)}", exc_info=True
+            )
+
+    return recovered
+
+
 def process_file(data_type, directory, transform_func):
     """
     Process all JSON files in the given directory using a transform function.
@@ -74,29 +141,29 @@ def process_file(data_type, directory, transform_func):
     logger.info(f"{data_type} data Transform process completed")
 
 
+@metrics.timed("transform.read_file")
 def load_json_file(file_path):
     """
-    Load a JSON file and return its content as a list of objects.
+    Open a JSON file for streaming.
+
+    The file is memory-mapped and its format detected without reading it
+    into memory; objects are decoded only as the returned JsonFile is
+    iterated. The caller closes it once the file has been processed.
 
     Parameters:
         file_path -- Path to the JSON file.
 
     Returns:
-        list or None -- List of JSON objects, or None on failure.
+        JsonFile or None -- Iterable of the file's JSON objects, or None on failure.
     """
     try:
-        with open(file_path, "r") as f:
-            file_content = f.read()
-            logger.debug("File content loaded")
-
-            if file_content.strip().startswith("["):
-                data_list = json.loads(file_content)
-                logger.debug(f"Loaded JSON array with {len(data_list)} items")
-            else:
-                data_list = [json.loads(file_content)]
-                logger.debug("Loaded single JSON object")
-
-            return data_list
+        json_file = JsonFile(file_path)
+        metrics.add_bytes_read(json_file.size)
+        logger.debug(
+            f"Mapped {json_file.size} bytes, "
+            f"{'JSON array' if json_file.is_array else 'single JSON object'}"
+        )
+        return json_file
     except Exception as e:
         logger.error(f"Error loading JSON file {file_path}: {str(e)}")
         return None
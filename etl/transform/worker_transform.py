@@ -0,0 +1,217 @@
+import os
+import socket
+import threading
+import uuid
+
+from etl.transform.btc_transform import BitcoinTransform
+from etl.transform.database_transform import DBConnectorTransform
+from etl.transform.gold_transform import GoldTransform
+from etl.transform.logger_transform import logger
+from etl.transform.utils_transform import archive_path, move_file
+
+
+# Asset -> data type of its files in import_log and transform_queue
+DATA_TYPES = {"btc": "bitcoin", "gold": "gold"}
+
+
+class TransformWorker:
+    """
+    Drains transform.transform_queue, one leased file at a time.
+
+    Any number of workers, in one process or on several hosts, can drain the
+    same queue: a file is leased to one worker at a time, and a heartbeat
+    thread keeps the worker's leases alive while it runs. The lease of a
+    worker that dies expires after TRANSFORM_LEASE_SECONDS and the file is
+    claimed again by another worker; a worker whose lease was taken over
+    discards its rows instead of committing them. A file that could not be
+    transformed is marked failed and retried by the next run, until it has
+    been attempted TRANSFORM_MAX_ATTEMPTS times.
+
+    Methods:
+        __init__()   -- Configures the worker
+        heartbeat()  -- Extends the worker's leases until stopped
+        process()    -- Transforms one leased file
+        abandon()    -- Logs a file that failed every attempt as 'error'
+        drain()      -- Processes queued files until the queue is empty
+        stop()       -- Asks drain() to return after the current file
+
+    Instance Variables:
+        conn          -- DBConnectorTransform used for the transformation
+        worker_id     -- Identifier written to the leases (host:pid:suffix)
+        lease_seconds -- Lease duration (TRANSFORM_LEASE_SECONDS, default 120)
+        max_attempts  -- Attempts before a failing file is logged as 'error'
+                         (TRANSFORM_MAX_ATTEMPTS, default 3)
+        poll_interval -- Seconds between polls while other workers hold the
+                         remaining files (TRANSFORM_POLL_INTERVAL, default 5)
+        transformers  -- data type -> BitcoinTransform/GoldTransform
+        stop_event    -- Set when the worker should stop
+    """
+
+    def __init__(self, conn: DBConnectorTransform):
+        """
+        Initialize the worker.
+
+        Parameters:
+            conn -- Connected DBConnectorTransform
+        """
+        self.conn = conn
+        self.worker_id = (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+        self.lease_seconds = int(os.getenv("TRANSFORM_LEASE_SECONDS", "120"))
+        self.max_attempts = int(os.getenv("TRANSFORM_MAX_ATTEMPTS", "3"))
+        self.poll_interval = float(os.getenv("TRANSFORM_POLL_INTERVAL", "5"))
+        self.transformers = {
+            "bitcoin": BitcoinTransform(conn),
+            "gold": GoldTransform(conn),
+        }
+        self.stop_event = threading.Event()
+
+    def heartbeat(self, stopped):
+        """
+        Extend this worker's leases every third of the lease duration.
+
+        Runs on its own thread and connection, so leases stay alive while a
+        large file is being transformed.
+
+        Parameters:
+            stopped -- threading.Event ending the loop
+
+        Returns:
+            None
+        """
+        conn = DBConnectorTransform(logger=logger)
+        conn.connect()
+        try:
+            while not stopped.wait(self.lease_seconds / 3):
+                conn.extend_leases(self.worker_id, self.lease_seconds)
+        finally:
+            conn.disconnect()
+
+    def process(self, file_info):
+        """
+        Transform one leased file under the run it was queued for.
+
+        The transformer removes the file from the queue when it logs it. A
+        file it could not read or log is still leased afterwards: it is
+        marked failed, so the next transform run queues it again, or
+        abandoned once it has used up its attempts.
+
+        Parameters:
+            file_info -- FileWorkItem returned by claim_file()
+
+        Returns:
+            None
+        """
+        transformer = self.transformers[file_info.data_type]
+        transformer.run_id = file_info.run_id
+        transformer.transform(file_info)
+
+        if file_info.attempts >= self.max_attempts:
+            self.abandon(file_info)
+        elif self.conn.fail_claim(file_info.queue_id, self.worker_id):
+            logger.warning(
+                f"File {file_info.full_path} was not transformed "
+                f"(attempt {file_info.attempts} of {self.max_attempts}), "
+                f"it will be queued again by the next transform run"
+            )
+
+    def abandon(self, file_info):
+        """
+        Log a file that failed its last attempt as 'error' and archive it.
+
+        The transform_log entry keeps the file from being queued again.
+        Nothing is done if the file was transformed after all or its lease
+        was lost to another worker.
+
+        Parameters:
+            file_info -- FileWorkItem returned by claim_file()
+
+        Returns:
+            None
+        """
+        if not self.conn.complete_claim(file_info.queue_id, self.worker_id):
+            self.conn.conn.rollback()
+            return
+
+        logger.error(
+            f"File {file_info.full_path} was not transformed after "
+            f"{file_info.attempts} attempts, logging it as 'error'"
+        )
+        new_file_path = archive_path(
+            "error", file_info.data_type, file_info.full_path
+        )
+        if self.conn.log_transform(
+            file_info.currency_id,
+            os.path.dirname(new_file_path),
+            os.path.basename(new_file_path),
+            0,
+            "error",
+            file_info.run_id,
+        ) and os.path.exists(file_info.full_path):
+            move_file("error", file_info.data_type, file_info.full_path)
+
+    def drain(self, data_types, idle_timeout=0):
+        """
+        Process queued files until none are left or the worker is stopped.
+
+        While the remaining files are leased by other workers, the worker
+        keeps polling, so it takes over the files of a worker that dies.
+
+        Parameters:
+            data_types   -- Types of data to process ('bitcoin', 'gold')
+            idle_timeout -- Seconds to keep polling an empty queue for new
+                            files (0 returns as soon as the queue is empty)
+
+        Returns:
+            int -- Number of files processed
+        """
+        stopped = threading.Event()
+        heartbeat = threading.Thread(
+            target=self.heartbeat,
+            args=(stopped,),
+            name="transform-heartbeat",
+            daemon=True,
+        )
+        heartbeat.start()
+
+        logger.info(
+            f"Transform worker {self.worker_id} draining {', '.join(data_types)}"
+        )
+        processed = 0
+        idle = 0.0
+        try:
+            while not self.stop_event.is_set():
+                file_info = self.conn.claim_file(
+                    data_types, self.worker_id, self.lease_seconds
+                )
+                if file_info:
+                    self.process(file_info)
+                    processed += 1
+                    idle = 0.0
+                    continue
+
+                if not self.conn.count_queued(data_types):
+                    if idle >= idle_timeout:
+                        break
+                    idle += self.poll_interval
+                self.stop_event.wait(self.poll_interval)
+        finally:
+            stopped.set()
+            heartbeat.join()
+            self.conn.conn.rollback()
+            released = self.conn.release_claims(self.worker_id)
+            if released:
+                logger.info(f"Returned {released} leased files to the queue")
+
+        logger.info(f"Transform worker {self.worker_id} processed {processed} files")
+        return processed
+
+    def stop(self):
+        """
+        Ask drain() to return once the current file is done.
+
+        Returns:
+            None
+        """
+        self.stop_event.set()
@@ -0,0 +1,113 @@
+from etl.commons.database import DBConnector
+from etl.commons.metrics import metrics
+from etl.validate.logger_validate import logger
+
+
+class DBConnectorValidate(DBConnector):
+    """
+    Reads staging rows and warehouse history for the validation stage and
+    moves rejected rows to the transform.quarantine table.
+
+    Methods:
+        get_staging_rows()    -- Staging rows of an asset
+        get_history()         -- Warehouse rows of a currency preceding its staged dates
+        quarantine_rows()     -- Insert rejected rows into the quarantine table
+        delete_staging_rows() -- Remove rejected rows from staging
+    """
+
+    @metrics.timed("validate.get_staging_rows")
+    def get_staging_rows(self, staging_table, columns):
+        """
+        Return every row of a staging table.
+
+        Parameters:
+            staging_table -- Staging table, e.g. 'transform.btc_data_import'
+            columns       -- Value columns to read after currency_id and date
+
+        Returns:
+            list -- (currency_id, date, *columns) tuples
+        """
+        query = f"""
+            SELECT currency_id, date, {", ".join(columns)}
+            FROM {staging_table}
+        """
+        self.cursor.execute(query)
+        return self.cursor.fetchall()
+
+    @metrics.timed("validate.get_history")
+    def get_history(self, fact_table, column, currency_id, start, end):
+        """
+        Return the warehouse values of one column for a currency in a date
+        range, used as context for the rolling checks of its first staged
+        dates.
+
+        Parameters:
+            fact_table  -- Warehouse fact table, e.g. 'fact_btc'
+            column      -- Price column to read
+            currency_id -- Currency to read
+            start       -- First date (inclusive)
+            end         -- Last date (exclusive)
+
+        Returns:
+            list -- (date, value) tuples ordered by date
+        """
+        query = f"""
+            SELECT date, {column}
+            FROM warehouse.{fact_table}
+            WHERE currency_id = %s AND date >= %s AND date < %s
+            ORDER BY date
+        """
+        self.cursor.execute(query, (currency_id, start, end))
+        return self.cursor.fetchall()
+
+    @metrics.timed("validate.quarantine_rows")
+    def quarantine_rows(self, rows):
+        """
+        Insert rejected rows into the quarantine table in one batch.
+
+        A row rejected again by the same check replaces its previous entry.
+
+        Parameters:
+            rows -- (asset, currency_id, date, check_name, detail, payload) tuples
+
+        Returns:
+            int -- Number of rows written
+        """
+        if not rows:
+            return 0
+
+        query = """
+            INSERT INTO transform.quarantine (
+                asset, currency_id, date, check_name, detail, payload, quarantined_at
+            )
+            VALUES (%s, %s, %s, %s, %s, %s, NOW(4))
+            ON DUPLICATE KEY UPDATE
+                detail = VALUES(detail),
+                payload = VALUES(payload),
+                quarantined_at = NOW(4)
+        """
+        self.cursor.executemany(query, rows)
+        return len(rows)
+
+    @metrics.timed("validate.delete_staging_rows")
+    def delete_staging_rows(self, staging_table, keys):
+        """
+        Delete rows from a staging table in one batch.
+
+        Parameters:
+            staging_table -- Staging table, e.g. 'transform.btc_data_import'
+            keys          -- (currency_id, date) tuples
+
+        Returns:
+            int -- Number of keys deleted
+        """
+        if not keys:
+            return 0
+
+        logger.info(f"Removing {len(keys)} rejected rows from {staging_table}")
+        query = f"""
+            DELETE FROM {staging_table}
+            WHERE currency_id = %s AND date = %s
+        """
+        self.cursor.executemany(query, keys)
+        return len(keys)
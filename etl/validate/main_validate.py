@@ -0,0 +1,272 @@
+import json
+import os
+
+import numpy as np
+
+from etl.commons.metrics import metrics
+from etl.commons.stages import ASSETS
+from etl.validate.database_validate import DBConnectorValidate
+from etl.validate.logger_validate import logger
+from etl.validate.utils_validate import (
+    KARAT_RATIOS,
+    check_karat_ratios,
+    check_ohlc,
+    date_gaps,
+    rolling_outliers,
+    to_float_array,
+)
+
+
+# Asset -> (staging table, warehouse fact table, value columns, close column)
+ASSET_TABLES = {
+    "btc": (
+        "transform.btc_data_import",
+        "fact_btc",
+        ["open", "high", "low", "close", "volume"],
+        "close",
+    ),
+    "gold": (
+        "transform.gold_data_import",
+        "fact_gold",
+        ["open", "high", "low", "price", "price_24k", "price_18k", "price_14k"],
+        "price",
+    ),
+}
+
+# Staged ticks of an asset, removed together with its rejected days
+TICK_TABLES = {"gold": "transform.gold_tick_import"}
+
+# Largest number of days between two rows before a gap is reported. Gold is
+# not quoted on weekends.
+MAX_GAP_DAYS = {"btc": 1, "gold": 3}
+
+CHECK_DETAILS = {
+    "ohlc": "Missing, non-positive or inconsistent OHLC prices",
+    "karat_ratio": "Karat prices do not match their purity ratio to 24k",
+    "zscore": "Log return is a rolling z-score outlier",
+}
+
+
+class StagingValidator:
+    """
+    Runs vectorized data-quality checks over the staging tables and moves
+    rejected rows to transform.quarantine before they reach the warehouse.
+
+    Row checks (OHLC consistency, karat ratios) run over whole columns at
+    once. The rolling z-score check runs per currency over the rows that
+    passed them, preceded by the latest warehouse prices so that the first
+    staged days have a full window. Gaps in the date series are reported
+    but do not reject rows.
+
+    Methods:
+        __init__()       -- Initializes with a DB connection and thresholds
+        validate_asset() -- Validate the staging rows of one asset
+        call()           -- Validate every requested asset
+
+    Instance Variables:
+        conn            -- DBConnectorValidate instance for DB operations
+        window          -- Returns in the rolling window (VALIDATE_ZSCORE_WINDOW)
+        threshold       -- Z-score rejecting a day (VALIDATE_ZSCORE_THRESHOLD)
+        min_periods     -- Returns needed before a day is scored (VALIDATE_MIN_PERIODS)
+        karat_tolerance -- Relative karat ratio tolerance (VALIDATE_KARAT_TOLERANCE)
+    """
+
+    def __init__(self, conn: DBConnectorValidate):
+        """
+        Initialize the validator.
+
+        Parameters:
+            conn -- DBConnectorValidate instance used for database operations
+        """
+        self.conn = conn
+        self.window = int(os.getenv("VALIDATE_ZSCORE_WINDOW", "30"))
+        self.threshold = float(os.getenv("VALIDATE_ZSCORE_THRESHOLD", "6"))
+        self.min_periods = int(os.getenv("VALIDATE_MIN_PERIODS", "10"))
+        self.karat_tolerance = float(
+            os.getenv("VALIDATE_KARAT_TOLERANCE", "0.01")
+        )
+
+    def _history(self, fact_table, close_column, currency_id, first_date):
+        """
+        Return the warehouse prices of a currency preceding its staged dates.
+
+        Parameters:
+            fact_table   -- Warehouse fact table
+            close_column -- Price column scored by the z-score check
+            currency_id  -- Currency to read
+            first_date   -- First staged date of the currency (numpy datetime64[D])
+
+        Returns:
+            tuple -- (dates array, prices array) ordered by date
+        """
+        start = first_date - np.timedelta64(2 * self.window, "D")
+        rows = self.conn.get_history(
+            fact_table,
+            close_column,
+            currency_id,
+            start.astype(object),
+            first_date.astype(object),
+        )
+        return (
+            np.array([str(day) for day, _ in rows], dtype="datetime64[D]"),
+            to_float_array([price for _, price in rows]),
+        )
+
+    def validate_asset(self, asset):
+        """
+        Validate the staging rows of an asset and quarantine the rejects.
+
+        Parameters:
+            asset -- 'btc' or 'gold'
+
+        Returns:
+            int -- Number of rejected rows
+        """
+        staging_table, fact_table, columns, close_column = ASSET_TABLES[asset]
+        try:
+            rows = self.conn.get_staging_rows(staging_table, columns)
+            if not rows:
+                logger.info(f"No {asset} staging rows to validate")
+                return 0
+            metrics.add_rows(len(rows))
+
+            currency_ids = np.array([row[0] for row in rows])
+            dates = np.array([str(row[1]) for row in rows], dtype="datetime64[D]")
+            values = {
+                column: to_float_array([row[index + 2] for row in rows])
+                for index, column in enumerate(columns)
+            }
+
+            failed = {
+                "ohlc": check_ohlc(
+                    values["open"],
+                    values["high"],
+                    values["low"],
+                    values[close_column],
+                )
+            }
+            if asset == "gold":
+                failed["karat_ratio"] = check_karat_ratios(
+                    values["price_24k"],
+                    {column: values[column] for column in KARAT_RATIOS},
+                    self.karat_tolerance,
+                )
+            rejected = np.logical_or.reduce(list(failed.values()))
+
+            outliers = np.zeros(len(rows), dtype=bool)
+            gaps = []
+
+            for currency_id in np.unique(currency_ids):
+                indexes = np.nonzero((currency_ids == currency_id) & ~rejected)[0]
+                if not len(indexes):
+                    continue
+                indexes = indexes[np.argsort(dates[indexes])]
+                past_dates, past_prices = self._history(
+                    fact_table, close_column, int(currency_id), dates[indexes[0]]
+                )
+
+                flags = rolling_outliers(
+                    np.concatenate([past_prices, values[close_column][indexes]]),
+                    self.window,
+                    self.threshold,
+                    self.min_periods,
+                )
+                outliers[indexes] = flags[len(past_prices):]
+
+                gaps.extend(
+                    (int(currency_id), before, after)
+                    for before, after in date_gaps(
+                        np.concatenate([past_dates, dates[indexes]]),
+                        MAX_GAP_DAYS[asset],
+                    )
+                )
+            failed["zscore"] = outliers
+
+            if gaps:
+                logger.warning(
+                    f"{len(gaps)} gaps in the {asset} date series, e.g. "
+                    + ", ".join(
+                        f"currency {currency_id} {before} to {after}"
+                        for currency_id, before, after in gaps[:5]
+                    )
+                )
+
+            quarantined = []
+            for check_name, mask in failed.items():
+                for index in np.nonzero(mask)[0]:
+                    row = rows[index]
+                    quarantined.append(
+                        (
+                            asset,
+                            row[0],
+                            row[1],
+                            check_name,
+                            CHECK_DETAILS[check_name],
+                            json.dumps(
+                                dict(zip(columns, row[2:])), default=str
+                            ),
+                        )
+                    )
+
+            rejected_rows = np.nonzero(rejected | outliers)[0]
+            rejected_keys = [
+                (rows[index][0], rows[index][1]) for index in rejected_rows
+            ]
+            self.conn.quarantine_rows(quarantined)
+            self.conn.delete_staging_rows(staging_table, rejected_keys)
+            if asset in TICK_TABLES:
+                self.conn.delete_staging_rows(TICK_TABLES[asset], rejected_keys)
+            self.conn.conn.commit()
+
+            counts = ", ".join(
+                f"{check_name}: {int(mask.sum())}"
+                for check_name, mask in failed.items()
+            )
+            logger.info(
+                f"Validated {len(rows)} {asset} rows, "
+                f"{len(rejected_rows)} quarantined ({counts})"
+            )
+            return len(rejected_rows)
+
+        except Exception as e:
+            self.conn.conn.rollback()
+            logger.error(
+                f"Error validating {asset} staging rows: {str(e)}",
+                exc_info=True,
+            )
+            return 0
+
+    def call(self, assets=ASSETS):
+        """
+        Validate the staging rows of the given assets.
+
+        Parameters:
+            assets -- Assets to validate, 'btc' and/or 'gold'
+
+        Returns:
+            int -- Number of rejected rows
+        """
+        return sum(self.validate_asset(asset) for asset in assets)
+
+
+@metrics.timed("validate")
+def validate(assets=ASSETS):
+    """
+    Run the data-quality checks between transform and load.
+
+    Parameters:
+        assets -- Assets to validate, 'btc' and/or 'gold' (default: both)
+
+    Returns:
+        None
+    """
+    logger.info("Starting Validate process")
+
+    conn = DBConnectorValidate(logger=logger)
+    conn.connect()
+    try:
+        rejected = StagingValidator(conn).call(assets)
+    finally:
+        conn.disconnect()
+
+    logger.info(f"Validate process completed, {rejected} rows quarantined")
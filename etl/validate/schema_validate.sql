@@ -0,0 +1,18 @@
+# Validate schema
+USE transform;
+
+
+DROP TABLE IF EXISTS quarantine;
+
+
+CREATE TABLE quarantine(
+    Id INT AUTO_INCREMENT PRIMARY KEY,
+    asset VARCHAR(10) NOT NULL,
+    currency_id INT,
+    date DATE NOT NULL,
+    check_name VARCHAR(30) NOT NULL,
+    detail VARCHAR(255),
+    payload TEXT,
+    quarantined_at TIMESTAMP(4) NOT NULL,
+    UNIQUE INDEX idx_asset_row_check (asset, currency_id, date, check_name)
+);
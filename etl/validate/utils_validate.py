@@ -0,0 +1,133 @@
+import numpy as np
+
+
+# Karat column -> expected ratio to price_24k
+KARAT_RATIOS = {
+    "price_18k": 18 / 24,
+    "price_14k": 14 / 24,
+}
+
+# Rolling variance of log returns below which a window is treated as flat
+# and its next return is not scored; covers rounding in the cumulative sums
+MIN_VARIANCE = 1e-12
+
+
+def to_float_array(values):
+    """
+    Convert database values (Decimal, float or None) to a float array.
+
+    Parameters:
+        values -- Sequence of numeric values, None for NULL
+
+    Returns:
+        numpy.ndarray -- float64 array with NaN for NULL
+    """
+    return np.array(
+        [np.nan if value is None else float(value) for value in values],
+        dtype=float,
+    )
+
+
+def check_ohlc(open_, high, low, close):
+    """
+    Find rows whose OHLC prices are missing, non-positive or inconsistent.
+
+    Parameters:
+        open_ -- Opening prices
+        high  -- Highest prices
+        low   -- Lowest prices
+        close -- Closing prices
+
+    Returns:
+        numpy.ndarray -- Boolean mask of rejected rows
+    """
+    prices = np.vstack([open_, high, low, close])
+    with np.errstate(invalid="ignore"):
+        invalid = ~(prices > 0).all(axis=0)
+        invalid |= high < low
+        invalid |= high < np.maximum(open_, close)
+        invalid |= low > np.minimum(open_, close)
+    return invalid
+
+
+def check_karat_ratios(price_24k, karat_prices, tolerance):
+    """
+    Find rows whose karat prices do not match their purity ratio to 24k.
+
+    Rows without a 24k price, or without a given karat price, are not
+    checked for it.
+
+    Parameters:
+        price_24k    -- 24k prices
+        karat_prices -- Karat column -> prices (keys of KARAT_RATIOS)
+        tolerance    -- Allowed relative deviation from the expected ratio
+
+    Returns:
+        numpy.ndarray -- Boolean mask of rejected rows
+    """
+    invalid = np.zeros(len(price_24k), dtype=bool)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for column, prices in karat_prices.items():
+            expected = KARAT_RATIOS[column]
+            ratio = prices / price_24k
+            invalid |= np.abs(ratio / expected - 1) > tolerance
+    return invalid
+
+
+def rolling_outliers(prices, window, threshold, min_periods):
+    """
+    Find prices whose log return is a rolling z-score outlier.
+
+    Each day's log return is compared with the mean and standard deviation
+    of the previous `window` returns, computed from cumulative sums. The
+    return that brings a price back after an outlier is not flagged, so a
+    single bad tick rejects one day and not two. Days after a flat window
+    (variance below MIN_VARIANCE) are not scored.
+
+    Parameters:
+        prices      -- Positive prices of one currency, ordered by date
+        window      -- Number of previous returns in the rolling window
+        threshold   -- Absolute z-score above which a day is an outlier
+        min_periods -- Minimum previous returns before a day is checked
+
+    Returns:
+        numpy.ndarray -- Boolean mask of outlier days (the first is never one)
+    """
+    outliers = np.zeros(len(prices), dtype=bool)
+    if len(prices) <= min_periods:
+        return outliers
+
+    returns = np.diff(np.log(prices))
+    sums = np.concatenate(([0.0], np.cumsum(returns)))
+    squares = np.concatenate(([0.0], np.cumsum(returns ** 2)))
+
+    index = np.arange(len(returns))
+    first = np.maximum(index - window, 0)
+    counts = index - first
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = (sums[index] - sums[first]) / counts
+        variance = (squares[index] - squares[first]) / counts - mean ** 2
+        scorable = (counts >= min_periods) & (variance > MIN_VARIANCE)
+        scores = (returns - mean) / np.sqrt(np.where(scorable, variance, 1.0))
+        flagged = scorable & (np.abs(scores) > threshold)
+
+    reversal = np.zeros_like(flagged)
+    reversal[1:] = flagged[:-1] & (np.sign(returns[1:]) != np.sign(returns[:-1]))
+    outliers[1:] = flagged & ~reversal
+    return outliers
+
+
+def date_gaps(dates, max_gap_days):
+    """
+    Find gaps in the date series of one currency.
+
+    Parameters:
+        dates        -- numpy datetime64[D] array, ordered
+        max_gap_days -- Largest allowed number of days between two rows
+
+    Returns:
+        list -- (last date before the gap, first date after it) tuples
+    """
+    steps = np.diff(dates).astype(int)
+    gaps = np.nonzero(steps > max_gap_days)[0]
+    return [(dates[i], dates[i + 1]) for i in gaps]
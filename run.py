@@ -1,25 +1,125 @@
+import argparse
+import functools
 import sys
+from datetime import date
 
 from dotenv import load_dotenv
 
-from etl.extract.main_extract import extract
-from etl.transform.main_transform import transform
-from etl.load.main_load import load
+from etl.commons.metrics import metrics
+from etl.commons.stages import get_stage, run_all
+
+
+USAGE = (
+    "Usage: python -m run [extract|transform|validate|load|all]\n"
+    "       python -m run all --in-memory\n"
+    "       python -m run all --pipelined\n"
+    "       python -m run worker\n"
+    "       python -m run export\n"
+    "       python -m run daemon\n"
+    "       python -m run backfill --from YYYY-MM-DD [--to YYYY-MM-DD] [--assets btc gold]\n"
+    "       python -m run reprocess --type bitcoin|gold --from YYYY-MM-DD [--to YYYY-MM-DD]\n"
+    "       python -m run profile [extract|transform|validate|load|all]"
+)
+
+
+def parse_backfill_options(options):
+    """
+    Parse the command-line flags of the backfill action.
+
+    Parameters:
+        options -- Command-line flags following 'backfill'
+
+    Returns:
+        dict -- Keyword arguments for the backfill stage
+    """
+    parser = argparse.ArgumentParser(prog="python -m run backfill")
+    parser.add_argument(
+        "--from", dest="date_from", required=True, type=date.fromisoformat
+    )
+    parser.add_argument(
+        "--to", dest="date_to", default=date.today(), type=date.fromisoformat
+    )
+    parser.add_argument("--assets", nargs="+", choices=["btc", "gold"])
+    return vars(parser.parse_args(options))
+
+
+def parse_reprocess_options(options):
+    """
+    Parse the command-line flags of the reprocess action.
+
+    Parameters:
+        options -- Command-line flags following 'reprocess'
+
+    Returns:
+        dict -- Keyword arguments for the reprocess stage
+    """
+    parser = argparse.ArgumentParser(prog="python -m run reprocess")
+    parser.add_argument(
+        "--type", dest="data_type", required=True, choices=["bitcoin", "gold"]
+    )
+    parser.add_argument(
+        "--from", dest="date_from", required=True, type=date.fromisoformat
+    )
+    parser.add_argument(
+        "--to", dest="date_to", default=date.today(), type=date.fromisoformat
+    )
+    return vars(parser.parse_args(options))
+
+
+def resolve_action(name, options):
+    """
+    Return the callable for an action name, importing only what it needs.
+
+    Parameters:
+        name    -- Action name from the command line
+        options -- Remaining command-line flags (e.g. ['--in-memory'])
+
+    Returns:
+        function or None -- Callable running the action
+    """
+    if name == "all":
+        if "--in-memory" in options:
+            return get_stage("all-in-memory")
+        if "--pipelined" in options:
+            return get_stage("all-pipelined")
+        return run_all
+    if name == "backfill":
+        return functools.partial(
+            get_stage(name), **parse_backfill_options(options)
+        )
+    if name == "reprocess":
+        return functools.partial(
+            get_stage(name), **parse_reprocess_options(options)
+        )
+    return get_stage(name)
 
 
 if __name__ == "__main__":
     load_dotenv()
 
-    actions = {
-        "extract": extract,
-        "transform": transform,
-        "load": load,
-        "all": lambda: (extract(), transform(), load())
-    }
+    args = sys.argv[1:]
+    profiling = bool(args) and args[0] == "profile"
+    if profiling:
+        args = args[1:]
 
-    func = actions.get(sys.argv[1]) if len(sys.argv) > 1 else None
+    func = resolve_action(args[0], args[1:]) if args else None
 
     if func:
-        func()
+        if profiling:
+            from etl.commons.profiling import profile_stage
+
+            profile_stage(args[0], func)
+        else:
+            func()
+        report_path = metrics.write_report()
+        print(f"Run report written to {report_path}")
+        print("Top statements by total time:")
+        for statement in metrics.statement_summary(limit=5):
+            print(
+                f"  {statement['total_seconds']:.3f}s total, "
+                f"{statement['calls']} calls, "
+                f"p95 {statement['p95_seconds'] * 1000:.1f} ms, "
+                f"{statement['rows']} rows: {statement['statement'][:120]}"
+            )
     else:
-        print("Usage: python -m run [extract|transform|load|all]")
+        print(USAGE)
@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from etl.commons.database import clear_dimension_cache
+from etl.extract.database_extract import DBConnectorExtract
+from etl.extract.logger_extract import logger
+from etl.extract.utils_extract import save_to_file
+from etl.load.index_load import clear_fact_indexes
+
+
+@pytest.fixture
+def sqlite_env(tmp_path, monkeypatch):
+    """Run the connectors on a fresh SQLite database in a temporary directory."""
+    monkeypatch.setenv("DB_ENGINE", "sqlite")
+    monkeypatch.setenv("SQLITE_DIR", str(tmp_path / "sqlite"))
+    monkeypatch.chdir(tmp_path)
+    clear_dimension_cache()
+    clear_fact_indexes()
+    return tmp_path
+
+
+@pytest.fixture
+def register_file(sqlite_env):
+    """Save payloads to data/raw like the extract stage and log them in import_log."""
+    conn = DBConnectorExtract(logger)
+    conn.connect()
+
+    def register(data, api_type, currency_id, row_count=1):
+        file_path, created, modified = save_to_file(data, api_type)
+        conn.log_import(
+            currency_id,
+            os.path.dirname(file_path),
+            os.path.basename(file_path),
+            created,
+            modified,
+            row_count,
+        )
+        return file_path
+
+    yield register
+    conn.disconnect()
+
+
+@pytest.fixture
+def btc_payload():
+    """Build a minimal Alpha Vantage daily response for a market and dates."""
+
+    def build(market, dates):
+        return {
+            "Meta Data": {"4. Market Code": market},
+            "Time Series (Digital Currency Daily)": {
+                day: {
+                    "1. open": "100.5",
+                    "2. high": "110.25",
+                    "3. low": "95.75",
+                    "4. close": "105.0",
+                    "5. volume": "12.34567890",
+                }
+                for day in dates
+            },
+        }
+
+    return build
@@ -0,0 +1,41 @@
+from datetime import date
+
+import etl.backfill.main_backfill as main_backfill
+from etl.backfill.database_backfill import DBConnectorBackfill
+from etl.backfill.logger_backfill import logger
+
+
+def test_backfill_resumes_with_units_that_were_not_loaded(
+    sqlite_env, btc_payload, monkeypatch
+):
+    monkeypatch.setenv("BACKFILL_LOAD_BATCH", "4")
+    fetched = []
+    failing = {"GBP"}
+
+    def fetch(self, unit):
+        fetched.append(unit.currency_code)
+        if unit.currency_code in failing:
+            raise RuntimeError("API request failed")
+        return [(btc_payload(unit.currency_code, ["2025-01-01", "2025-01-02"]), 2)]
+
+    monkeypatch.setattr(main_backfill.UnitFetcher, "fetch", fetch)
+
+    main_backfill.backfill(date(2025, 1, 1), date(2025, 1, 2), ["btc"])
+    assert len(fetched) == 10
+
+    state = DBConnectorBackfill(logger)
+    state.connect()
+    try:
+        assert len(state.get_finished_units()) == 9
+        state.cursor.execute("SELECT COUNT(*) FROM warehouse.fact_btc")
+        assert state.cursor.fetchone()[0] == 18
+
+        fetched.clear()
+        failing.clear()
+        main_backfill.backfill(date(2025, 1, 1), date(2025, 1, 2), ["btc"])
+        assert fetched == ["GBP"]
+        assert len(state.get_finished_units()) == 10
+        state.cursor.execute("SELECT COUNT(*) FROM warehouse.fact_btc")
+        assert state.cursor.fetchone()[0] == 20
+    finally:
+        state.disconnect()
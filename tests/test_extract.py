@@ -0,0 +1,59 @@
+import threading
+import time
+
+from etl.extract.database_extract import ERROR_MESSAGES_WIDTH, DBConnectorExtract
+from etl.extract.logger_extract import logger
+from etl.extract.utils_extract import CircuitBreaker, validate_payload
+
+
+def test_half_open_circuit_lets_one_trial_through():
+    breaker = CircuitBreaker("TEST", failure_threshold=1, cool_down=0.05)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert not breaker.is_open()
+    results = []
+    callers = [
+        threading.Thread(target=lambda: results.append(breaker.allow()))
+        for _ in range(8)
+    ]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join()
+
+    assert sorted(results) == [False] * 7 + [True]
+    assert breaker.is_open()
+
+    breaker.record_success()
+    assert breaker.allow()
+    assert breaker.allow()
+
+
+def test_failed_trial_reopens_the_circuit():
+    breaker = CircuitBreaker("TEST", failure_threshold=3, cool_down=0.05)
+    breaker.record_failure(quota_exhausted=True)
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.is_open()
+    assert not breaker.allow()
+
+
+def test_long_error_messages_fit_api_import_log(sqlite_env):
+    conn = DBConnectorExtract(logger)
+    conn.connect()
+    try:
+        error_message, _ = validate_payload("btc", {"Information": "x" * 1000})
+        conn.log_api_import(1, "BTC", "2025-01-01 00:00:00", None, 200, error_message)
+
+        conn.cursor.execute("SELECT error_messages FROM extract.api_import_log")
+        (stored,) = conn.cursor.fetchone()
+    finally:
+        conn.disconnect()
+
+    assert len(stored) == ERROR_MESSAGES_WIDTH
+    assert stored.startswith("Information: xxx") and stored.endswith("...")
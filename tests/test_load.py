@@ -0,0 +1,193 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from etl.commons.records import from_fixed, to_fixed
+from etl.load.aggregate_load import AggregateLoad
+from etl.load.database_load import DBConnectorLoad
+from etl.load.gold_load import GoldLoad
+from etl.load.index_load import upsert_changed_facts
+from etl.load.logger_load import logger
+from etl.load.rates_load import cross_rate_matrix
+from etl.transform.database_transform import DBConnectorTransform
+from etl.transform.gold_transform import GoldTransform
+
+
+@pytest.fixture
+def conn(sqlite_env):
+    conn = DBConnectorLoad(logger)
+    conn.connect()
+    yield conn
+    conn.disconnect()
+
+
+def test_upsert_dim_date_inserts_one_row_per_date(conn):
+    start = date(2025, 1, 1)
+    rows = [
+        (currency_id, start + timedelta(days=day), 1, 1, 1, 1, 1)
+        for currency_id in (1, 2, 3)
+        for day in range(30)
+    ]
+    conn.cursor.executemany(
+        """
+        INSERT INTO transform.btc_data_import
+            (currency_id, date, open, high, low, close, volume)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """,
+        rows,
+    )
+    conn.conn.commit()
+
+    upserted = conn.upsert_dim_date("transform.btc_data_import")
+    conn.conn.commit()
+
+    assert upserted == 30
+    conn.cursor.execute(
+        "SELECT COUNT(*), COUNT(DISTINCT date) FROM warehouse.dim_date"
+    )
+    assert conn.cursor.fetchone() == (30, 30)
+
+
+def test_empty_aggregate_tables_are_built_from_history(conn):
+    start = date(2024, 12, 30)
+    conn.cursor.executemany(
+        """
+        INSERT INTO warehouse.fact_btc
+            (date, currency_id, open, high, low, close, volume,
+             created_at, updated_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, NOW(4), NOW(4))
+        """,
+        [
+            (start + timedelta(days=day), currency_id, day, day + 1, day, day, 1)
+            for currency_id in (1, 2)
+            for day in range(40)
+        ],
+    )
+
+    aggregates = AggregateLoad(conn)
+    assert aggregates.load_aggregates("fact_btc", []) > 0
+    conn.conn.commit()
+
+    counts = {}
+    for period in ("weekly", "monthly", "yearly"):
+        conn.cursor.execute(
+            f"SELECT COUNT(*), SUM(day_count) FROM warehouse.agg_btc_{period}"
+        )
+        counts[period] = conn.cursor.fetchone()
+    assert counts == {
+        "weekly": (12, 80),
+        "monthly": (6, 80),
+        "yearly": (4, 80),
+    }
+
+    assert aggregates.load_aggregates("fact_btc", []) == 0
+
+
+def test_fact_index_skips_unchanged_rows(conn, monkeypatch):
+    conn.cursor.executemany(
+        """
+        INSERT INTO transform.btc_data_import
+            (currency_id, date, open, high, low, close, volume)
+        VALUES (%s, %s, 1, 2, 1, 2, 10)
+        """,
+        [(currency_id, date(2025, 1, day)) for currency_id in (1, 2) for day in (1, 2)],
+    )
+    upserted = []
+    upsert_fact_rows = conn.upsert_fact_rows
+
+    def record(fact_table, columns, rows):
+        upserted.append(len(rows))
+        return upsert_fact_rows(fact_table, columns, rows)
+
+    monkeypatch.setattr(conn, "upsert_fact_rows", record)
+
+    assert len(upsert_changed_facts(conn, "fact_btc")) == 4
+    conn.conn.commit()
+    assert upsert_changed_facts(conn, "fact_btc") == []
+
+    conn.cursor.execute(
+        "UPDATE transform.btc_data_import SET close = 3 "
+        "WHERE currency_id = 2 AND date = '2025-01-02'"
+    )
+    assert upsert_changed_facts(conn, "fact_btc") == [(2, date(2025, 1, 2))]
+    assert upserted == [4, 1]
+
+
+def test_cross_rate_matrix_is_triangularly_consistent():
+    # EUR, USD, GBP quoted from an EUR and a USD snapshot
+    matrix, deviation = cross_rate_matrix(
+        [[1.0, 1.1, 0.85], [1 / 1.1, 1.0, 0.85 / 1.1]],
+        [0, 1],
+    )
+
+    assert np.allclose(np.diag(matrix), 1.0)
+    assert matrix[0, 1] == pytest.approx(1.1)
+    assert matrix[2, 1] == pytest.approx(1.1 / 0.85)
+    assert np.allclose(matrix, matrix[:, [1]] * matrix[[1], :])
+    assert deviation == pytest.approx(0.0, abs=1e-12)
+
+    _, deviation = cross_rate_matrix([[1.0, 1.1, 0.85], [0.9, 1.0, 0.8]], [0, 1])
+    assert deviation > 0.01
+
+
+def test_cross_rate_matrix_leaves_unquoted_currencies_unknown():
+    matrix, _ = cross_rate_matrix([[1.0, 1.1, np.nan]], [0])
+
+    assert matrix[0, 1] == pytest.approx(1.1)
+    assert np.isnan(matrix[2]).all() and np.isnan(matrix[:, 2]).all()
+
+
+def gold_payload(hour, prices):
+    return {
+        "status": "success",
+        "data": {
+            "timestamp": int(datetime(2025, 1, 1, hour).timestamp() * 1000),
+            "base_currency": "USD",
+            "metal_prices": {"XAU": prices},
+            "currency_rates": {"EUR": 0.88037, "USD": 1.0},
+        },
+    }
+
+
+def test_gold_ticks_round_trip_as_fixed_point(conn):
+    first = {
+        "open": 2610.11, "high": 2620.99, "low": 2600.01, "price": 2615.5,
+        "price_24k": 84.12345678, "price_18k": 63.09259259, "price_14k": 49.07201646,
+    }
+    last = {
+        "open": 2615.5, "high": 2630.25, "low": 2605.75, "price": 2629.87,
+        "price_24k": 84.55623457, "price_18k": 63.41717593, "price_14k": 49.32446816,
+    }
+    staging = DBConnectorTransform(logger)
+    staging.connect()
+    try:
+        GoldTransform(staging).transform_data(
+            [gold_payload(9, first), gold_payload(15, last)], 2, "test"
+        )
+        staging.conn.commit()
+    finally:
+        staging.disconnect()
+
+    assert GoldLoad(conn).load_fact_gold_tick()
+
+    conn.cursor.execute(
+        "SELECT open, high, low, price, price_24k, price_18k, price_14k "
+        "FROM warehouse.fact_gold_tick ORDER BY ts"
+    )
+    fields = ("open", "high", "low", "price", "price_24k", "price_18k", "price_14k")
+    assert conn.cursor.fetchall() == [
+        tuple(to_fixed(snapshot[field]) for field in fields)
+        for snapshot in (first, last)
+    ]
+
+    (day,) = conn.get_gold_tick_days()
+    assert day[:2] == (2, date(2025, 1, 1))
+    assert [from_fixed(value) for value in day[2:]] == [
+        Decimal(str(value))
+        for value in (
+            first["open"], last["high"], first["low"], last["price"],
+            last["price_24k"], last["price_18k"], last["price_14k"],
+        )
+    ]
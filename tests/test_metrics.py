@@ -0,0 +1,20 @@
+from etl.commons.metrics import DurationReservoir
+
+
+def test_reservoir_percentile_is_exact_until_full():
+    reservoir = DurationReservoir(size=100)
+    for value in range(1, 101):
+        reservoir.add(value / 1000)
+
+    assert reservoir.percentile(95) == 0.095
+    assert reservoir.percentile(100) == 0.1
+
+
+def test_reservoir_is_bounded():
+    reservoir = DurationReservoir(size=50)
+    for value in range(10000):
+        reservoir.add(float(value))
+
+    assert reservoir.seen == 10000
+    assert len(reservoir.values) == 50
+    assert 0.0 <= reservoir.percentile(95) < 10000.0
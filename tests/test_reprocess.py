@@ -0,0 +1,33 @@
+import os
+from datetime import date
+
+from etl.reprocess.utils_reprocess import archive_stamp, scan_archive
+
+
+def test_archive_stamp_pads_millisecond_stamps():
+    assert archive_stamp("gold_20250101_120000_123.json") == "20250101_120000_123000"
+    assert archive_stamp("gold_20250101_120000_123456.json") == "20250101_120000_123456"
+    assert archive_stamp("gold_20250101_120000_1234.json") is None
+    assert archive_stamp("gold.json") is None
+
+
+def test_scan_archive_orders_mixed_stamps(tmp_path, monkeypatch):
+    directory = tmp_path / "data" / "processed" / "gold"
+    directory.mkdir(parents=True)
+    names = [
+        "gold_20250102_120000_500000.json",
+        "gold_20250102_120000_400.json",
+        "gold_20250102_120000_000123.json",
+        "gold_20241201_120000_000.json",
+    ]
+    for name in names:
+        (directory / name).write_text("[]")
+    monkeypatch.chdir(tmp_path)
+
+    paths = scan_archive("gold", date(2025, 1, 1))
+
+    assert [os.path.basename(path) for path in paths] == [
+        "gold_20250102_120000_000123.json",
+        "gold_20250102_120000_400.json",
+        "gold_20250102_120000_500000.json",
+    ]
@@ -0,0 +1,114 @@
+import os
+import shutil
+
+import pytest
+
+from etl.load.database_load import DBConnectorLoad
+from etl.transform.btc_transform import BitcoinTransform
+from etl.transform.database_transform import DBConnectorTransform
+from etl.transform.logger_transform import logger
+from etl.transform.main_transform import resume_or_start_runs, transform
+
+
+@pytest.fixture
+def conn(sqlite_env, monkeypatch):
+    monkeypatch.setenv("TRANSFORM_POLL_INTERVAL", "0.01")
+    conn = DBConnectorTransform(logger)
+    conn.connect()
+    yield conn
+    conn.disconnect()
+
+
+def count(conn, table, where="1 = 1", params=()):
+    conn.cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}", params)
+    return conn.cursor.fetchone()[0]
+
+
+def test_interrupted_run_resumes_with_the_remaining_files(
+    conn, register_file, btc_payload, monkeypatch
+):
+    for currency_id, market in ((1, "EUR"), (2, "USD"), (3, "GBP")):
+        register_file(
+            btc_payload(market, ["2025-01-01", "2025-01-02"]), "btc", currency_id, 2
+        )
+
+    transformed = []
+    original = BitcoinTransform.transform
+
+    def crash_on_second_file(self, file_info):
+        if len(transformed) == 1:
+            raise RuntimeError("worker killed")
+        transformed.append(file_info.filename)
+        original(self, file_info)
+
+    monkeypatch.setattr(BitcoinTransform, "transform", crash_on_second_file)
+    with pytest.raises(RuntimeError):
+        transform(["btc"])
+
+    run_id, status = conn.get_last_run("btc")
+    assert status == "running"
+    assert count(conn, "transform.transform_log") == 1
+    assert count(conn, "transform.btc_data_import") == 2
+
+    def record(self, file_info):
+        transformed.append(file_info.filename)
+        original(self, file_info)
+
+    monkeypatch.setattr(BitcoinTransform, "transform", record)
+    transform(["btc"])
+
+    assert conn.get_last_run("btc") == (run_id, "completed")
+    assert len(transformed) == len(set(transformed)) == 3
+    assert count(conn, "transform.transform_log", "run_id = %s", (run_id,)) == 3
+    assert count(conn, "transform.btc_data_import") == 6
+    assert os.listdir(os.path.join("data", "raw", "bitcoin")) == []
+
+
+def test_staging_is_truncated_only_after_it_was_loaded(conn):
+    first_run = resume_or_start_runs(conn, ["btc"])["btc"]
+    conn.cursor.execute(
+        """
+        INSERT INTO transform.btc_data_import
+            (currency_id, date, open, high, low, close, volume)
+        VALUES (1, '2025-01-01', 1, 1, 1, 1, 1)
+        """
+    )
+    conn.conn.commit()
+    conn.finish_run(first_run)
+
+    second_run = resume_or_start_runs(conn, ["btc"])["btc"]
+    assert second_run != first_run
+    assert count(conn, "transform.btc_data_import") == 1
+    conn.finish_run(second_run)
+
+    load = DBConnectorLoad(logger)
+    load.connect()
+    try:
+        load.mark_staging_loaded("btc")
+    finally:
+        load.disconnect()
+    assert conn.get_last_run("btc") == (second_run, "loaded")
+
+    resume_or_start_runs(conn, ["btc"])
+    assert count(conn, "transform.btc_data_import") == 0
+
+
+def test_interrupted_archive_move_is_completed_from_transform_log(
+    conn, register_file, btc_payload, monkeypatch
+):
+    file_path = register_file(btc_payload("EUR", ["2025-01-01"]), "btc", 1)
+    with monkeypatch.context() as crash:
+        crash.setattr(shutil, "move", lambda source, target: None)
+        transform(["btc"])
+
+    assert os.path.exists(file_path)
+    run_id, _ = conn.get_last_run("btc")
+    archived = os.path.join(
+        "data", "processed", "bitcoin", os.path.basename(file_path)
+    )
+    assert conn.get_logged_moves(run_id) == [(file_path, archived)]
+
+    resume_or_start_runs(conn, ["btc"])
+
+    assert not os.path.exists(file_path)
+    assert os.path.exists(archived)
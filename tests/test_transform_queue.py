@@ -0,0 +1,101 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from etl.extract.database_extract import DBConnectorExtract
+from etl.transform.btc_transform import BitcoinTransform
+from etl.transform.database_transform import DBConnectorTransform
+from etl.transform.logger_transform import logger
+from etl.transform.worker_transform import TransformWorker
+
+
+@pytest.fixture
+def conn(sqlite_env, monkeypatch):
+    monkeypatch.setenv("TRANSFORM_POLL_INTERVAL", "0.01")
+    conn = DBConnectorTransform(logger)
+    conn.connect()
+    yield conn
+    conn.disconnect()
+
+
+def log_import(file_name, directory="data/raw/bitcoin"):
+    extract = DBConnectorExtract(logger)
+    extract.connect()
+    try:
+        return extract.log_import(
+            1, directory, file_name, datetime(2025, 1, 1), datetime(2025, 1, 1), 1
+        )
+    finally:
+        extract.disconnect()
+
+
+def queue_entries(conn):
+    conn.cursor.execute(
+        "SELECT import_log_id, status, attempts FROM transform.transform_queue"
+    )
+    return conn.cursor.fetchall()
+
+
+def transform_log(conn):
+    conn.cursor.execute(
+        "SELECT processed_directory_name, processed_file_name, status, run_id "
+        "FROM transform.transform_log"
+    )
+    return conn.cursor.fetchall()
+
+
+def test_unreadable_file_is_logged_as_error_after_max_attempts(conn, monkeypatch):
+    monkeypatch.setenv("TRANSFORM_MAX_ATTEMPTS", "2")
+    import_log_id = log_import("btc_missing.json")
+    run_id = conn.start_run("btc")
+
+    assert conn.enqueue_files("bitcoin", run_id) == 1
+    TransformWorker(conn).drain(["bitcoin"])
+
+    assert queue_entries(conn) == [(import_log_id, "failed", 1)]
+    assert conn.count_queued(["bitcoin"]) == 0
+    assert transform_log(conn) == []
+
+    assert conn.enqueue_files("bitcoin", run_id) == 1
+    assert queue_entries(conn) == [(import_log_id, "pending", 1)]
+    TransformWorker(conn).drain(["bitcoin"])
+
+    assert queue_entries(conn) == []
+    assert transform_log(conn) == [
+        (os.path.join("data", "error", "bitcoin"), "btc_missing.json", "error", run_id)
+    ]
+    assert conn.enqueue_files("bitcoin", run_id) == 0
+
+
+def test_expired_lease_is_taken_over_by_another_worker(
+    conn, register_file, btc_payload
+):
+    file_path = register_file(btc_payload("EUR", ["2025-01-01"]), "btc", 1)
+    run_id = conn.start_run("btc")
+    conn.enqueue_files("bitcoin", run_id)
+
+    stale = conn.claim_file(["bitcoin"], "worker-a", 60)
+    assert (stale.worker, stale.attempts) == ("worker-a", 1)
+    assert conn.claim_file(["bitcoin"], "worker-b", 60) is None
+
+    conn.cursor.execute(
+        "UPDATE transform.transform_queue SET lease_until = '2000-01-01 00:00:00'"
+    )
+    conn.conn.commit()
+    current = conn.claim_file(["bitcoin"], "worker-b", 60)
+    assert (current.queue_id, current.worker, current.attempts) == (
+        stale.queue_id,
+        "worker-b",
+        2,
+    )
+
+    transformer = BitcoinTransform(conn, run_id)
+    transformer.transform(stale)
+    assert transform_log(conn) == []
+    assert os.path.exists(file_path)
+
+    transformer.transform(current)
+    assert [row[2] for row in transform_log(conn)] == ["processed"]
+    assert not os.path.exists(file_path)
+    assert queue_entries(conn) == []
@@ -0,0 +1,23 @@
+import numpy as np
+
+from etl.validate.utils_validate import rolling_outliers
+
+
+def test_rolling_outliers_flags_a_spike():
+    rng = np.random.default_rng(0)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 40)))
+    prices[30] *= 1.5
+
+    outliers = rolling_outliers(prices, window=20, threshold=6, min_periods=10)
+
+    assert np.nonzero(outliers)[0].tolist() == [30]
+
+
+def test_rolling_outliers_skips_flat_windows():
+    prices = np.full(30, 100.0)
+    prices[25:] = 101.0
+
+    with np.errstate(all="raise"):
+        outliers = rolling_outliers(prices, window=20, threshold=6, min_periods=10)
+
+    assert not outliers.any()